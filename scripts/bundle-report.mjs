@@ -0,0 +1,212 @@
+#!/usr/bin/env node
+/**
+ * ══════════════════════════════════════════════════════════════════════════════
+ * BUNDLE REPORT — JS-Größe pro Route aus dem Vite-Manifest
+ *
+ * Liest die Routentabelle aus `src/App.tsx` und `dist/.vite/manifest.json`
+ * und rechnet pro Route aus, wie viel JavaScript beim Direktaufruf geladen
+ * wird (Entry + statische Imports der Seite) und was erst bei Bedarf
+ * nachkommt (dynamische Imports, z.B. die Canvases). Keine Abhängigkeiten –
+ * nur Node-Bordmittel, kein CI nötig.
+ *
+ *   npm run build && npm run bundle-report
+ *   node scripts/bundle-report.mjs --json=bundle-report.json
+ *   node scripts/bundle-report.mjs --baseline=bundle-report.json --budget=/:150
+ *
+ * Optionen:
+ *   --dist=dist            Build-Verzeichnis
+ *   --json=<datei>         Ergebnis als JSON schreiben (für spätere Vergleiche)
+ *   --baseline=<datei>     Früheren JSON-Report laden und Deltas anzeigen
+ *   --budget=/:150,...     Max. gzip-kB pro Route; Überschreitung → Exit-Code 1
+ *   --top=10               Anzahl der größten Chunks in der Übersicht
+ * ══════════════════════════════════════════════════════════════════════════════
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import zlib from 'node:zlib';
+import { fileURLToPath } from 'node:url';
+
+// ─── Konfiguration ──────────────────────────────────────────────────────────
+
+const args = Object.fromEntries(process.argv.slice(2).map(a => {
+  const [k, v] = a.replace(/^--/, '').split('=');
+  return [k, v ?? 'true'];
+}));
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const DIST = path.resolve(ROOT, args.dist ?? 'dist');
+const TOP = Number(args.top ?? 10);
+const BUDGETS = parseBudgets(args.budget);
+
+function parseBudgets(spec) {
+  const budgets = new Map();
+  if (!spec) return budgets;
+  for (const part of spec.split(',')) {
+    const i = part.lastIndexOf(':');
+    // Ohne Pfad gilt das Budget für die Startseite
+    if (i === -1) budgets.set('/', Number(part));
+    else budgets.set(part.slice(0, i), Number(part.slice(i + 1)));
+  }
+  return budgets;
+}
+
+function fail(message) {
+  console.error(`bundle-report: ${message}`);
+  process.exit(2);
+}
+
+// ─── Manifest & Routen ──────────────────────────────────────────────────────
+
+function loadManifest() {
+  for (const file of ['.vite/manifest.json', 'manifest.json']) {
+    const p = path.join(DIST, file);
+    if (fs.existsSync(p)) return JSON.parse(fs.readFileSync(p, 'utf8'));
+  }
+  return fail(`kein Manifest in ${DIST} – erst "npm run build" ausführen (build.manifest muss aktiv sein)`);
+}
+
+/** Routen aus App.tsx: eager `<Route path=…>` zählen zum Entry, `LAZY_ROUTES` bekommen ihren Seiten-Chunk */
+function loadRoutes(manifest) {
+  const appFile = path.join(ROOT, 'src/App.tsx');
+  const source = fs.readFileSync(appFile, 'utf8');
+  const routes = [];
+
+  for (const m of source.matchAll(/<Route\s+path="([^"]+)"\s+element=/g)) {
+    routes.push({ path: m[1], page: null });
+  }
+  for (const m of source.matchAll(/path:\s*"([^"]+)",\s*page:\s*lazyWithPreload\(\(\)\s*=>\s*import\("\.\/([^"]+)"\)\)/g)) {
+    const base = path.posix.join('src', m[2]);
+    const key = ['.tsx', '.ts', '.jsx', '.js'].map(ext => base + ext).find(k => manifest[k]);
+    if (!key) fail(`Seite "${m[2]}" (${m[1]}) nicht im Manifest gefunden`);
+    routes.push({ path: m[1], page: key });
+  }
+  if (routes.length === 0) fail('keine Routen in src/App.tsx gefunden');
+  return routes;
+}
+
+// ─── Größen ─────────────────────────────────────────────────────────────────
+
+const sizeCache = new Map();
+
+function fileSize(file) {
+  let size = sizeCache.get(file);
+  if (!size) {
+    const buf = fs.readFileSync(path.join(DIST, file));
+    size = { raw: buf.length, gzip: zlib.gzipSync(buf, { level: 9 }).length };
+    sizeCache.set(file, size);
+  }
+  return size;
+}
+
+/** Alle JS-Dateien, die mit `key` statisch geladen werden, plus die dynamischen Imports auf dem Weg */
+function staticClosure(manifest, keys, seen = new Set()) {
+  const dynamic = new Set();
+  const stack = [...keys];
+  while (stack.length > 0) {
+    const key = stack.pop();
+    if (seen.has(key)) continue;
+    seen.add(key);
+    const chunk = manifest[key];
+    if (!chunk) continue;
+    for (const k of chunk.imports ?? []) stack.push(k);
+    for (const k of chunk.dynamicImports ?? []) dynamic.add(k);
+  }
+  return { keys: seen, dynamic };
+}
+
+function sumFiles(manifest, keys) {
+  const total = { raw: 0, gzip: 0, files: [] };
+  for (const key of keys) {
+    const file = manifest[key]?.file;
+    if (!file || !file.endsWith('.js')) continue;
+    const size = fileSize(file);
+    total.raw += size.raw;
+    total.gzip += size.gzip;
+    total.files.push(file);
+  }
+  total.files.sort();
+  return total;
+}
+
+// ─── Report ─────────────────────────────────────────────────────────────────
+
+function buildReport(manifest, routes) {
+  const entryKeys = Object.keys(manifest).filter(k => manifest[k].isEntry);
+  if (entryKeys.length === 0) fail('kein Entry im Manifest');
+  const entry = staticClosure(manifest, entryKeys);
+  const entryTotal = sumFiles(manifest, entry.keys);
+
+  const pageKeys = new Set(routes.map(r => r.page).filter(Boolean));
+
+  const report = { generatedAt: new Date().toISOString(), entry: entryTotal, routes: {}, chunks: {} };
+  for (const route of routes) {
+    const initial = route.page ? staticClosure(manifest, [route.page], new Set(entry.keys)) : entry;
+    const own = [...initial.keys].filter(k => !entry.keys.has(k));
+    const onDemandKeys = new Set();
+    for (const k of initial.dynamic) {
+      // Andere Seiten sind eigene Routen, kein Nachladen innerhalb dieser
+      if (initial.keys.has(k) || pageKeys.has(k)) continue;
+      for (const d of staticClosure(manifest, [k], new Set(initial.keys)).keys) {
+        if (!initial.keys.has(d)) onDemandKeys.add(d);
+      }
+    }
+    const routeTotal = sumFiles(manifest, own);
+    const onDemand = sumFiles(manifest, onDemandKeys);
+    report.routes[route.path] = {
+      raw: entryTotal.raw + routeTotal.raw,
+      gzip: entryTotal.gzip + routeTotal.gzip,
+      routeGzip: routeTotal.gzip,
+      onDemandGzip: onDemand.gzip,
+      files: routeTotal.files,
+    };
+  }
+  for (const [file, size] of sizeCache) report.chunks[file] = size;
+  return report;
+}
+
+const kb = bytes => (bytes / 1024).toFixed(1).padStart(8);
+
+function delta(current, previous) {
+  if (previous === undefined) return '';
+  const d = current - previous;
+  if (Math.abs(d) < 50) return '      ±0';
+  return `${d > 0 ? '+' : '-'}${(Math.abs(d) / 1024).toFixed(1)}`.padStart(8);
+}
+
+function printReport(report, baseline) {
+  const base = baseline?.routes ?? {};
+  console.log(`Entry (alle Routen): ${kb(report.entry.raw).trim()} kB, gzip ${kb(report.entry.gzip).trim()} kB\n`);
+  console.log(`${'Route'.padEnd(24)}${'JS kB'.padStart(8)}${'gzip'.padStart(8)}${'Seite'.padStart(8)}${'Bedarf'.padStart(8)}${baseline ? 'Δ gzip'.padStart(8) : ''}`);
+  for (const [route, r] of Object.entries(report.routes)) {
+    const budget = BUDGETS.get(route);
+    const over = budget !== undefined && r.gzip / 1024 > budget ? `  ✗ Budget ${budget} kB` : '';
+    console.log(`${route.padEnd(24)}${kb(r.raw)}${kb(r.gzip)}${kb(r.routeGzip)}${kb(r.onDemandGzip)}${baseline ? delta(r.gzip, base[route]?.gzip) : ''}${over}`);
+  }
+
+  const largest = Object.entries(report.chunks).sort((a, b) => b[1].gzip - a[1].gzip).slice(0, TOP);
+  console.log(`\nGrößte Chunks (gzip):`);
+  for (const [file, size] of largest) console.log(`${kb(size.gzip)}  ${file}`);
+}
+
+// ─── Start ──────────────────────────────────────────────────────────────────
+
+const manifest = loadManifest();
+const report = buildReport(manifest, loadRoutes(manifest));
+const baseline = args.baseline ? JSON.parse(fs.readFileSync(path.resolve(args.baseline), 'utf8')) : null;
+printReport(report, baseline);
+
+if (args.json) {
+  fs.writeFileSync(path.resolve(args.json), JSON.stringify(report, null, 2) + '\n');
+  console.log(`\nReport geschrieben: ${args.json}`);
+}
+
+const overBudget = [...BUDGETS].filter(([route, limit]) => {
+  const r = report.routes[route];
+  if (!r) fail(`Budget für unbekannte Route "${route}"`);
+  return r.gzip / 1024 > limit;
+});
+if (overBudget.length > 0) {
+  console.error(`\nBudget überschritten: ${overBudget.map(([route]) => route).join(', ')}`);
+  process.exit(1);
+}
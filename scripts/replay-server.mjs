@@ -0,0 +1,533 @@
+#!/usr/bin/env node
+/**
+ * ══════════════════════════════════════════════════════════════════════════════
+ * REPLAY SERVER — Lokaler Stand-in für das Workflow-Backend
+ *
+ * Spricht das Live-Protokoll aus `src/types/workflowEvents.ts` über
+ * WebSocket (`ws://localhost:8787/ws`) und SSE (`http://localhost:8787`)
+ * und spielt synthetische oder aufgezeichnete Läufe mit einstellbarer Rate ab.
+ * Keine Abhängigkeiten – nur Node-Bordmittel.
+ *
+ *   node scripts/replay-server.mjs --rate=10000 --progress=20
+ *   node scripts/replay-server.mjs --record=run.ndjson --rate=500
+ *   node scripts/replay-server.mjs --self-test
+ *
+ * Optionen:
+ *   --port=8787         HTTP/WS-Port
+ *   --rate=2000         Events pro Sekunde und Ausführung
+ *   --progress=4        Fortschritts-Events pro Node (zwischen running/completed)
+ *   --flush-ms=16       Sammelintervall für Batches
+ *   --window=8192       Max. unbestätigte Events pro Client (Backpressure)
+ *   --nodes=0           >0: synthetischer Graph mit N Nodes statt des gesendeten
+ *   --record=<datei>    NDJSON-Aufzeichnung ({ kind, data } pro Zeile) abspielen
+ *   --log-cap=100000    Events pro Ausführung, die für Resume vorgehalten werden
+ *   --self-test         Reconnect-Test (SSE mit resume bzw. Last-Event-ID) auf
+ *                       freiem Port; Exit-Code 1 bei verlorenen Events
+ *
+ * Im Frontend: VITE_WORKFLOW_EVENTS_URL=ws://localhost:8787/ws npm run dev
+ * ══════════════════════════════════════════════════════════════════════════════
+ */
+
+import http from 'node:http';
+import crypto from 'node:crypto';
+import fs from 'node:fs';
+
+// ─── Konfiguration ──────────────────────────────────────────────────────────
+
+const args = Object.fromEntries(process.argv.slice(2).map(a => {
+  const [k, v] = a.replace(/^--/, '').split('=');
+  return [k, v ?? 'true'];
+}));
+
+const PORT = Number(args.port ?? 8787);
+const RATE = Number(args.rate ?? 2000);
+const PROGRESS_STEPS = Number(args.progress ?? 4);
+const FLUSH_MS = Number(args['flush-ms'] ?? 16);
+const WINDOW = Number(args.window ?? 8192);
+const SYNTHETIC_NODES = Number(args.nodes ?? 0);
+const LOG_CAP = Number(args['log-cap'] ?? 100_000);
+const RECORD = args.record ? loadRecording(args.record) : null;
+const SELF_TEST = args['self-test'] === 'true';
+const DETACHED_TTL_MS = 60_000;
+/** So lange hält ein wiederverbundener Client seine Ausführungen an, bis `resume` eintrifft */
+const RESUME_WAIT_MS = 2000;
+
+function loadRecording(file) {
+  return fs.readFileSync(file, 'utf8').split('\n').filter(Boolean).map(line => JSON.parse(line));
+}
+
+// ─── Event-Generatoren ──────────────────────────────────────────────────────
+
+/** Topologische Ebenen (Kahn) – jeder Node erst nach allen Vorgängern */
+function topoOrder(nodeIds, connections) {
+  const indeg = new Map(nodeIds.map(id => [id, 0]));
+  const out = new Map(nodeIds.map(id => [id, []]));
+  for (const c of connections) {
+    if (!indeg.has(c.from) || !indeg.has(c.to)) continue;
+    out.get(c.from).push(c.to);
+    indeg.set(c.to, indeg.get(c.to) + 1);
+  }
+  const order = [];
+  const placed = new Set();
+  let queue = nodeIds.filter(id => indeg.get(id) === 0);
+  while (queue.length > 0) {
+    // Kein push(...queue): sehr breite Ebenen sprengen sonst die Argumentliste
+    for (const id of queue) { order.push(id); placed.add(id); }
+    const next = [];
+    for (const id of queue) {
+      for (const to of out.get(id)) {
+        indeg.set(to, indeg.get(to) - 1);
+        if (indeg.get(to) === 0) next.push(to);
+      }
+    }
+    queue = next;
+  }
+  // Zyklen: restliche Nodes hinten anhängen
+  for (const id of nodeIds) if (!placed.has(id)) order.push(id);
+  return order;
+}
+
+function syntheticGraph(n) {
+  const nodeIds = Array.from({ length: n }, (_, i) => `n${i}`);
+  const connections = [];
+  for (let i = 1; i < n; i++) connections.push({ from: `n${Math.floor((i - 1) / 3)}`, to: `n${i}` });
+  return { nodeIds, connections };
+}
+
+/** Liefert { kind, data } ohne id/executionId – die setzt der Sender */
+function* syntheticRun(exec) {
+  const graph = SYNTHETIC_NODES > 0 ? syntheticGraph(SYNTHETIC_NODES) : exec.request;
+  const nodeStates = {};
+  for (const nodeId of topoOrder(graph.nodeIds, graph.connections)) {
+    nodeStates[nodeId] = 'pending';
+    yield { kind: 'status', data: { nodeId, status: 'pending', timestamp: Date.now(), message: 'Warte auf Vorgänger…' } };
+    nodeStates[nodeId] = 'running';
+    yield { kind: 'status', data: { nodeId, status: 'running', timestamp: Date.now(), message: 'Wird ausgeführt…', progress: 0 } };
+    for (let p = 1; p <= PROGRESS_STEPS; p++) {
+      const progress = Math.round((p / (PROGRESS_STEPS + 1)) * 100);
+      yield { kind: 'status', data: { nodeId, status: 'running', timestamp: Date.now(), progress } };
+    }
+    nodeStates[nodeId] = 'completed';
+    yield { kind: 'status', data: { nodeId, status: 'completed', timestamp: Date.now(), message: 'Abgeschlossen', progress: 100 } };
+    yield {
+      kind: 'artifact',
+      data: {
+        id: `artifact-${crypto.randomUUID()}`, nodeId, type: 'text', label: 'Ergebnis',
+        contentPreview: `Synthetisches Ergebnis für ${nodeId}`, createdAt: new Date().toISOString(),
+      },
+    };
+  }
+  yield {
+    kind: 'complete',
+    data: {
+      executionId: exec.id, systemId: exec.request.systemId, startedAt: exec.startedAt,
+      completedAt: new Date().toISOString(), status: 'completed', nodeStates, artifacts: [],
+    },
+  };
+}
+
+function* recordedRun(exec) {
+  for (const entry of RECORD) {
+    if (entry.kind === 'complete') {
+      yield { kind: 'complete', data: { ...entry.data, executionId: exec.id, systemId: exec.request.systemId } };
+    } else {
+      yield { kind: entry.kind, data: { ...entry.data, timestamp: Date.now() } };
+    }
+  }
+}
+
+// ─── State ──────────────────────────────────────────────────────────────────
+
+let nextEventId = 1;
+/** @type {Map<string, Client>} */
+const clients = new Map();
+/** @type {Map<string, Execution>} */
+const executions = new Map();
+const counters = { sent: 0, batches: 0, paused: 0 };
+
+/**
+ * @typedef {{ id: string, write: (payload: string, lastId: number) => boolean, writable: boolean,
+ *   inFlight: number, sentBatches: { lastId: number, count: number }[], pending: object[],
+ *   connected: boolean, detachedAt: number, attachedAt: number, awaitingResume: boolean,
+ *   replayed: boolean, close: () => void }} Client
+ * @typedef {{ id: string, clientId: string, request: object, startedAt: string, gen: Generator,
+ *   log: object[], done: boolean, cancelled: boolean, budget: number, finishedAt: number }} Execution
+ */
+
+function createClient(id) {
+  return {
+    id, write: () => false, writable: false, inFlight: 0, sentBatches: [], pending: [],
+    connected: false, detachedAt: Date.now(), attachedAt: 0, awaitingResume: false, replayed: false, close: () => {},
+  };
+}
+
+function getClient(id) {
+  let client = clients.get(id);
+  if (!client) { client = createClient(id); clients.set(id, client); }
+  return client;
+}
+
+/** Reiht alle geloggten Frames der Ausführungen nach `lastEventId` in id-Reihenfolge ein */
+function replay(client, execs, lastEventId) {
+  const missed = [];
+  for (const exec of execs) {
+    for (const frame of exec.log) if (frame.id > lastEventId) missed.push(frame);
+  }
+  missed.sort((a, b) => a.id - b.id);
+  for (const frame of missed) client.pending.push(frame);
+}
+
+/**
+ * Verbindet einen (ggf. bekannten) Client. Mit `lastEventId` (SSE-Header
+ * Last-Event-ID) wird die Lücke sofort nachgesendet; ohne werden laufende
+ * Ausführungen angehalten, bis `resume` kommt – sonst gingen neue Frames mit
+ * höheren ids voraus und der Client verwürfe die Lücke als Duplikate.
+ */
+function attach(client, write, close, lastEventId = null) {
+  client.write = write;
+  client.close = close;
+  client.writable = true;
+  client.connected = true;
+  client.attachedAt = Date.now();
+  client.inFlight = 0;
+  client.sentBatches = [];
+  client.pending = [];
+  const owned = [...executions.values()].filter(e => e.clientId === client.id);
+  client.replayed = lastEventId !== null;
+  client.awaitingResume = !client.replayed && owned.some(e => !e.done);
+  if (client.replayed) replay(client, owned, lastEventId);
+}
+
+function detach(client) {
+  client.connected = false;
+  client.writable = false;
+  client.detachedAt = Date.now();
+}
+
+// ─── Nachrichten vom Client ─────────────────────────────────────────────────
+
+function handleMessage(client, msg) {
+  switch (msg.type) {
+    case 'execute': {
+      const exec = {
+        id: msg.executionId, clientId: client.id, request: msg, startedAt: new Date().toISOString(),
+        gen: null, log: [], done: false, cancelled: false, budget: 0, finishedAt: 0,
+      };
+      exec.gen = RECORD ? recordedRun(exec) : syntheticRun(exec);
+      executions.set(exec.id, exec);
+      break;
+    }
+    case 'cancel': {
+      const exec = executions.get(msg.executionId);
+      if (exec) { exec.cancelled = true; exec.done = true; exec.finishedAt = Date.now(); }
+      break;
+    }
+    case 'ack': {
+      // Bestätigte Batches aus dem Fenster nehmen
+      while (client.sentBatches.length > 0 && client.sentBatches[0].lastId <= msg.lastEventId) {
+        client.inFlight -= client.sentBatches.shift().count;
+      }
+      break;
+    }
+    case 'resume': {
+      // Ausführungen übernehmen und Lücke ab lastEventId aus dem Log nachsenden
+      const execs = [];
+      for (const id of msg.executionIds) {
+        const exec = executions.get(id);
+        if (!exec) continue;
+        exec.clientId = client.id;
+        execs.push(exec);
+      }
+      // Per Last-Event-ID schon beim Verbinden nachgesendet
+      if (!client.replayed) replay(client, execs, msg.lastEventId);
+      client.awaitingResume = false;
+      break;
+    }
+  }
+}
+
+// ─── Pump: Events erzeugen, bündeln, senden ─────────────────────────────────
+
+function pump() {
+  const perTick = (RATE * FLUSH_MS) / 1000;
+  for (const exec of executions.values()) {
+    if (exec.done) continue;
+    const client = clients.get(exec.clientId);
+    // Backpressure: kein Fortschritt ohne Empfänger oder bei vollem Fenster
+    if (!client || !client.connected || !client.writable || client.inFlight + client.pending.length >= WINDOW) {
+      counters.paused++;
+      continue;
+    }
+    // Nach Reconnect erst die Lücke nachsenden (resume), dann weiter erzeugen
+    if (client.awaitingResume && Date.now() - client.attachedAt < RESUME_WAIT_MS) {
+      counters.paused++;
+      continue;
+    }
+    exec.budget += perTick;
+    while (exec.budget >= 1 && client.inFlight + client.pending.length < WINDOW) {
+      const next = exec.gen.next();
+      if (next.done) { exec.done = true; exec.finishedAt = Date.now(); break; }
+      exec.budget--;
+      const frame = { id: nextEventId++, executionId: exec.id, ...next.value };
+      exec.log.push(frame);
+      if (exec.log.length > LOG_CAP) exec.log.splice(0, exec.log.length - LOG_CAP);
+      client.pending.push(frame);
+      if (frame.kind === 'complete') { exec.done = true; exec.finishedAt = Date.now(); break; }
+    }
+    // Nicht angesparte Rate verfällt, damit nach einer Pause kein Burst entsteht
+    exec.budget = Math.min(exec.budget, perTick);
+  }
+
+  for (const client of clients.values()) {
+    if (!client.connected || !client.writable || client.pending.length === 0) continue;
+    const batch = client.pending.splice(0);
+    const payload = batch.map(f => JSON.stringify(f)).join('\n');
+    const lastId = batch[batch.length - 1].id;
+    client.inFlight += batch.length;
+    client.sentBatches.push({ lastId, count: batch.length });
+    counters.sent += batch.length;
+    counters.batches++;
+    client.writable = client.write(payload, lastId);
+  }
+
+  // Aufräumen: getrennte Clients und beendete Ausführungen nach Ablauf
+  const now = Date.now();
+  for (const [id, client] of clients) {
+    if (!client.connected && now - client.detachedAt > DETACHED_TTL_MS) clients.delete(id);
+  }
+  for (const [id, exec] of executions) {
+    if (exec.done && now - exec.finishedAt > DETACHED_TTL_MS) executions.delete(id);
+  }
+}
+
+setInterval(pump, FLUSH_MS);
+
+let lastSent = 0;
+setInterval(() => {
+  const rate = (counters.sent - lastSent) / 5;
+  lastSent = counters.sent;
+  const active = [...executions.values()].filter(e => !e.done).length;
+  console.log(`[replay] ${rate.toFixed(0)} events/s · ${counters.batches} batches · ${clients.size} clients · ${active} aktive Ausführungen`);
+}, 5000).unref();
+
+// ─── WebSocket (RFC 6455, minimal) ──────────────────────────────────────────
+
+const WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11';
+
+function encodeFrame(text, opcode = 0x1) {
+  const payload = Buffer.from(text);
+  const len = payload.length;
+  let header;
+  if (len < 126) {
+    header = Buffer.from([0x80 | opcode, len]);
+  } else if (len < 65536) {
+    header = Buffer.alloc(4);
+    header[0] = 0x80 | opcode; header[1] = 126; header.writeUInt16BE(len, 2);
+  } else {
+    header = Buffer.alloc(10);
+    header[0] = 0x80 | opcode; header[1] = 127; header.writeBigUInt64BE(BigInt(len), 2);
+  }
+  return Buffer.concat([header, payload]);
+}
+
+/** Zerlegt eingehende (maskierte) Client-Frames; liefert den Rest-Buffer zurück */
+function decodeFrames(buffer, onFrame) {
+  let offset = 0;
+  while (buffer.length - offset >= 2) {
+    const b0 = buffer[offset], b1 = buffer[offset + 1];
+    const opcode = b0 & 0x0f;
+    const masked = (b1 & 0x80) !== 0;
+    let len = b1 & 0x7f;
+    let pos = offset + 2;
+    if (len === 126) {
+      if (buffer.length < pos + 2) break;
+      len = buffer.readUInt16BE(pos); pos += 2;
+    } else if (len === 127) {
+      if (buffer.length < pos + 8) break;
+      len = Number(buffer.readBigUInt64BE(pos)); pos += 8;
+    }
+    const maskLen = masked ? 4 : 0;
+    if (buffer.length < pos + maskLen + len) break;
+    const mask = masked ? buffer.subarray(pos, pos + 4) : null;
+    pos += maskLen;
+    const payload = Buffer.from(buffer.subarray(pos, pos + len));
+    if (mask) for (let i = 0; i < payload.length; i++) payload[i] ^= mask[i & 3];
+    onFrame(opcode, payload);
+    offset = pos + len;
+  }
+  return buffer.subarray(offset);
+}
+
+function handleUpgrade(req, socket) {
+  const key = req.headers['sec-websocket-key'];
+  if (!key || !req.url?.startsWith('/ws')) { socket.destroy(); return; }
+  const accept = crypto.createHash('sha1').update(key + WS_GUID).digest('base64');
+  socket.write(
+    'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n' +
+    `Sec-WebSocket-Accept: ${accept}\r\n\r\n`,
+  );
+  socket.setNoDelay(true);
+
+  const client = getClient(`ws-${crypto.randomUUID()}`);
+  attach(client, payload => socket.write(encodeFrame(payload)), () => socket.end());
+  socket.on('drain', () => { client.writable = true; });
+
+  let rest = Buffer.alloc(0);
+  socket.on('data', chunk => {
+    rest = decodeFrames(Buffer.concat([rest, chunk]), (opcode, payload) => {
+      if (opcode === 0x1) {
+        try { handleMessage(client, JSON.parse(payload.toString('utf8'))); } catch { /* ungültige Nachricht */ }
+      } else if (opcode === 0x8) {
+        socket.end(encodeFrame('', 0x8));
+      } else if (opcode === 0x9) {
+        socket.write(encodeFrame(payload.toString('utf8'), 0xa));
+      }
+    });
+  });
+  socket.on('close', () => detach(client));
+  socket.on('error', () => detach(client));
+}
+
+// ─── HTTP: SSE-Stream + Nachrichten ─────────────────────────────────────────
+
+const CORS = {
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+  'Access-Control-Allow-Headers': 'Content-Type, Last-Event-ID',
+};
+
+function handleRequest(req, res) {
+  const url = new URL(req.url ?? '/', `http://${req.headers.host}`);
+  const clientId = url.searchParams.get('client');
+
+  if (req.method === 'OPTIONS') { res.writeHead(204, CORS).end(); return; }
+
+  if (req.method === 'GET' && url.pathname === '/events' && clientId) {
+    res.writeHead(200, { ...CORS, 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', Connection: 'keep-alive' });
+    res.write('retry: 1000\n\n');
+    const client = getClient(clientId);
+    // EventSource schickt beim automatischen Reconnect die letzte id mit
+    const header = Number(req.headers['last-event-id']);
+    const lastEventId = req.headers['last-event-id'] !== undefined && Number.isFinite(header) ? header : null;
+    attach(client, (payload, lastId) => res.write(`id: ${lastId}\ndata: ${payload.replace(/\n/g, '\ndata: ')}\n\n`), () => res.end(), lastEventId);
+    res.on('drain', () => { client.writable = true; });
+    req.on('close', () => detach(client));
+    return;
+  }
+
+  if (req.method === 'POST' && url.pathname === '/messages' && clientId) {
+    let body = '';
+    req.on('data', chunk => { body += chunk; });
+    req.on('end', () => {
+      try {
+        handleMessage(getClient(clientId), JSON.parse(body));
+        res.writeHead(204, CORS).end();
+      } catch {
+        res.writeHead(400, CORS).end();
+      }
+    });
+    return;
+  }
+
+  res.writeHead(404, CORS).end();
+}
+
+// ─── Selbsttest: Reconnect ohne Event-Verlust ───────────────────────────────
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+async function waitFor(predicate, timeoutMs = 10_000) {
+  const start = Date.now();
+  while (!predicate()) {
+    if (Date.now() - start > timeoutMs) throw new Error('Timeout');
+    await sleep(10);
+  }
+}
+
+/** Minimaler SSE-Client: sammelt die Frames aller data-Zeilen */
+function openSse(port, clientId, lastEventId) {
+  const frames = [];
+  let buffer = '';
+  const headers = lastEventId === undefined ? {} : { 'Last-Event-ID': String(lastEventId) };
+  const req = http.get({ host: '127.0.0.1', port, path: `/events?client=${clientId}`, headers }, res => {
+    res.setEncoding('utf8');
+    res.on('data', chunk => {
+      buffer += chunk;
+      let end;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        for (const line of block.split('\n')) {
+          if (line.startsWith('data: ') && line.length > 6) frames.push(JSON.parse(line.slice(6)));
+        }
+      }
+    });
+  });
+  req.on('error', () => {});
+  return { frames, close: () => req.destroy() };
+}
+
+function post(port, clientId, message) {
+  return fetch(`http://127.0.0.1:${port}/messages?client=${clientId}`, { method: 'POST', body: JSON.stringify(message) });
+}
+
+/**
+ * Verbindung mitten im Lauf trennen, mit einem Stand 50 ids hinter dem
+ * zuletzt empfangenen Frame neu verbinden und prüfen, dass der Client (mit der
+ * monotonen Duplikatprüfung aus liveEventSource) jede id genau einmal bekommt.
+ */
+async function reconnectScenario(port, name, useHeader) {
+  const clientId = `selftest-${name}`;
+  const executionId = `exec-selftest-${name}`;
+  const nodeIds = Array.from({ length: 300 }, (_, i) => `n${i}`);
+
+  let conn = openSse(port, clientId);
+  await post(port, clientId, { type: 'execute', executionId, systemId: 'selftest', nodeIds, connections: [] });
+  await waitFor(() => conn.frames.length >= 600);
+  conn.close();
+  const before = conn.frames;
+  const lastEventId = before[before.length - 1].id - 50;
+
+  await sleep(100);
+  conn = openSse(port, clientId, useHeader ? lastEventId : undefined);
+  // Wie der echte Client: resume kommt erst nach dem Verbindungsaufbau
+  await sleep(100);
+  await post(port, clientId, { type: 'resume', lastEventId, executionIds: [executionId] });
+  await waitFor(() => conn.frames.some(f => f.kind === 'complete'));
+  conn.close();
+
+  const delivered = before.filter(f => f.id <= lastEventId).map(f => f.id);
+  let last = lastEventId, duplicates = 0;
+  for (const frame of conn.frames) {
+    if (frame.id <= last) { duplicates++; continue; }
+    delivered.push(frame.id);
+    last = frame.id;
+  }
+  const expected = delivered[delivered.length - 1] - delivered[0] + 1;
+  const missing = expected - new Set(delivered).size;
+  const ok = missing === 0;
+  console.log(`[selftest] ${name}: ${delivered.length}/${expected} ids zugestellt, ${missing} fehlend, ${duplicates} Duplikate ${ok ? '✓' : '✗'}`);
+  return ok;
+}
+
+async function selfTest(port) {
+  let ok = true;
+  try {
+    ok = await reconnectScenario(port, 'resume', false) && ok;
+    ok = await reconnectScenario(port, 'last-event-id', true) && ok;
+  } catch (e) {
+    console.error('[selftest] Fehler:', e);
+    ok = false;
+  }
+  process.exit(ok ? 0 : 1);
+}
+
+const server = http.createServer(handleRequest);
+server.on('upgrade', handleUpgrade);
+if (SELF_TEST) {
+  server.listen(0, '127.0.0.1', () => void selfTest(server.address().port));
+} else {
+  server.listen(PORT, () => {
+    console.log(`[replay] ws://localhost:${PORT}/ws · http://localhost:${PORT} (SSE) · ${RATE} events/s pro Ausführung`);
+  });
+}
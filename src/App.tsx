@@ -1,43 +1,50 @@
 /**
  * Flowstack Systems Landing Page
  * React Router configuration with multiple pages
+ *
+ * The home page ships in the entry chunk (landing-page critical path); every
+ * other page is its own lazy chunk, prefetched when a link to it is hovered
+ * or focused. `scripts/bundle-report.mjs` reads this route table.
  */
 
+import { Suspense } from "react";
 import { BrowserRouter as Router, Routes, Route } from "react-router-dom";
-import HomePage from "./pages/HomePage";
-import HomePageV2 from "./pages/HomePageV2";
+import { lazyWithPreload } from "@/lib/lazyRoute";
+import { useRoutePrefetch } from "@/hooks/useRoutePrefetch";
 import HomePageV3 from "./pages/HomePageV3";
-import LandingPage from "./pages/LandingPage";
-import ApplePage from "./pages/ApplePage";
-import DashboardPage from "./pages/DashboardPage";
-import LinkedInDashboardPage from "./pages/LinkedInDashboardPage";
-import FormularPage from "./pages/FormularPage";
-import DankePage from "./pages/DankePage";
-import ImpressumPage from "./pages/ImpressumPage";
-import DatenschutzPage from "./pages/DatenschutzPage";
-import NotFoundPage from "./pages/NotFoundPage";
-import AutomationDashboardPage from "./pages/AutomationDashboardPage";
 import CookieBanner from "./components/CookieBanner";
 import "./App.css";
 
+const LAZY_ROUTES = [
+  { path: "/v1", page: lazyWithPreload(() => import("./pages/HomePage")) },
+  { path: "/v2", page: lazyWithPreload(() => import("./pages/HomePageV2")) },
+  { path: "/lp", page: lazyWithPreload(() => import("./pages/LandingPage")) },
+  { path: "/ap", page: lazyWithPreload(() => import("./pages/ApplePage")) },
+  { path: "/dashboard", page: lazyWithPreload(() => import("./pages/DashboardPage")) },
+  { path: "/linkedin", page: lazyWithPreload(() => import("./pages/LinkedInDashboardPage")) },
+  { path: "/systems", page: lazyWithPreload(() => import("./pages/AutomationDashboardPage")) },
+  { path: "/kostenlose-beratung", page: lazyWithPreload(() => import("./pages/FormularPage")) },
+  { path: "/danke", page: lazyWithPreload(() => import("./pages/DankePage")) },
+  { path: "/impressum", page: lazyWithPreload(() => import("./pages/ImpressumPage")) },
+  { path: "/datenschutz", page: lazyWithPreload(() => import("./pages/DatenschutzPage")) },
+  { path: "*", page: lazyWithPreload(() => import("./pages/NotFoundPage")) },
+];
+
+const PREFETCH_ROUTES = LAZY_ROUTES.map(({ path, page }) => ({ path, preload: page.preload }));
+
 function App() {
+  useRoutePrefetch(PREFETCH_ROUTES);
+
   return (
     <Router>
-      <Routes>
-        <Route path="/" element={<HomePageV3 />} />
-        <Route path="/v1" element={<HomePage />} />
-        <Route path="/v2" element={<HomePageV2 />} />
-        <Route path="/lp" element={<LandingPage />} />
-        <Route path="/ap" element={<ApplePage />} />
-        <Route path="/dashboard" element={<DashboardPage />} />
-        <Route path="/linkedin" element={<LinkedInDashboardPage />} />
-        <Route path="/systems" element={<AutomationDashboardPage />} />
-        <Route path="/kostenlose-beratung" element={<FormularPage />} />
-        <Route path="/danke" element={<DankePage />} />
-        <Route path="/impressum" element={<ImpressumPage />} />
-        <Route path="/datenschutz" element={<DatenschutzPage />} />
-        <Route path="*" element={<NotFoundPage />} />
-      </Routes>
+      <Suspense fallback={<div className="min-h-screen bg-background" />}>
+        <Routes>
+          <Route path="/" element={<HomePageV3 />} />
+          {LAZY_ROUTES.map(({ path, page: Page }) => (
+            <Route key={path} path={path} element={<Page />} />
+          ))}
+        </Routes>
+      </Suspense>
       <CookieBanner />
     </Router>
   );
@@ -5,7 +5,7 @@
  *           platform nodes, mockup frames, text elements, media elements
  */
 
-import { useState, useRef, useCallback, useEffect, useMemo, memo } from 'react';
+import { useState, useRef, useCallback, useEffect, useMemo, useSyncExternalStore, memo } from 'react';
 import {
   Plus, Trash2, Save, Globe, Mail, FileText, Search, Video,
   ZoomIn, ZoomOut, Crosshair, Undo2, Redo2, Magnet, HelpCircle,
@@ -23,21 +23,28 @@ import type {
 } from '@/types/funnel';
 import { ELEMENT_DEFAULTS, MOCKUP_SIZES, PLATFORMS } from '@/types/funnel';
 import { TOOL_LOGOS, renderNodeIcon } from './ToolLogos';
-import { saveFunnelBoards, getAllFunnelBoards, deleteFunnelBoard, duplicateFunnelBoard } from '@/data/funnelBoards';
+import {
+  DEMO_FUNNEL_BOARD, funnelBoardStore, withDemoFunnelBoard, loadFunnelBoard, saveFunnelBoard, flushFunnelBoards,
+  deleteFunnelBoard, duplicateFunnelBoard,
+} from '@/data/funnelBoards';
+import { intersects, connectionIntersects, reusePaths } from '@/lib/viewport';
+import type { PathEntry } from '@/lib/viewport';
+import { createSpatialIndex, querySnapCandidates, detectEqualSpacing } from '@/lib/spatialIndex';
+import type { EqGuide } from '@/lib/spatialIndex';
+import { buildDag, dagLayers } from '@/lib/scheduler';
+import { sceneBounds } from '@/lib/exportScene';
+import type { ExportScene, SceneShape } from '@/lib/exportScene';
+import { exportScene, downloadBlob } from '@/services/exportService';
+import { useVisibleCanvasRect } from '@/hooks/useVisibleCanvasRect';
+import { useHistory } from '@/hooks/useHistory';
 
 // ─── Constants ───────────────────────────────────────────────────────────────
 
 const SNAP_THRESHOLD = 8;
 const PAN_DRAG_THRESHOLD = 4;
 const MAX_LABEL = 40;
-
-// CSS for element creation animation
-const ANIM_STYLE = document.createElement('style');
-ANIM_STYLE.textContent = `
-@keyframes funnelNodeAppear { 0% { opacity:0; transform: scale(0.85); } 100% { opacity:1; transform: scale(1); } }
-.funnel-node-appear { animation: funnelNodeAppear 0.25s cubic-bezier(0.34,1.56,0.64,1) both; }
-`;
-if (!document.getElementById('funnel-anim-style')) { ANIM_STYLE.id = 'funnel-anim-style'; document.head.appendChild(ANIM_STYLE); }
+// Autosave waits for a pause in editing instead of saving on every drag frame
+const AUTOSAVE_DELAY = 400;
 
 const GROUP_COLORS: Record<string, { bg: string; border: string; text: string; name: string }> = {
   blue:   { bg: 'rgba(59,130,246,0.05)',  border: 'rgba(59,130,246,0.18)',  text: 'rgba(59,130,246,0.55)',  name: 'Blau' },
@@ -102,85 +109,32 @@ function getStepPath(from: FunnelElement, to: FunnelElement, fp: PortDirection,
   return `M ${p1.x} ${p1.y} L ${p1.x} ${my} L ${p2.x} ${my} L ${p2.x} ${p2.y}`;
 }
 
-// ─── Equal-Spacing Detection ─────────────────────────────────────────────────
-
-interface CanvasItem { id: string; x: number; y: number; w: number; h: number }
-type EqGuide = { axis: 'x' | 'y'; segA: { from: number; to: number; cross: number }; segB: { from: number; to: number; cross: number }; dist: number };
-
-function detectEqualSpacing(items: CanvasItem[], dragId: string, dx: number, dy: number, dw: number, dh: number, threshold: number): { snapX: number | null; snapY: number | null; guides: EqGuide[] } {
-  const others = items.filter(it => it.id !== dragId);
-  const guides: EqGuide[] = [];
-  let snapX: number | null = null, snapY: number | null = null;
-
-  const dragCY = dy + dh / 2;
-  const hNeighbors = others.filter(o => o.y + o.h > dy - dh * 0.5 && o.y < dy + dh + dh * 0.5);
-  const leftItems = hNeighbors.filter(o => o.x + o.w <= dx + threshold).sort((a, b) => (b.x + b.w) - (a.x + a.w));
-  const rightItems = hNeighbors.filter(o => o.x >= dx + dw - threshold).sort((a, b) => a.x - b.x);
-
-  if (leftItems.length > 0 && rightItems.length > 0) {
-    const A = leftItems[0], C = rightItems[0];
-    const totalGap = C.x - (A.x + A.w) - dw;
-    const equalGap = totalGap / 2;
-    const equalX = A.x + A.w + equalGap;
-    if (equalGap > 4 && Math.abs(dx - equalX) < threshold) {
-      snapX = equalX;
-      guides.push({ axis: 'x', segA: { from: A.x + A.w, to: equalX, cross: dragCY }, segB: { from: equalX + dw, to: C.x, cross: dragCY }, dist: equalGap });
-    }
-  }
-
-  const dragCX = dx + dw / 2;
-  const vNeighbors = others.filter(o => o.x + o.w > dx - dw * 0.5 && o.x < dx + dw + dw * 0.5);
-  const topItems = vNeighbors.filter(o => o.y + o.h <= dy + threshold).sort((a, b) => (b.y + b.h) - (a.y + a.h));
-  const bottomItems = vNeighbors.filter(o => o.y >= dy + dh - threshold).sort((a, b) => a.y - b.y);
-
-  if (topItems.length > 0 && bottomItems.length > 0) {
-    const A = topItems[0], C = bottomItems[0];
-    const totalGap = C.y - (A.y + A.h) - dh;
-    const equalGap = totalGap / 2;
-    const equalY = A.y + A.h + equalGap;
-    if (equalGap > 4 && Math.abs(dy - equalY) < threshold) {
-      snapY = equalY;
-      guides.push({ axis: 'y', segA: { from: A.y + A.h, to: equalY, cross: dragCX }, segB: { from: equalY + dh, to: C.y, cross: dragCX }, dist: equalGap });
-    }
-  }
-
-  return { snapX, snapY, guides };
+/** Path-cache key: one entry per connection + ports + curve style */
+function connKey(conn: FunnelConnection, curve: string): string {
+  return `${conn.id}:${conn.fromPort}:${conn.toPort}:${curve}`;
 }
 
 // ─── Auto-Layout ─────────────────────────────────────────────────────────────
 
 function computeAutoLayout(elements: FunnelElement[], connections: FunnelConnection[]): FunnelElement[] {
   if (elements.length === 0) return elements;
-  const incoming = new Set(connections.map(c => c.to));
-  const startIds = elements.filter(n => !incoming.has(n.id)).map(n => n.id);
-  if (startIds.length === 0) startIds.push(elements[0].id);
-
-  const layerMap = new Map<string, number>();
-  const queue: { id: string; depth: number }[] = startIds.map(id => ({ id, depth: 0 }));
-  const visited = new Set<string>();
-
-  while (queue.length > 0) {
-    const { id, depth } = queue.shift()!;
-    if (visited.has(id)) { if ((layerMap.get(id) ?? 0) < depth) layerMap.set(id, depth); continue; }
-    visited.add(id);
-    layerMap.set(id, depth);
-    for (const c of connections.filter(c => c.from === id)) queue.push({ id: c.to, depth: depth + 1 });
-  }
+  const byId = new Map(elements.map(el => [el.id, el]));
+  const dag = buildDag(elements.map(el => el.id), connections);
 
-  let maxLayer = Math.max(0, ...layerMap.values());
-  for (const el of elements) { if (!layerMap.has(el.id)) layerMap.set(el.id, ++maxLayer); }
-
-  const layers = new Map<number, string[]>();
-  for (const [id, layer] of layerMap) { const l = layers.get(layer) || []; l.push(id); layers.set(layer, l); }
+  // Unconnected elements have no inputs and stay in the first column with the roots;
+  // only elements the DAG could not place go to the end, one column each
+  const layers = dagLayers(dag);
+  const placed = new Set(dag.ids);
+  for (const el of elements) if (!placed.has(el.id)) layers.push([el.id]);
 
   const result = new Map<string, { x: number; y: number }>();
-  for (const [layer, ids] of layers) {
+  layers.forEach((ids, layer) => {
     ids.forEach((id, idx) => {
-      const el = elements.find(e => e.id === id);
+      const el = byId.get(id);
       const spacing = el ? Math.max(el.width + 120, 320) : 320;
       result.set(id, { x: 40 + layer * spacing, y: 40 + idx * 140 });
     });
-  }
+  });
 
   return elements.map(el => { const pos = result.get(el.id); return pos ? { ...el, x: pos.x, y: pos.y } : el; });
 }
@@ -719,7 +673,10 @@ export default function FunnelCanvas() {
   const isDark = theme === 'dark' || (theme === 'system' && typeof window !== 'undefined' && window.matchMedia('(prefers-color-scheme: dark)').matches);
 
   // ─── Board Management ────────────────────────────────────────────────────
-  const [boards, setBoards] = useState<FunnelBoard[]>(() => getAllFunnelBoards());
+  // List view reads the lightweight metadata index; bodies load on open
+  const userBoards = useSyncExternalStore(funnelBoardStore.subscribe, funnelBoardStore.listMeta);
+  const [demoHidden, setDemoHidden] = useState(false);
+  const boards = useMemo(() => (demoHidden ? [...userBoards] : withDemoFunnelBoard(userBoards)), [userBoards, demoHidden]);
   const [activeBoardId, setActiveBoardId] = useState<string | null>(null);
   const [showBoardList, setShowBoardList] = useState(true);
   const [boardName, setBoardName] = useState('');
@@ -832,48 +789,31 @@ export default function FunnelCanvas() {
   const [editPhaseLabel, setEditPhaseLabel] = useState('');
 
   // ─── Undo / Redo ─────────────────────────────────────────────────────────
-  const undoStackRef = useRef<FunnelSnapshot[]>([]);
-  const redoStackRef = useRef<FunnelSnapshot[]>([]);
-  const [canUndo, setCanUndo] = useState(false);
-  const [canRedo, setCanRedo] = useState(false);
-
-  const pushHistory = useCallback(() => {
-    undoStackRef.current = [...undoStackRef.current.slice(-40), { elements, connections, phases }];
-    redoStackRef.current = [];
-    setCanUndo(true);
-    setCanRedo(false);
-  }, [elements, connections, phases]);
+  // Shared ring-buffer engine; snapshots share unchanged arrays/items by reference
+  const history = useHistory<FunnelSnapshot>({ maxEntries: 100 });
+  const { canUndo, canRedo } = history;
+
+  const pushHistory = useCallback((coalesceKey?: string) => {
+    history.push({ elements, connections, phases }, coalesceKey);
+  }, [history, elements, connections, phases]);
+
+  const restoreSnapshot = useCallback((snap: FunnelSnapshot | null) => {
+    if (!snap) return;
+    setElements(snap.elements); setConnections(snap.connections); setPhases(snap.phases);
+  }, []);
 
   const historyUndo = useCallback(() => {
-    if (undoStackRef.current.length === 0) return;
-    const prev = undoStackRef.current[undoStackRef.current.length - 1];
-    undoStackRef.current = undoStackRef.current.slice(0, -1);
-    redoStackRef.current = [{ elements, connections, phases }, ...redoStackRef.current];
-    setElements(prev.elements); setConnections(prev.connections); setPhases(prev.phases);
-    setCanUndo(undoStackRef.current.length > 0); setCanRedo(true);
-  }, [elements, connections, phases]);
+    restoreSnapshot(history.undo({ elements, connections, phases }));
+  }, [history, restoreSnapshot, elements, connections, phases]);
 
   const historyRedo = useCallback(() => {
-    if (redoStackRef.current.length === 0) return;
-    const next = redoStackRef.current[0];
-    redoStackRef.current = redoStackRef.current.slice(1);
-    undoStackRef.current = [...undoStackRef.current, { elements, connections, phases }];
-    setElements(next.elements); setConnections(next.connections); setPhases(next.phases);
-    setCanUndo(true); setCanRedo(redoStackRef.current.length > 0);
-  }, [elements, connections, phases]);
+    restoreSnapshot(history.redo({ elements, connections, phases }));
+  }, [history, restoreSnapshot, elements, connections, phases]);
 
   const jumpToHistory = useCallback((index: number) => {
-    const stack = undoStackRef.current;
-    if (index < 0 || index >= stack.length) return;
-    const targetState = stack[index];
-    const currentState: FunnelSnapshot = { elements, connections, phases };
-    // States after target (plus current) become redo stack
-    const statesAfterTarget = stack.slice(index + 1);
-    redoStackRef.current = [...statesAfterTarget, currentState, ...redoStackRef.current];
-    undoStackRef.current = stack.slice(0, index);
-    setElements(targetState.elements); setConnections(targetState.connections); setPhases(targetState.phases);
-    setCanUndo(undoStackRef.current.length > 0); setCanRedo(redoStackRef.current.length > 0);
-  }, [elements, connections, phases]);
+    // Entries after the target (plus the current state) become redo steps
+    restoreSnapshot(history.jumpTo(index, { elements, connections, phases }));
+  }, [history, restoreSnapshot, elements, connections, phases]);
 
   // ─── Zoom refs ───────────────────────────────────────────────────────────
   const zoomRef = useRef(zoom);
@@ -892,6 +832,45 @@ export default function FunnelCanvas() {
   const canvasH = useMemo(() => Math.max(1200, ...elements.map(e => e.y + e.height + 200), ...phases.map(p => p.y + p.height + 200)), [elements, phases]);
   const zoomPct = Math.round(zoom * 100);
 
+  // ─── Viewport Culling ────────────────────────────────────────────────────
+  // Only phases/elements/connections intersecting the visible area (+ margin) are mounted.
+  const visibleRect = useVisibleCanvasRect(viewportRef, zoom, pan, showBoardList);
+  const elementById = useMemo(() => new Map(elements.map(e => [e.id, e])), [elements]);
+  const visiblePhases = useMemo(() => phases.filter(p => intersects(visibleRect, p.x, p.y, p.width, p.height)), [phases, visibleRect]);
+  const visibleElements = useMemo(() => elements.filter(e => intersects(visibleRect, e.x, e.y, e.width, e.height)), [elements, visibleRect]);
+  const visibleConnections = useMemo(() => connections.filter(conn => {
+    const from = elementById.get(conn.from), to = elementById.get(conn.to);
+    if (!from || !to) return false;
+    return connectionIntersects(visibleRect, { x: from.x, y: from.y, w: from.width, h: from.height }, { x: to.x, y: to.y, w: to.width, h: to.height });
+  }), [connections, elementById, visibleRect]);
+
+  // Path strings are rebuilt only for connections whose endpoint elements changed
+  const pathCacheRef = useRef(new Map<string, PathEntry<FunnelElement>>());
+  const connectionPaths = useMemo(() => {
+    pathCacheRef.current = reusePaths(
+      pathCacheRef.current,
+      visibleConnections,
+      conn => connKey(conn, globalConnCurve),
+      conn => {
+        const from = elementById.get(conn.from), to = elementById.get(conn.to);
+        return from && to ? [from, to] : null;
+      },
+      (conn, from, to) => globalConnCurve === 'straight' ? getStraightPath(from, to, conn.fromPort, conn.toPort) : globalConnCurve === 'step' ? getStepPath(from, to, conn.fromPort, conn.toPort) : getFunnelConnectionPath(from, to, conn.fromPort, conn.toPort),
+    );
+    return pathCacheRef.current;
+  }, [visibleConnections, elementById, globalConnCurve]);
+
+  // ─── Spatial Index ───────────────────────────────────────────────────────
+  // Grid over elements/phases for snapping, spacing guides, lasso and hit-testing.
+  // Synced incrementally: only items whose object changed are re-bucketed.
+  const spatialRef = useRef(createSpatialIndex());
+  const spatial = useMemo(() => {
+    const idx = spatialRef.current;
+    idx.sync('element', elements, e => ({ x: e.x, y: e.y, w: e.width, h: e.height }));
+    idx.sync('phase', phases, p => ({ x: p.x, y: p.y, w: p.width, h: p.height }));
+    return idx;
+  }, [elements, phases]);
+
   const fitToScreen = useCallback(() => {
     const rect = viewportRef.current?.getBoundingClientRect();
     if (!rect) return;
@@ -908,7 +887,30 @@ export default function FunnelCanvas() {
   }, [elements, phases]);
 
   // ─── Board CRUD ──────────────────────────────────────────────────────────
+  // Last persisted contents of the active board; autosave skips unchanged state
+  const persistedRef = useRef<{ elements: FunnelElement[]; connections: FunnelConnection[]; phases: FunnelPhase[]; name: string; desc: string } | null>(null);
+  // Board waiting for the debounced autosave
+  const pendingSaveRef = useRef<{ board: FunnelBoard; timer: ReturnType<typeof setTimeout> } | null>(null);
+
+  const flushPendingSave = useCallback(() => {
+    const pending = pendingSaveRef.current;
+    if (!pending) return;
+    clearTimeout(pending.timer);
+    pendingSaveRef.current = null;
+    saveFunnelBoard(pending.board);
+  }, []);
+
+  const dropPendingSave = useCallback(() => {
+    if (pendingSaveRef.current) clearTimeout(pendingSaveRef.current.timer);
+    pendingSaveRef.current = null;
+  }, []);
+
+  // Unmount: nothing typed in the last AUTOSAVE_DELAY ms gets lost
+  useEffect(() => flushPendingSave, [flushPendingSave]);
+
   const loadBoard = useCallback((board: FunnelBoard) => {
+    flushPendingSave();
+    persistedRef.current = { elements: board.elements, connections: board.connections, phases: board.phases, name: board.name, desc: board.description };
     setElements(board.elements);
     setConnections(board.connections);
     setPhases(board.phases);
@@ -917,12 +919,14 @@ export default function FunnelCanvas() {
     setBoardDesc(board.description);
     setShowBoardList(false);
     setPaletteOpen(true);
-    undoStackRef.current = [];
-    redoStackRef.current = [];
-    setCanUndo(false);
-    setCanRedo(false);
+    history.clear();
     requestAnimationFrame(() => requestAnimationFrame(() => fitToScreen()));
-  }, [fitToScreen]);
+  }, [fitToScreen, history, flushPendingSave]);
+
+  const openBoard = useCallback(async (id: string) => {
+    const board = await loadFunnelBoard(id);
+    if (board) loadBoard(board);
+  }, [loadBoard]);
 
   const createNewBoard = useCallback(() => {
     const now = new Date().toISOString();
@@ -931,38 +935,47 @@ export default function FunnelCanvas() {
       name: 'Neues Board', description: '', elements: [], connections: [], phases: [],
       createdAt: now, updatedAt: now,
     };
-    const updated = [...boards, board];
-    setBoards(updated);
-    saveFunnelBoards(updated);
+    saveFunnelBoard(board);
     loadBoard(board);
-  }, [boards, loadBoard]);
+  }, [loadBoard]);
+
+  const buildActiveBoard = useCallback((id: string): FunnelBoard => ({
+    id, name: boardName || 'Unbenannt', description: boardDesc,
+    elements, connections, phases,
+    createdAt: boards.find(b => b.id === id)?.createdAt || new Date().toISOString(),
+    updatedAt: new Date().toISOString(),
+  }), [boardName, boardDesc, elements, connections, phases, boards]);
+
+  // Autosave: debounced here so drags don't touch the store (and its listeners) every frame;
+  // the store then writes only this board's record
+  useEffect(() => {
+    if (!activeBoardId) return;
+    const last = persistedRef.current;
+    if (last && last.elements === elements && last.connections === connections && last.phases === phases && last.name === boardName && last.desc === boardDesc) return;
+    persistedRef.current = { elements, connections, phases, name: boardName, desc: boardDesc };
+    const board = buildActiveBoard(activeBoardId);
+    if (pendingSaveRef.current) clearTimeout(pendingSaveRef.current.timer);
+    pendingSaveRef.current = { board, timer: setTimeout(flushPendingSave, AUTOSAVE_DELAY) };
+  }, [activeBoardId, elements, connections, phases, boardName, boardDesc, buildActiveBoard, flushPendingSave]);
 
   const saveCurrentBoard = useCallback(() => {
     if (!activeBoardId) return;
+    dropPendingSave();
     setSaveState('saving');
-    const board: FunnelBoard = {
-      id: activeBoardId, name: boardName || 'Unbenannt', description: boardDesc,
-      elements, connections, phases,
-      createdAt: boards.find(b => b.id === activeBoardId)?.createdAt || new Date().toISOString(),
-      updatedAt: new Date().toISOString(),
-    };
-    const updated = boards.map(b => b.id === activeBoardId ? board : b);
-    if (!updated.find(b => b.id === activeBoardId)) updated.push(board);
-    setBoards(updated);
-    saveFunnelBoards(updated);
-    setTimeout(() => { setSaveState('saved'); setTimeout(() => setSaveState('idle'), 1500); }, 300);
-  }, [activeBoardId, boardName, boardDesc, elements, connections, phases, boards]);
+    persistedRef.current = { elements, connections, phases, name: boardName, desc: boardDesc };
+    saveFunnelBoard(buildActiveBoard(activeBoardId));
+    flushFunnelBoards().then(() => { setSaveState('saved'); setTimeout(() => setSaveState('idle'), 1500); });
+  }, [activeBoardId, elements, connections, phases, boardName, boardDesc, buildActiveBoard, dropPendingSave]);
 
   const handleDeleteBoard = useCallback((id: string) => {
-    const updated = boards.filter(b => b.id !== id);
-    setBoards(updated);
-    if (id !== 'demo-funnel-1') deleteFunnelBoard(id);
+    if (pendingSaveRef.current?.board.id === id) dropPendingSave();
+    deleteFunnelBoard(id);
+    if (id === DEMO_FUNNEL_BOARD.id) setDemoHidden(true);
     if (activeBoardId === id) { setActiveBoardId(null); setShowBoardList(true); setElements([]); setConnections([]); setPhases([]); }
-  }, [boards, activeBoardId]);
+  }, [activeBoardId, dropPendingSave]);
 
   const handleDuplicateBoard = useCallback((id: string) => {
-    const copy = duplicateFunnelBoard(id);
-    if (copy) setBoards(prev => [...prev, copy]);
+    void duplicateFunnelBoard(id);
   }, []);
 
   // ─── Wheel Zoom ──────────────────────────────────────────────────────────
@@ -1081,6 +1094,8 @@ export default function FunnelCanvas() {
           const step = e.shiftKey ? 10 : 1;
           const dx = e.key === 'ArrowLeft' ? -step : e.key === 'ArrowRight' ? step : 0;
           const dy = e.key === 'ArrowUp' ? -step : e.key === 'ArrowDown' ? step : 0;
+          // Held/repeated arrow keys coalesce into one undo step
+          pushHistory('nudge');
           setElements(prev => prev.map(el => ids.has(el.id) ? { ...el, x: Math.max(0, el.x + dx), y: Math.max(0, el.y + dy) } : el));
         }
       }
@@ -1192,11 +1207,7 @@ export default function FunnelCanvas() {
       if (!el) return;
 
       if (snapEnabled) {
-        const items: CanvasItem[] = [
-          ...elements.map(e => ({ id: e.id, x: e.x, y: e.y, w: e.width, h: e.height })),
-          ...phases.map(p => ({ id: p.id, x: p.x, y: p.y, w: p.width, h: p.height })),
-        ];
-        const others = items.filter(it => it.id !== dragState.id);
+        const others = querySnapCandidates(spatial, sx, sy, el.width, el.height, SNAP_THRESHOLD * 2, dragState.id);
         const newSnapX: number[] = [], newSnapY: number[] = [];
 
         for (const o of others) {
@@ -1208,7 +1219,7 @@ export default function FunnelCanvas() {
           if (Math.abs(sy + el.height / 2 - (o.y + o.h / 2)) < SNAP_THRESHOLD) { sy = o.y + o.h / 2 - el.height / 2; newSnapY.push(o.y + o.h / 2); }
         }
 
-        const eqResult = detectEqualSpacing(items, dragState.id, sx, sy, el.width, el.height, SNAP_THRESHOLD);
+        const eqResult = detectEqualSpacing(spatial, dragState.id, sx, sy, el.width, el.height, SNAP_THRESHOLD);
         if (eqResult.snapX !== null) sx = eqResult.snapX;
         if (eqResult.snapY !== null) sy = eqResult.snapY;
         setSnapLines({ x: newSnapX, y: newSnapY });
@@ -1242,20 +1253,19 @@ export default function FunnelCanvas() {
       const lx = Math.min(lassoState.startX, pos.x), ly = Math.min(lassoState.startY, pos.y);
       const lw = Math.abs(pos.x - lassoState.startX), lh = Math.abs(pos.y - lassoState.startY);
       const inside = new Set<string>();
-      for (const el of elements) {
-        const ex = el.x + el.width / 2, ey = el.y + el.height / 2;
+      for (const el of spatial.query({ x: lx, y: ly, w: lw, h: lh }, ['element'])) {
+        const ex = el.x + el.w / 2, ey = el.y + el.h / 2;
         if (ex >= lx && ex <= lx + lw && ey >= ly && ey <= ly + lh) inside.add(el.id);
       }
       setMultiSelectedIds(inside);
       return;
     }
-  }, [isPanning, panThresholdMet, panStart, panStartMouse, connectState, reconnectState, resizeState, dragState, dragPhaseState, lassoState, screenToCanvas, elements, phases, snapEnabled, multiSelectedIds]);
+  }, [isPanning, panThresholdMet, panStart, panStartMouse, connectState, reconnectState, resizeState, dragState, dragPhaseState, lassoState, screenToCanvas, elements, spatial, snapEnabled, multiSelectedIds]);
 
   const handleViewportMouseUp = useCallback(() => {
     if (reconnectState) { setReconnectState(null); }
-    if (dragState) { pushHistory(); }
-    if (dragPhaseState) { pushHistory(); }
-    if (resizeState) { pushHistory(); }
+    // One history entry per drag/resize gesture (only if something moved)
+    if (dragState || dragPhaseState || resizeState) { history.commit({ elements, connections, phases }); }
     if (lassoState) {
       // Set primary selection to first multi-selected if any
       if (multiSelectedIds.size > 0) {
@@ -1266,7 +1276,7 @@ export default function FunnelCanvas() {
     }
     setIsPanning(false); setDragState(null); setDragPhaseState(null); setResizeState(null);
     setSnapLines({ x: [], y: [] }); setEqualSpacingGuides([]);
-  }, [dragState, dragPhaseState, resizeState, lassoState, multiSelectedIds, reconnectState, pushHistory]);
+  }, [dragState, dragPhaseState, resizeState, lassoState, multiSelectedIds, reconnectState, history, elements, connections, phases]);
 
   // ─── Element Interaction ─────────────────────────────────────────────────
   const handleElementMouseDown = useCallback((e: React.MouseEvent, id: string) => {
@@ -1275,6 +1285,7 @@ export default function FunnelCanvas() {
     const el = elements.find(el => el.id === id);
     if (!el) return;
     const pos = screenToCanvas(e.clientX, e.clientY);
+    history.begin({ elements, connections, phases });
     setDragState({ id, offsetX: pos.x - el.x, offsetY: pos.y - el.y });
     if (e.shiftKey) {
       // Shift+Click: toggle element in multi-selection
@@ -1294,7 +1305,7 @@ export default function FunnelCanvas() {
       setSelectedElementId(id);
     }
     setSelectedConnId(null); setSelectedPhaseId(null);
-  }, [elements, spaceHeld, screenToCanvas, selectedElementId, multiSelectedIds]);
+  }, [elements, connections, phases, history, spaceHeld, screenToCanvas, selectedElementId, multiSelectedIds]);
 
   const handlePhaseMouseDown = useCallback((e: React.MouseEvent, id: string) => {
     if (spaceHeld) return;
@@ -1302,9 +1313,10 @@ export default function FunnelCanvas() {
     const phase = phases.find(p => p.id === id);
     if (!phase) return;
     const pos = screenToCanvas(e.clientX, e.clientY);
+    history.begin({ elements, connections, phases });
     setDragPhaseState({ id, offsetX: pos.x - phase.x, offsetY: pos.y - phase.y });
     setSelectedPhaseId(id); setSelectedElementId(null); setSelectedConnId(null);
-  }, [phases, spaceHeld, screenToCanvas]);
+  }, [elements, connections, phases, history, spaceHeld, screenToCanvas]);
 
   const handleResizeStart = useCallback((e: React.MouseEvent, id: string, kind: 'element' | 'phase') => {
     e.stopPropagation();
@@ -1313,8 +1325,9 @@ export default function FunnelCanvas() {
     if (!item) return;
     const w = 'width' in item ? item.width : 200;
     const h = 'height' in item ? item.height : 80;
+    history.begin({ elements, connections, phases });
     setResizeState({ id, kind, startX: pos.x, startY: pos.y, startW: w, startH: h });
-  }, [elements, phases, screenToCanvas]);
+  }, [elements, connections, phases, history, screenToCanvas]);
 
   // ─── Port / Connection ───────────────────────────────────────────────────
   const handlePortClick = useCallback((e: React.MouseEvent, elementId: string, port: PortDirection) => {
@@ -1522,8 +1535,15 @@ export default function FunnelCanvas() {
     if (!rect) return;
     const canvasX = (e.clientX - rect.left - pan.x) / zoom;
     const canvasY = (e.clientY - rect.top - pan.y) / zoom;
+    // Right-click that reached the canvas (e.g. through a phase) → hit-test elements underneath
+    const hit = spatial.hitTest(canvasX, canvasY, ['element'])[0];
+    if (hit) {
+      setSelectedElementId(hit.id);
+      setRightClickMenu({ x: e.clientX, y: e.clientY, canvasX, canvasY, targetType: 'element', targetId: hit.id });
+      return;
+    }
     setRightClickMenu({ x: e.clientX, y: e.clientY, canvasX, canvasY, targetType: 'canvas' });
-  }, [pan, zoom]);
+  }, [pan, zoom, spatial]);
 
   const handleElementContextMenu = useCallback((e: React.MouseEvent, id: string) => {
     e.preventDefault();
@@ -1595,74 +1615,70 @@ export default function FunnelCanvas() {
   }, []);
 
   // ─── PNG Export ──────────────────────────────────────────────────────────
+  const [exportProgress, setExportProgress] = useState<number | null>(null);
+  const exportAbortRef = useRef<AbortController | null>(null);
+  useEffect(() => () => exportAbortRef.current?.abort(), []);
+
   const handleExportPNG = useCallback(() => {
     if (elements.length === 0) return;
-    const allBounds = [
-      ...elements.map(e => ({ l: e.x, t: e.y, r: e.x + e.width, b: e.y + e.height })),
-      ...phases.map(p => ({ l: p.x, t: p.y, r: p.x + p.width, b: p.y + p.height })),
-    ];
-    const minX = Math.min(...allBounds.map(b => b.l)) - 40;
-    const minY = Math.min(...allBounds.map(b => b.t)) - 40;
-    const maxX = Math.max(...allBounds.map(b => b.r)) + 40;
-    const maxY = Math.max(...allBounds.map(b => b.b)) + 40;
-    const w = maxX - minX, h = maxY - minY;
 
-    let svg = `<svg width="${w * 2}" height="${h * 2}" xmlns="http://www.w3.org/2000/svg">`;
-    svg += `<rect width="${w * 2}" height="${h * 2}" fill="${isDark ? '#18181b' : '#f9fafb'}" />`;
-    svg += `<g transform="scale(2)">`;
+    // Serialize the board once (board coordinates); rendering happens in the export worker
+    const shapes: SceneShape[] = [];
 
     for (const p of phases) {
       const c = GROUP_COLORS[p.color] || GROUP_COLORS.gray;
-      svg += `<rect x="${p.x - minX}" y="${p.y - minY}" width="${p.width}" height="${p.height}" rx="16" fill="${c.bg}" stroke="${c.border}" stroke-width="2" stroke-dasharray="8,4" />`;
-      svg += `<text x="${p.x - minX + 16}" y="${p.y - minY + 24}" font-family="sans-serif" font-size="11" font-weight="700" fill="${c.text}" text-transform="uppercase">${p.label}</text>`;
+      shapes.push({ kind: 'rect', x: p.x, y: p.y, w: p.width, h: p.height, rx: 16, fill: c.bg, stroke: c.border, strokeWidth: 2, dash: [8, 4] });
+      shapes.push({ kind: 'text', x: p.x + 16, y: p.y + 24, text: p.label, size: 11, weight: 700, fill: c.text });
     }
 
     for (const conn of connections) {
-      const from = elements.find(e => e.id === conn.from);
-      const to = elements.find(e => e.id === conn.to);
+      const from = elementById.get(conn.from);
+      const to = elementById.get(conn.to);
       if (!from || !to) continue;
-      const pathD = getFunnelConnectionPath(from, to, conn.fromPort, conn.toPort);
-      const dash = conn.lineStyle === 'dashed' ? 'stroke-dasharray="8,4"' : conn.lineStyle === 'dotted' ? 'stroke-dasharray="3,3"' : '';
-      svg += `<path d="${pathD}" stroke="${conn.color || '#a855f7'}" stroke-width="2" fill="none" opacity="0.6" ${dash} />`;
+      const d = getFunnelConnectionPath(from, to, conn.fromPort, conn.toPort);
+      const dash = conn.lineStyle === 'dashed' ? [8, 4] : conn.lineStyle === 'dotted' ? [3, 3] : undefined;
+      shapes.push({ kind: 'path', d, stroke: conn.color || '#a855f7', strokeWidth: 2, opacity: 0.6, dash });
       if (conn.label) {
-        const mx = (from.x + from.width / 2 + to.x + to.width / 2) / 2 - minX;
-        const my = (from.y + from.height / 2 + to.y + to.height / 2) / 2 - minY - 8;
-        svg += `<text x="${mx}" y="${my}" font-family="sans-serif" font-size="10" fill="${isDark ? '#a1a1aa' : '#6b7280'}" text-anchor="middle">${conn.label}</text>`;
+        const mx = (from.x + from.width / 2 + to.x + to.width / 2) / 2;
+        const my = (from.y + from.height / 2 + to.y + to.height / 2) / 2 - 8;
+        shapes.push({ kind: 'text', x: mx, y: my, text: conn.label, size: 10, fill: isDark ? '#a1a1aa' : '#6b7280', anchor: 'middle' });
       }
     }
 
+    const platformColor = new Map(PLATFORMS.map(p => [p.kind, p.color]));
     for (const el of elements) {
       if (el.type === 'platform') {
-        const platform = PLATFORMS.find(p => p.kind === el.platformKind);
-        const color = platform?.color || '#8b5cf6';
-        svg += `<rect x="${el.x - minX}" y="${el.y - minY}" width="${el.width}" height="${el.height}" rx="12" fill="${color}12" stroke="${color}30" stroke-width="1.5" />`;
-        svg += `<text x="${el.x - minX + 48}" y="${el.y - minY + el.height / 2 + 4}" font-family="sans-serif" font-size="13" font-weight="600" fill="${isDark ? '#fff' : '#111'}">${(el.label || '').substring(0, 22)}</text>`;
+        const color = (el.platformKind && platformColor.get(el.platformKind)) || '#8b5cf6';
+        shapes.push({ kind: 'rect', x: el.x, y: el.y, w: el.width, h: el.height, rx: 12, fill: `${color}12`, stroke: `${color}30`, strokeWidth: 1.5 });
+        shapes.push({ kind: 'text', x: el.x + 48, y: el.y + el.height / 2 + 4, text: (el.label || '').substring(0, 22), size: 13, weight: 600, fill: isDark ? '#fff' : '#111' });
       } else if (el.type === 'text') {
-        svg += `<text x="${el.x - minX + 8}" y="${el.y - minY + 20}" font-family="sans-serif" font-size="${el.fontSize || 14}" fill="${el.textColor || (isDark ? '#e4e4e7' : '#374151')}">${(el.textContent || '').substring(0, 50)}</text>`;
+        shapes.push({ kind: 'text', x: el.x + 8, y: el.y + 20, text: (el.textContent || '').substring(0, 50), size: el.fontSize || 14, fill: el.textColor || (isDark ? '#e4e4e7' : '#374151') });
       } else {
-        svg += `<rect x="${el.x - minX}" y="${el.y - minY}" width="${el.width}" height="${el.height}" rx="12" fill="${isDark ? '#27272a' : '#f3f4f6'}" stroke="${isDark ? '#3f3f46' : '#d1d5db'}" stroke-width="1.5" />`;
+        shapes.push({ kind: 'rect', x: el.x, y: el.y, w: el.width, h: el.height, rx: 12, fill: isDark ? '#27272a' : '#f3f4f6', stroke: isDark ? '#3f3f46' : '#d1d5db', strokeWidth: 1.5 });
       }
     }
 
-    svg += '</g></svg>';
-
-    const blob = new Blob([svg], { type: 'image/svg+xml;charset=utf-8' });
-    const url = URL.createObjectURL(blob);
-    const img = new window.Image();
-    img.onload = () => {
-      const canvas = document.createElement('canvas');
-      canvas.width = w * 2; canvas.height = h * 2;
-      const ctx = canvas.getContext('2d');
-      if (!ctx) return;
-      ctx.drawImage(img, 0, 0);
-      URL.revokeObjectURL(url);
-      const a = document.createElement('a');
-      a.href = canvas.toDataURL('image/png');
-      a.download = `funnel-${(boardName || 'export').replace(/\s+/g, '-').toLowerCase()}.png`;
-      document.body.appendChild(a); a.click(); document.body.removeChild(a);
-    };
-    img.src = url;
-  }, [elements, connections, phases, isDark, boardName]);
+    const bounds = sceneBounds([
+      ...elements.map(e => ({ x: e.x, y: e.y, w: e.width, h: e.height })),
+      ...phases.map(p => ({ x: p.x, y: p.y, w: p.width, h: p.height })),
+    ], 40);
+    const scene: ExportScene = { ...bounds, background: isDark ? '#18181b' : '#f9fafb', shapes };
+
+    exportAbortRef.current?.abort();
+    const controller = new AbortController();
+    exportAbortRef.current = controller;
+    setExportProgress(0);
+    exportScene(scene, { format: 'png', scale: 2, signal: controller.signal, onProgress: setExportProgress })
+      .then(blob => downloadBlob(blob, `funnel-${(boardName || 'export').replace(/\s+/g, '-').toLowerCase()}.png`))
+      .catch(err => { if (!(err instanceof DOMException && err.name === 'AbortError')) console.warn('PNG export failed:', err); })
+      .finally(() => {
+        if (exportAbortRef.current !== controller) return;
+        exportAbortRef.current = null;
+        setExportProgress(null);
+      });
+  }, [elements, elementById, connections, phases, isDark, boardName]);
+
+  const cancelExport = useCallback(() => exportAbortRef.current?.abort(), []);
 
   // ─── Funnel Metrics ─────────────────────────────────────────────────────
   // Default metric label per platform kind
@@ -1689,25 +1705,9 @@ export default function FunnelCanvas() {
     const connectedEls = elements.filter(e => connectedIds.has(e.id) && e.type !== 'text');
     if (connectedEls.length === 0) return [];
 
-    // BFS from root elements (no incoming connections) to compute ordered steps
-    const incoming = new Set(connections.map(c => c.to));
-    const roots = connectedEls.filter(e => !incoming.has(e.id));
-    if (roots.length === 0) return connectedEls; // cycle fallback
-    const visited = new Set<string>();
-    const ordered: FunnelElement[] = [];
-    const queue = [...roots];
-    while (queue.length > 0) {
-      const el = queue.shift()!;
-      if (visited.has(el.id)) continue;
-      visited.add(el.id);
-      ordered.push(el);
-      const outgoing = connections.filter(c => c.from === el.id);
-      for (const conn of outgoing) {
-        const target = elements.find(e => e.id === conn.to);
-        if (target && !visited.has(target.id) && target.type !== 'text') queue.push(target);
-      }
-    }
-    return ordered;
+    // Topological order over the connected elements (cycles are broken deterministically)
+    const byId = new Map(connectedEls.map(e => [e.id, e]));
+    return buildDag(connectedEls.map(e => e.id), connections).ids.map(id => byId.get(id)!);
   }, [elements, connections]);
 
   const handleMetricChange = useCallback((id: string, value: number) => {
@@ -1772,10 +1772,10 @@ export default function FunnelCanvas() {
               <p className="text-sm text-gray-500 dark:text-zinc-400 leading-relaxed mb-5 line-clamp-2">{board.description || 'Keine Beschreibung'}</p>
               <div className="flex items-center justify-between">
                 <div className="flex items-center gap-4 text-xs text-gray-400 dark:text-zinc-500">
-                  <span>{board.elements.length} Elemente</span>
+                  <span>{board.elementCount} Elemente</span>
                   <span>{new Date(board.updatedAt).toLocaleDateString('de-DE', { day: '2-digit', month: '2-digit', year: '2-digit' })}</span>
                 </div>
-                <button onClick={() => loadBoard(board)} className="flex items-center gap-1 text-sm text-purple-600 dark:text-purple-400 opacity-0 group-hover:opacity-100 transition-opacity hover:underline">
+                <button onClick={() => openBoard(board.id)} className="flex items-center gap-1 text-sm text-purple-600 dark:text-purple-400 opacity-0 group-hover:opacity-100 transition-opacity hover:underline">
                   Öffnen
                 </button>
               </div>
@@ -1810,7 +1810,11 @@ export default function FunnelCanvas() {
         <button onClick={() => setShowGrid(!showGrid)} className={`p-1.5 rounded-lg transition-colors ${showGrid ? 'bg-purple-50 dark:bg-purple-500/10 text-purple-600 dark:text-purple-400' : 'text-gray-400 hover:bg-gray-100 dark:hover:bg-zinc-800'}`} title="Raster"><Grid3X3 size={15} /></button>
         <button onClick={() => { setSearchOpen(!searchOpen); setSearchQuery(''); }} className={`p-1.5 rounded-lg transition-colors ${searchOpen ? 'bg-purple-50 dark:bg-purple-500/10 text-purple-600 dark:text-purple-400' : 'text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800'}`} title="Suche (Ctrl+F)"><Search size={15} /></button>
         <button onClick={handleAutoLayout} disabled={elements.length === 0} className="p-1.5 rounded-lg text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors disabled:opacity-30" title="Auto-Layout"><GitBranch size={15} /></button>
-        <button onClick={handleExportPNG} disabled={elements.length === 0} className="p-1.5 rounded-lg text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors disabled:opacity-30" title="PNG Export"><Download size={15} /></button>
+        {exportProgress !== null ? (
+          <button onClick={cancelExport} className="px-1.5 py-1 rounded-lg text-[10px] font-semibold tabular-nums text-purple-600 dark:text-purple-400 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors" title="Export abbrechen">{Math.round(exportProgress * 100)}%</button>
+        ) : (
+          <button onClick={handleExportPNG} disabled={elements.length === 0} className="p-1.5 rounded-lg text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors disabled:opacity-30" title="PNG Export"><Download size={15} /></button>
+        )}
         <button onClick={() => setShowMetrics(!showMetrics)} className={`p-1.5 rounded-lg transition-colors ${showMetrics ? 'bg-purple-50 dark:bg-purple-500/10 text-purple-600 dark:text-purple-400' : 'text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800'}`} title="Funnel-Metriken"><BarChart3 size={15} /></button>
         <button onClick={() => setShowGlobalStyles(!showGlobalStyles)} className={`p-1.5 rounded-lg transition-colors ${showGlobalStyles ? 'bg-purple-50 dark:bg-purple-500/10 text-purple-600 dark:text-purple-400' : 'text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800'}`} title="Globale Stile"><SlidersHorizontal size={15} /></button>
 
@@ -1853,8 +1857,8 @@ export default function FunnelCanvas() {
                 <span className="text-[10px] ml-auto opacity-60">{elements.length} Elemente · {connections.length} Verbindungen</span>
               </div>
               {/* Undo stack (most recent first) */}
-              {[...undoStackRef.current].reverse().map((snap, reverseIdx) => {
-                const realIdx = undoStackRef.current.length - 1 - reverseIdx;
+              {history.entries().reverse().map((snap, reverseIdx, list) => {
+                const realIdx = list.length - 1 - reverseIdx;
                 return (
                   <button key={reverseIdx} onClick={() => { jumpToHistory(realIdx); setShowHistoryPanel(false); }}
                     className="w-full flex items-center gap-2 px-2 py-1.5 rounded-lg text-left hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors group">
@@ -2168,7 +2172,7 @@ export default function FunnelCanvas() {
                     <path d={globalConnArrowhead === 'filled' ? 'M0,0 L10,4 L0,8 L2,4 Z' : 'M1,1 L9,4 L1,7'} fill={globalConnArrowhead === 'filled' ? CONN_COLORS[globalConnColor] : 'none'} stroke={globalConnArrowhead === 'open' ? CONN_COLORS[globalConnColor] : 'none'} strokeWidth={1.5} />
                   </marker>
                 )}
-                {connections.map(conn => {
+                {visibleConnections.map(conn => {
                   const c = conn.color || CONN_COLORS[globalConnColor];
                   const arrowPath = globalConnArrowhead === 'filled' ? `M0,0 L10,4 L0,8 L2,4 Z` : `M1,1 L9,4 L1,7`;
                   return globalConnArrowhead !== 'none' ? <marker key={`ah-${conn.id}`} id={`arrowhead-${conn.id}`} markerWidth="10" markerHeight="8" refX="9" refY="4" orient="auto" markerUnits="userSpaceOnUse"><path d={arrowPath} fill={globalConnArrowhead === 'filled' ? c : 'none'} stroke={globalConnArrowhead === 'open' ? c : 'none'} strokeWidth={1.5} /></marker> : null;
@@ -2178,12 +2182,12 @@ export default function FunnelCanvas() {
               {showGrid && <rect width="100%" height="100%" fill="url(#funnelGrid)" />}
 
               {/* Connections */}
-              {connections.map(conn => {
-                const from = elements.find(e => e.id === conn.from);
-                const to = elements.find(e => e.id === conn.to);
-                if (!from || !to) return null;
-                // Global curve style
-                const pathD = globalConnCurve === 'straight' ? getStraightPath(from, to, conn.fromPort, conn.toPort) : globalConnCurve === 'step' ? getStepPath(from, to, conn.fromPort, conn.toPort) : getFunnelConnectionPath(from, to, conn.fromPort, conn.toPort);
+              {visibleConnections.map(conn => {
+                const from = elementById.get(conn.from);
+                const to = elementById.get(conn.to);
+                // Global curve style (cached per endpoint pair)
+                const pathD = connectionPaths.get(connKey(conn, globalConnCurve))?.d;
+                if (!from || !to || !pathD) return null;
                 const isSelected = selectedConnId === conn.id;
                 const isHovered = hoveredConnId === conn.id;
                 // Global styles apply to all connections
@@ -2330,7 +2334,7 @@ export default function FunnelCanvas() {
             </svg>
 
             {/* Phases */}
-            {phases.map(phase => {
+            {visiblePhases.map(phase => {
               const colors = GROUP_COLORS[phase.color] || GROUP_COLORS.gray;
               const isSelected = selectedPhaseId === phase.id;
               return (
@@ -2350,7 +2354,7 @@ export default function FunnelCanvas() {
             })}
 
             {/* Elements */}
-            {elements.map(el => {
+            {visibleElements.map(el => {
               const isSelected = selectedElementId === el.id;
               const isMultiSelected = multiSelectedIds.has(el.id);
               const isAnySelected = isSelected || isMultiSelected;
@@ -8,7 +8,7 @@
  *       extract them into a translation map keyed by locale.
  */
 
-import { useState, useRef, useCallback, useEffect, useMemo } from 'react';
+import { useState, useRef, useCallback, useEffect, useMemo, memo } from 'react';
 import {
   Zap, Plus, Trash2, Save, Users, FileText, Globe, Mail,
   Target, BarChart3, Database, Sparkles, Search, Image,
@@ -24,6 +24,18 @@ import type { AutomationSystem, SystemNode, NodeConnection, NodeType, CanvasGrou
 import type { NodeExecutionStatus } from '@/types/workflowEvents';
 import { TOOL_LOGOS, getToolLogosByCategory, renderNodeIcon } from './ToolLogos';
 import { useLanguage } from '@/i18n/LanguageContext';
+import { intersects, connectionIntersects, reusePaths } from '@/lib/viewport';
+import type { PathEntry } from '@/lib/viewport';
+import { createSpatialIndex, querySnapCandidates, detectEqualSpacing } from '@/lib/spatialIndex';
+import type { EqGuide } from '@/lib/spatialIndex';
+import { buildDag, dagLayers, planSchedule } from '@/lib/scheduler';
+import { sceneBounds } from '@/lib/exportScene';
+import type { ExportScene, SceneShape } from '@/lib/exportScene';
+import { exportScene, downloadBlob } from '@/services/exportService';
+import { useVisibleCanvasRect } from '@/hooks/useVisibleCanvasRect';
+import { useHistory } from '@/hooks/useHistory';
+import { useNodeExecutionStatus, useExecutionPhase } from '@/hooks/useWorkflowExecution';
+import type { ExecutionStore } from '@/services/executionStore';
 
 // ─── Constants ───────────────────────────────────────────────────────────────
 
@@ -98,58 +110,27 @@ function wouldCreateCycle(
   return false;
 }
 
-// ─── Auto-Layout (BFS Layering) ─────────────────────────────────────────────
+// ─── Auto-Layout (Topological Layering) ─────────────────────────────────────
 
 function computeAutoLayout(nodes: SystemNode[], connections: NodeConnection[]): SystemNode[] {
   if (nodes.length === 0) return nodes;
 
-  const incoming = new Set(connections.map(c => c.to));
-  const startIds = nodes
-    .filter(n => n.type === 'trigger' || !incoming.has(n.id))
-    .map(n => n.id);
-  if (startIds.length === 0) startIds.push(nodes[0].id);
+  // Longest-path layers: a join sits one column right of its deepest input
+  const byId = new Map(nodes.map(n => [n.id, n]));
+  const dag = buildDag(nodes.map(n => n.id), connections, { isRoot: id => byId.get(id)?.type === 'trigger' });
 
-  const layerMap = new Map<string, number>();
-  const queue: { id: string; depth: number }[] = startIds.map(id => ({ id, depth: 0 }));
-  const visited = new Set<string>();
-
-  while (queue.length > 0) {
-    const { id, depth } = queue.shift()!;
-    if (visited.has(id)) {
-      // Update to deeper layer if reached again
-      if ((layerMap.get(id) ?? 0) < depth) layerMap.set(id, depth);
-      continue;
-    }
-    visited.add(id);
-    layerMap.set(id, depth);
-    for (const conn of connections.filter(c => c.from === id)) {
-      queue.push({ id: conn.to, depth: depth + 1 });
-    }
-  }
-
-  // Unconnected nodes go to the end
-  let maxLayer = Math.max(0, ...layerMap.values());
-  for (const n of nodes) {
-    if (!layerMap.has(n.id)) {
-      layerMap.set(n.id, ++maxLayer);
-    }
-  }
-
-  // Group nodes by layer
-  const layers = new Map<number, string[]>();
-  for (const [id, layer] of layerMap) {
-    const list = layers.get(layer) || [];
-    list.push(id);
-    layers.set(layer, list);
-  }
+  // Unconnected nodes have no inputs and stay in the first column with the roots;
+  // only nodes the DAG could not place go to the end, one column each
+  const layers = dagLayers(dag);
+  const placed = new Set(dag.ids);
+  for (const n of nodes) if (!placed.has(n.id)) layers.push([n.id]);
 
-  // Position nodes
   const result = new Map<string, { x: number; y: number }>();
-  for (const [layer, ids] of layers) {
+  layers.forEach((ids, layer) => {
     ids.forEach((id, idx) => {
       result.set(id, { x: 40 + layer * 340, y: 40 + idx * 108 });
     });
-  }
+  });
 
   return nodes.map(n => {
     const pos = result.get(n.id);
@@ -185,6 +166,11 @@ export function getConnectionPath(
   return `M ${p1.x} ${p1.y} C ${p1.x + d1[0] * offset} ${p1.y + d1[1] * offset}, ${p2.x + d2[0] * offset} ${p2.y + d2[1] * offset}, ${p2.x} ${p2.y}`;
 }
 
+/** Path-cache key: one entry per endpoint pair + ports */
+function connKey(conn: NodeConnection): string {
+  return `${conn.from}>${conn.to}:${conn.fromPort || 'right'}:${conn.toPort || 'left'}`;
+}
+
 function getTempPath(
   fx: number, fy: number, fromDir: [number, number],
   tx: number, ty: number,
@@ -194,58 +180,6 @@ function getTempPath(
   return `M ${fx} ${fy} C ${fx + fromDir[0] * offset} ${fy + fromDir[1] * offset}, ${tx} ${ty}, ${tx} ${ty}`;
 }
 
-// ─── Equal-Spacing Detection ────────────────────────────────────────────────
-
-interface CanvasItem { id: string; x: number; y: number; w: number; h: number }
-type EqGuide = { axis: 'x' | 'y'; segA: { from: number; to: number; cross: number }; segB: { from: number; to: number; cross: number }; dist: number };
-
-function detectEqualSpacing(
-  items: CanvasItem[], dragId: string,
-  dx: number, dy: number, dw: number, dh: number,
-  threshold: number,
-): { snapX: number | null; snapY: number | null; guides: EqGuide[] } {
-  const others = items.filter(it => it.id !== dragId);
-  const guides: EqGuide[] = [];
-  let snapX: number | null = null;
-  let snapY: number | null = null;
-
-  // ── X-axis: find left & right neighbors in same horizontal band ──
-  const dragT = dy, dragB = dy + dh, dragCY = dy + dh / 2;
-  const hNeighbors = others.filter(o => o.y + o.h > dragT - dh * 0.5 && o.y < dragB + dh * 0.5);
-  const leftItems = hNeighbors.filter(o => o.x + o.w <= dx + threshold).sort((a, b) => (b.x + b.w) - (a.x + a.w));
-  const rightItems = hNeighbors.filter(o => o.x >= dx + dw - threshold).sort((a, b) => a.x - b.x);
-
-  if (leftItems.length > 0 && rightItems.length > 0) {
-    const A = leftItems[0], C = rightItems[0];
-    const totalGap = C.x - (A.x + A.w) - dw;
-    const equalGap = totalGap / 2;
-    const equalX = A.x + A.w + equalGap;
-    if (equalGap > 4 && Math.abs(dx - equalX) < threshold) {
-      snapX = equalX;
-      guides.push({ axis: 'x', segA: { from: A.x + A.w, to: equalX, cross: dragCY }, segB: { from: equalX + dw, to: C.x, cross: dragCY }, dist: equalGap });
-    }
-  }
-
-  // ── Y-axis: find top & bottom neighbors in same vertical band ──
-  const dragL = dx, dragR = dx + dw, dragCX = dx + dw / 2;
-  const vNeighbors = others.filter(o => o.x + o.w > dragL - dw * 0.5 && o.x < dragR + dw * 0.5);
-  const topItems = vNeighbors.filter(o => o.y + o.h <= dy + threshold).sort((a, b) => (b.y + b.h) - (a.y + a.h));
-  const bottomItems = vNeighbors.filter(o => o.y >= dy + dh - threshold).sort((a, b) => a.y - b.y);
-
-  if (topItems.length > 0 && bottomItems.length > 0) {
-    const A = topItems[0], C = bottomItems[0];
-    const totalGap = C.y - (A.y + A.h) - dh;
-    const equalGap = totalGap / 2;
-    const equalY = A.y + A.h + equalGap;
-    if (equalGap > 4 && Math.abs(dy - equalY) < threshold) {
-      snapY = equalY;
-      guides.push({ axis: 'y', segA: { from: A.y + A.h, to: equalY, cross: dragCX }, segB: { from: equalY + dh, to: C.y, cross: dragCX }, dist: equalGap });
-    }
-  }
-
-  return { snapX, snapY, guides };
-}
-
 // ─── Undo/Redo History ───────────────────────────────────────────────────────
 
 interface CanvasSnapshot {
@@ -275,6 +209,79 @@ const PALETTE_ITEMS: PaletteItem[] = [
   { icon: 'target', tKey: 'palette.ads', type: 'output' },
 ];
 
+// ─── Execution Status ────────────────────────────────────────────────────────
+// Each node and connection dot subscribes to its own status, so a store flush
+// re-renders only the nodes whose status changed — never the whole canvas.
+
+type ActiveStatus = Exclude<NodeExecutionStatus, 'idle'>;
+
+// Per-status visual config — single accent color (purple), subtle transitions
+const NODE_STATUS_STYLES: Record<ActiveStatus, { ring: string; bg: string; border: string; shadow: string }> = {
+  pending:   { ring: 'ring-1 ring-purple-400/40', bg: 'transparent', border: 'rgba(168,85,247,0.4)', shadow: '' },
+  running:   { ring: 'ring-2 ring-purple-500/70', bg: 'rgba(168,85,247,0.06)', border: '#a855f7', shadow: 'shadow-md shadow-purple-500/10' },
+  completed: { ring: 'ring-2 ring-emerald-500', bg: 'rgba(16,185,129,0.08)', border: '#10b981', shadow: 'shadow-md shadow-emerald-500/15' },
+  failed:    { ring: 'ring-2 ring-red-500/70', bg: 'rgba(239,68,68,0.06)', border: '#ef4444', shadow: '' },
+};
+
+/** Status ring/tint behind the node content plus the bottom-right status icon */
+const NodeStatusOverlay = memo(function NodeStatusOverlay({ store, nodeId, fallback }: {
+  store?: ExecutionStore;
+  nodeId: string;
+  /** Legacy executingNodes animation, used while the store has no status for this node */
+  fallback: NodeExecutionStatus;
+}) {
+  const live = useNodeExecutionStatus(store, nodeId);
+  const status = live !== 'idle' ? live : fallback;
+  if (status === 'idle') return null;
+  const ss = NODE_STATUS_STYLES[status];
+
+  return (
+    <>
+      <div
+        className={`absolute -inset-px -z-10 rounded-xl border pointer-events-none transition-[box-shadow,border-color,background-color] duration-500 ${ss.ring} ${ss.shadow}`}
+        style={{ background: ss.bg, borderColor: ss.border }}
+      />
+      {status !== 'pending' && (
+        <div className="absolute -bottom-1.5 -right-1.5 w-5 h-5 rounded-full flex items-center justify-center z-20 border border-white dark:border-zinc-900 transition-colors duration-300"
+          style={{ background: status === 'completed' ? '#10b981' : status === 'failed' ? '#ef4444' : '#a855f7' }}
+        >
+          {status === 'running' && <Loader2 size={10} className="text-white animate-spin" />}
+          {status === 'completed' && <Check size={10} className="text-white" />}
+          {status === 'failed' && <X size={10} className="text-white" />}
+        </div>
+      )}
+    </>
+  );
+});
+
+/** Animated dot on a connection, colored by the execution state of both endpoints */
+const ConnectionDot = memo(function ConnectionDot({ store, from, to, pathD, index }: {
+  store?: ExecutionStore;
+  from: string;
+  to: string;
+  pathD: string;
+  index: number;
+}) {
+  const fromStatus = useNodeExecutionStatus(store, from);
+  const toStatus = useNodeExecutionStatus(store, to);
+  let dotColor = '#a855f7';
+  let dotSpeed = 2.5 + index * 0.3;
+  let dotR = 3;
+  if (fromStatus === 'completed' && toStatus === 'completed') {
+    dotColor = '#10b981'; dotSpeed = 2; dotR = 3.5;
+  } else if (fromStatus === 'completed' && (toStatus === 'running' || toStatus === 'pending')) {
+    dotColor = '#3b82f6'; dotSpeed = 1.2; dotR = 4;
+  } else if (fromStatus === 'running') {
+    dotColor = '#3b82f6'; dotSpeed = 1.8; dotR = 3.5;
+  }
+
+  return (
+    <circle r={dotR} fill={dotColor} opacity={0.8}>
+      <animateMotion dur={`${dotSpeed}s`} repeatCount="indefinite" path={pathD} />
+    </circle>
+  );
+});
+
 // ─── Main Component ──────────────────────────────────────────────────────────
 
 interface WorkflowCanvasProps {
@@ -284,11 +291,11 @@ interface WorkflowCanvasProps {
   readOnly?: boolean;
   className?: string;
   style?: React.CSSProperties;
-  /** External node execution states from useWorkflowExecution hook */
-  nodeStates?: Map<string, NodeExecutionStatus>;
+  /** Execution store from useWorkflowExecution; nodes subscribe to it individually */
+  executionStore?: ExecutionStore;
 }
 
-export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readOnly, className, style, nodeStates: externalNodeStates }: WorkflowCanvasProps) {
+function WorkflowCanvas({ onSave, onExecute, initialSystem, readOnly, className, style, executionStore }: WorkflowCanvasProps) {
   const { t } = useLanguage();
   const viewportRef = useRef<HTMLDivElement>(null);
   const { theme } = useTheme();
@@ -336,7 +343,7 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
   // #13 – Snap toggle
   const [snapEnabled, setSnapEnabled] = useState(true);
   const [snapLines, setSnapLines] = useState<{ x: number[]; y: number[] }>({ x: [], y: [] });
-  const [equalSpacingGuides, setEqualSpacingGuides] = useState<{ axis: 'x' | 'y'; segA: { from: number; to: number; cross: number }; segB: { from: number; to: number; cross: number }; dist: number }[]>([]);
+  const [equalSpacingGuides, setEqualSpacingGuides] = useState<EqGuide[]>([]);
 
   // Execution animation (internal fallback)
   const [isExecuting, setIsExecuting] = useState(false);
@@ -346,17 +353,9 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
   const executionTimeoutsRef = useRef<ReturnType<typeof setTimeout>[]>([]);
 
   // Derived execution state: prefer external event-system states when available
-  const externalRunning = useMemo(() => {
-    if (!externalNodeStates || externalNodeStates.size === 0) return false;
-    return Array.from(externalNodeStates.values()).some(s => s === 'pending' || s === 'running');
-  }, [externalNodeStates]);
-  const externalDone = useMemo(() => {
-    if (!externalNodeStates || externalNodeStates.size === 0) return false;
-    const vals = Array.from(externalNodeStates.values());
-    return vals.length > 0 && vals.every(s => s === 'completed' || s === 'failed');
-  }, [externalNodeStates]);
-  const effectiveIsExecuting = externalNodeStates ? externalRunning : isExecuting;
-  const effectiveExecutionDone = externalNodeStates ? externalDone : executionDone;
+  const externalPhase = useExecutionPhase(executionStore);
+  const effectiveIsExecuting = executionStore ? externalPhase === 'running' : isExecuting;
+  const effectiveExecutionDone = executionStore ? externalPhase === 'done' : executionDone;
 
   // #18 – Duplicate connection toast
   const [toastMessage, setToastMessage] = useState<string | null>(null);
@@ -396,44 +395,36 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
   // Drag & drop from palette
   const [isDragOver, setIsDragOver] = useState(false);
 
-  // #15 – Undo/Redo (ref-based to avoid fighting with React state)
-  const undoStackRef = useRef<CanvasSnapshot[]>([]);
-  const redoStackRef = useRef<CanvasSnapshot[]>([]);
-  const [canUndo, setCanUndo] = useState(false);
-  const [canRedo, setCanRedo] = useState(false);
+  // #15 – Undo/Redo (shared ring-buffer engine, snapshots share unchanged arrays/items)
+  const history = useHistory<CanvasSnapshot>({ maxEntries: 100 });
+  const { canUndo, canRedo } = history;
 
   const pushHistory = useCallback(() => {
-    undoStackRef.current = [...undoStackRef.current.slice(-40), { nodes, connections, groups, stickyNotes }];
-    redoStackRef.current = [];
-    setCanUndo(true);
-    setCanRedo(false);
-  }, [nodes, connections, groups, stickyNotes]);
+    history.push({ nodes, connections, groups, stickyNotes });
+  }, [history, nodes, connections, groups, stickyNotes]);
+
+  /** Drag/resize start: remember the pre-gesture state, committed once on mouse-up */
+  const beginHistoryGesture = useCallback(() => {
+    history.begin({ nodes, connections, groups, stickyNotes });
+  }, [history, nodes, connections, groups, stickyNotes]);
 
   const historyUndo = useCallback(() => {
-    if (undoStackRef.current.length === 0) return;
-    const prev = undoStackRef.current[undoStackRef.current.length - 1];
-    undoStackRef.current = undoStackRef.current.slice(0, -1);
-    redoStackRef.current = [{ nodes, connections, groups, stickyNotes }, ...redoStackRef.current];
+    const prev = history.undo({ nodes, connections, groups, stickyNotes });
+    if (!prev) return;
     setNodes(prev.nodes);
     setConnections(prev.connections);
     setGroups(prev.groups);
     setStickyNotes(prev.stickyNotes);
-    setCanUndo(undoStackRef.current.length > 0);
-    setCanRedo(true);
-  }, [nodes, connections, groups, stickyNotes]);
+  }, [history, nodes, connections, groups, stickyNotes]);
 
   const historyRedo = useCallback(() => {
-    if (redoStackRef.current.length === 0) return;
-    const next = redoStackRef.current[0];
-    redoStackRef.current = redoStackRef.current.slice(1);
-    undoStackRef.current = [...undoStackRef.current, { nodes, connections, groups, stickyNotes }];
+    const next = history.redo({ nodes, connections, groups, stickyNotes });
+    if (!next) return;
     setNodes(next.nodes);
     setConnections(next.connections);
     setGroups(next.groups);
     setStickyNotes(next.stickyNotes);
-    setCanUndo(true);
-    setCanRedo(redoStackRef.current.length > 0);
-  }, [nodes, connections, groups, stickyNotes]);
+  }, [history, nodes, connections, groups, stickyNotes]);
 
   // Refs for wheel handler (avoid stale closures)
   const zoomRef = useRef(zoom);
@@ -497,6 +488,70 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     return Math.max(...items);
   }, [nodes, groups, stickyNotes]);
 
+  // ─── Viewport Culling ─────────────────────────────────────────────────────
+  // Only items intersecting the visible area (+ margin) are mounted.
+
+  const visibleRect = useVisibleCanvasRect(viewportRef, zoom, pan);
+
+  const nodeById = useMemo(() => new Map(nodes.map(n => [n.id, n])), [nodes]);
+
+  const visibleNodes = useMemo(
+    () => nodes.filter(n => intersects(visibleRect, n.x, n.y, NODE_W, NODE_H)),
+    [nodes, visibleRect],
+  );
+  const visibleGroups = useMemo(
+    () => groups.filter(g => intersects(visibleRect, g.x, g.y, g.width, g.height)),
+    [groups, visibleRect],
+  );
+  const visibleStickies = useMemo(
+    () => stickyNotes.filter(s => intersects(visibleRect, s.x, s.y, s.width, s.height)),
+    [stickyNotes, visibleRect],
+  );
+
+  // Connections keep their array index – selectedConnId/hoveredConnId refer to it
+  const visibleConnections = useMemo(() => {
+    const out: { conn: NodeConnection; i: number }[] = [];
+    connections.forEach((conn, i) => {
+      const a = nodeById.get(conn.from);
+      const b = nodeById.get(conn.to);
+      if (!a || !b) return;
+      if (connectionIntersects(visibleRect, { x: a.x, y: a.y, w: NODE_W, h: NODE_H }, { x: b.x, y: b.y, w: NODE_W, h: NODE_H })) {
+        out.push({ conn, i });
+      }
+    });
+    return out;
+  }, [connections, nodeById, visibleRect]);
+
+  // Path strings are rebuilt only for connections whose endpoint nodes changed
+  const pathCacheRef = useRef(new Map<string, PathEntry<SystemNode>>());
+  const connectionPaths = useMemo(() => {
+    pathCacheRef.current = reusePaths(
+      pathCacheRef.current,
+      visibleConnections,
+      ({ conn }) => connKey(conn),
+      ({ conn }) => {
+        const a = nodeById.get(conn.from);
+        const b = nodeById.get(conn.to);
+        return a && b ? [a, b] : null;
+      },
+      ({ conn }, a, b) => getConnectionPath(a, b, conn.fromPort || 'right', conn.toPort || 'left'),
+    );
+    return pathCacheRef.current;
+  }, [visibleConnections, nodeById]);
+
+  // ─── Spatial Index ────────────────────────────────────────────────────────
+  // Grid over nodes/stickies/groups for snapping, spacing guides and hit-testing.
+  // Synced incrementally: only items whose object changed are re-bucketed.
+
+  const spatialRef = useRef(createSpatialIndex());
+  const spatial = useMemo(() => {
+    const idx = spatialRef.current;
+    idx.sync('node', nodes, n => ({ x: n.x, y: n.y, w: NODE_W, h: NODE_H }));
+    idx.sync('sticky', stickyNotes, s => ({ x: s.x, y: s.y, w: s.width, h: s.height }));
+    idx.sync('group', groups, g => ({ x: g.x, y: g.y, w: g.width, h: g.height }));
+    return idx;
+  }, [nodes, stickyNotes, groups]);
+
   const fitToScreen = useCallback(() => {
     const rect = viewportRef.current?.getBoundingClientRect();
     if (!rect) return;
@@ -733,7 +788,6 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
 
       // #13/#14 – Snap only when enabled; early-exit if snap disabled
       if (snapEnabled) {
-        const otherNodes = nodes.filter(n => n.id !== dragState.nodeId);
         const gx: number[] = [];
         const gy: number[] = [];
 
@@ -742,12 +796,11 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
         const dragR = rawX + NODE_W;
         const dragB = rawY + NODE_H;
 
-        // #14 – Performance: only check nodes within reasonable distance
-        for (const o of otherNodes) {
-          const distX = Math.abs(rawX - o.x);
-          const distY = Math.abs(rawY - o.y);
-          if (distX > NODE_W * 3 && distY > NODE_H * 5) continue;
+        // #14 – Performance: only items in the horizontal/vertical band around the node can align
+        const candidates = querySnapCandidates(spatial, rawX, rawY, NODE_W, NODE_H, SNAP_THRESHOLD * 2, dragState.nodeId, ['node', 'group']);
 
+        for (const o of candidates) {
+          if (o.kind !== 'node') continue;
           const oCX = o.x + NODE_W / 2;
           const oCY = o.y + NODE_H / 2;
           const oR = o.x + NODE_W;
@@ -766,19 +819,16 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
           else if (Math.abs(dragB - o.y) < SNAP_THRESHOLD) { sy = o.y - NODE_H; gy.push(o.y); }
         }
 
-        for (const g of groups) {
-          const gCX = g.x + g.width / 2;
-          const gCY = g.y + g.height / 2;
+        for (const g of candidates) {
+          if (g.kind !== 'group') continue;
+          const gCX = g.x + g.w / 2;
+          const gCY = g.y + g.h / 2;
           if (Math.abs(dragCX - gCX) < SNAP_THRESHOLD) { sx = gCX - NODE_W / 2; gx.push(gCX); }
           if (Math.abs(dragCY - gCY) < SNAP_THRESHOLD) { sy = gCY - NODE_H / 2; gy.push(gCY); }
         }
 
-        // Equal-spacing detection for nodes
-        const allItemsNode: CanvasItem[] = [
-          ...nodes.map(n => ({ id: n.id, x: n.id === dragState.nodeId ? sx : n.x, y: n.id === dragState.nodeId ? sy : n.y, w: NODE_W, h: NODE_H })),
-          ...stickyNotes.map(s => ({ id: s.id, x: s.x, y: s.y, w: s.width, h: s.height })),
-        ];
-        const { snapX: eqNX, snapY: eqNY, guides: eqNodeGuides } = detectEqualSpacing(allItemsNode, dragState.nodeId, sx, sy, NODE_W, NODE_H, SNAP_THRESHOLD);
+        // Equal-spacing detection for nodes (neighbours from the spatial index)
+        const { snapX: eqNX, snapY: eqNY, guides: eqNodeGuides } = detectEqualSpacing(spatial, dragState.nodeId, sx, sy, NODE_W, NODE_H, SNAP_THRESHOLD, ['node', 'sticky']);
         if (eqNX !== null) sx = eqNX;
         if (eqNY !== null) sy = eqNY;
         setEqualSpacingGuides(eqNodeGuides);
@@ -829,11 +879,13 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
           const dragCX = rawX + sW / 2, dragCY = rawY + sH / 2;
           const dragR = rawX + sW, dragB = rawY + sH;
 
+          const candidates = querySnapCandidates(spatial, rawX, rawY, sW, sH, SNAP_THRESHOLD * 2, dragStickyState.stickyId);
+
           // Snap against other sticky notes
-          for (const o of stickyNotes) {
-            if (o.id === dragStickyState.stickyId) continue;
-            const oCX = o.x + o.width / 2, oCY = o.y + o.height / 2;
-            const oR = o.x + o.width, oB = o.y + o.height;
+          for (const o of candidates) {
+            if (o.kind !== 'sticky') continue;
+            const oCX = o.x + o.w / 2, oCY = o.y + o.h / 2;
+            const oR = o.x + o.w, oB = o.y + o.h;
             if (Math.abs(rawX - o.x) < SNAP_THRESHOLD) { sx = o.x; gx.push(o.x); }
             else if (Math.abs(dragR - oR) < SNAP_THRESHOLD) { sx = oR - sW; gx.push(oR); }
             else if (Math.abs(dragCX - oCX) < SNAP_THRESHOLD) { sx = oCX - sW / 2; gx.push(oCX); }
@@ -846,7 +898,8 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
             else if (Math.abs(dragB - o.y) < SNAP_THRESHOLD) { sy = o.y - sH; gy.push(o.y); }
           }
           // Snap against nodes
-          for (const n of nodes) {
+          for (const n of candidates) {
+            if (n.kind !== 'node') continue;
             if (Math.abs(rawX - n.x) < SNAP_THRESHOLD) { sx = n.x; gx.push(n.x); }
             else if (Math.abs(dragR - (n.x + NODE_W)) < SNAP_THRESHOLD) { sx = n.x + NODE_W - sW; gx.push(n.x + NODE_W); }
             else if (Math.abs(dragCX - (n.x + NODE_W / 2)) < SNAP_THRESHOLD) { sx = n.x + NODE_W / 2 - sW / 2; gx.push(n.x + NODE_W / 2); }
@@ -855,18 +908,15 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
             else if (Math.abs(dragCY - (n.y + NODE_H / 2)) < SNAP_THRESHOLD) { sy = n.y + NODE_H / 2 - sH / 2; gy.push(n.y + NODE_H / 2); }
           }
           // Snap against group centers
-          for (const g of groups) {
-            const gCX = g.x + g.width / 2, gCY = g.y + g.height / 2;
+          for (const g of candidates) {
+            if (g.kind !== 'group') continue;
+            const gCX = g.x + g.w / 2, gCY = g.y + g.h / 2;
             if (Math.abs(dragCX - gCX) < SNAP_THRESHOLD) { sx = gCX - sW / 2; gx.push(gCX); }
             if (Math.abs(dragCY - gCY) < SNAP_THRESHOLD) { sy = gCY - sH / 2; gy.push(gCY); }
           }
 
           // Equal-spacing detection
-          const allItems: CanvasItem[] = [
-            ...nodes.map(n => ({ id: n.id, x: n.x, y: n.y, w: NODE_W, h: NODE_H })),
-            ...stickyNotes.map(s => ({ id: s.id, x: s.x, y: s.y, w: s.width, h: s.height })),
-          ];
-          const { snapX: eqX, snapY: eqY, guides: eqGuides } = detectEqualSpacing(allItems, dragStickyState.stickyId, sx, sy, sW, sH, SNAP_THRESHOLD);
+          const { snapX: eqX, snapY: eqY, guides: eqGuides } = detectEqualSpacing(spatial, dragStickyState.stickyId, sx, sy, sW, sH, SNAP_THRESHOLD, ['node', 'sticky']);
           if (eqX !== null) sx = eqX;
           if (eqY !== null) sy = eqY;
           setEqualSpacingGuides(eqGuides);
@@ -894,12 +944,12 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     if (connectState) {
       setConnectState(prev => prev ? { ...prev, canvasX: canvasPos.x, canvasY: canvasPos.y } : null);
     }
-  }, [isPanning, panStart, panStartMouse, panThresholdMet, dragState, dragGroupState, resizeState, connectState, dragStickyState, resizeStickyState, screenToCanvas, snapEnabled, nodes, groups, stickyNotes]);
+  }, [isPanning, panStart, panStartMouse, panThresholdMet, dragState, dragGroupState, resizeState, connectState, dragStickyState, resizeStickyState, screenToCanvas, snapEnabled, stickyNotes, spatial]);
 
   const handleViewportMouseUp = useCallback(() => {
-    // Push history after drag operations
+    // One history entry per drag/resize gesture (only if something moved)
     if (dragState || dragGroupState || resizeState || dragStickyState || resizeStickyState) {
-      pushHistory();
+      history.commit({ nodes, connections, groups, stickyNotes });
     }
     setIsPanning(false);
     setPanThresholdMet(false);
@@ -910,15 +960,22 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     setResizeStickyState(null);
     setSnapLines({ x: [], y: [] });
     setEqualSpacingGuides([]);
-  }, [dragState, dragGroupState, resizeState, dragStickyState, resizeStickyState, pushHistory]);
+  }, [dragState, dragGroupState, resizeState, dragStickyState, resizeStickyState, history, nodes, connections, groups, stickyNotes]);
 
   // #21 – Context menu handler
   const handleContextMenu = useCallback((e: React.MouseEvent, nodeId?: string, groupId?: string, connIdx?: number) => {
     if (readOnly) return;
     e.preventDefault();
     e.stopPropagation();
+    // Canvas-level right-click: resolve the node/group under the cursor via the spatial index
+    if (!nodeId && !groupId && connIdx === undefined) {
+      const pos = screenToCanvas(e.clientX, e.clientY);
+      const hits = spatial.hitTest(pos.x, pos.y, ['node', 'group']);
+      nodeId = hits.find(h => h.kind === 'node')?.id;
+      if (!nodeId) groupId = hits.find(h => h.kind === 'group')?.id;
+    }
     setContextMenu({ x: e.clientX, y: e.clientY, nodeId, groupId, connIdx });
-  }, [readOnly]);
+  }, [readOnly, screenToCanvas, spatial]);
 
   // ─── Node Interactions ─────────────────────────────────────────────────────
 
@@ -928,6 +985,7 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     if (!node) return;
     e.stopPropagation();
     const canvasPos = screenToCanvas(e.clientX, e.clientY);
+    beginHistoryGesture();
     setDragState({ nodeId, offsetX: canvasPos.x - node.x, offsetY: canvasPos.y - node.y });
 
     // #22 – Shift+click for multi-select
@@ -946,7 +1004,7 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
       setSelectedConnId(null);
       setSelectedGroupId(null);
     }
-  }, [nodes, readOnly, spaceHeld, screenToCanvas, multiSelectedIds]);
+  }, [nodes, readOnly, spaceHeld, screenToCanvas, multiSelectedIds, beginHistoryGesture]);
 
   const handlePortClick = useCallback((e: React.MouseEvent, nodeId: string, port: PortDirection) => {
     if (readOnly) return;
@@ -988,12 +1046,13 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     const group = groups.find(g => g.id === groupId);
     if (!group) return;
     const canvasPos = screenToCanvas(e.clientX, e.clientY);
+    beginHistoryGesture();
     setDragGroupState({ groupId, offsetX: canvasPos.x - group.x, offsetY: canvasPos.y - group.y });
     setSelectedGroupId(groupId);
     setSelectedNodeId(null);
     setSelectedConnId(null);
     setMultiSelectedIds(new Set());
-  }, [groups, readOnly, spaceHeld, screenToCanvas]);
+  }, [groups, readOnly, spaceHeld, screenToCanvas, beginHistoryGesture]);
 
   const handleGroupResizeStart = useCallback((e: React.MouseEvent, groupId: string) => {
     if (readOnly) return;
@@ -1002,8 +1061,9 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     const group = groups.find(g => g.id === groupId);
     if (!group) return;
     const canvasPos = screenToCanvas(e.clientX, e.clientY);
+    beginHistoryGesture();
     setResizeState({ groupId, startX: canvasPos.x, startY: canvasPos.y, startW: group.width, startH: group.height });
-  }, [groups, readOnly, screenToCanvas]);
+  }, [groups, readOnly, screenToCanvas, beginHistoryGesture]);
 
   // ─── Sticky Note Interactions ──────────────────────────────────────────────
 
@@ -1013,13 +1073,14 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     const sticky = stickyNotes.find(s => s.id === stickyId);
     if (!sticky) return;
     const canvasPos = screenToCanvas(e.clientX, e.clientY);
+    beginHistoryGesture();
     setDragStickyState({ stickyId, offsetX: canvasPos.x - sticky.x, offsetY: canvasPos.y - sticky.y });
     setSelectedStickyId(stickyId);
     setSelectedNodeId(null);
     setSelectedGroupId(null);
     setSelectedConnId(null);
     setMultiSelectedIds(new Set());
-  }, [stickyNotes, readOnly, spaceHeld, screenToCanvas]);
+  }, [stickyNotes, readOnly, spaceHeld, screenToCanvas, beginHistoryGesture]);
 
   const handleStickyResizeStart = useCallback((e: React.MouseEvent, stickyId: string) => {
     if (readOnly) return;
@@ -1028,8 +1089,9 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     const sticky = stickyNotes.find(s => s.id === stickyId);
     if (!sticky) return;
     const canvasPos = screenToCanvas(e.clientX, e.clientY);
+    beginHistoryGesture();
     setResizeStickyState({ stickyId, startX: canvasPos.x, startY: canvasPos.y, startW: sticky.width, startH: sticky.height });
-  }, [stickyNotes, readOnly, screenToCanvas]);
+  }, [stickyNotes, readOnly, screenToCanvas, beginHistoryGesture]);
 
   const addStickyNote = useCallback((color: StickyNoteColor) => {
     pushHistory();
@@ -1100,87 +1162,75 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
 
   // ─── Export as PNG ────────────────────────────────────────────────────────
 
+  const [exportProgress, setExportProgress] = useState<number | null>(null);
+  const exportAbortRef = useRef<AbortController | null>(null);
+  useEffect(() => () => exportAbortRef.current?.abort(), []);
+
   const handleExportPNG = useCallback(() => {
     if (nodes.length === 0) return;
 
-    const PAD = 40;
-    const allItems = [
-      ...nodes.map(n => ({ l: n.x, t: n.y, r: n.x + NODE_W, b: n.y + NODE_H })),
-      ...groups.map(g => ({ l: g.x, t: g.y, r: g.x + g.width, b: g.y + g.height })),
-      ...stickyNotes.map(s => ({ l: s.x, t: s.y, r: s.x + s.width, b: s.y + s.height })),
-    ];
-    const minX = Math.min(...allItems.map(i => i.l)) - PAD;
-    const minY = Math.min(...allItems.map(i => i.t)) - PAD;
-    const maxX = Math.max(...allItems.map(i => i.r)) + PAD;
-    const maxY = Math.max(...allItems.map(i => i.b)) + PAD;
-    const w = maxX - minX;
-    const h = maxY - minY;
-
-    // Build SVG string
-    let svg = `<svg xmlns="http://www.w3.org/2000/svg" width="${w * 2}" height="${h * 2}" viewBox="${minX} ${minY} ${w} ${h}" style="background:${isDark ? '#0a0a0e' : '#f9fafb'}">`;
+    // Serialize the board once; rendering happens in the export worker
+    const shapes: SceneShape[] = [];
 
     // Groups
     for (const g of groups) {
       const c = GROUP_COLORS[g.color] || GROUP_COLORS.gray;
-      svg += `<rect x="${g.x}" y="${g.y}" width="${g.width}" height="${g.height}" rx="16" fill="${c.bg}" stroke="${c.border}" stroke-width="2" stroke-dasharray="8,4" />`;
-      svg += `<text x="${g.x + 16}" y="${g.y + 24}" font-family="sans-serif" font-size="11" font-weight="700" fill="${c.text}" text-transform="uppercase">${g.label}</text>`;
+      shapes.push({ kind: 'rect', x: g.x, y: g.y, w: g.width, h: g.height, rx: 16, fill: c.bg, stroke: c.border, strokeWidth: 2, dash: [8, 4] });
+      shapes.push({ kind: 'text', x: g.x + 16, y: g.y + 24, text: g.label, size: 11, weight: 700, fill: c.text });
     }
 
     // Sticky notes
     for (const s of stickyNotes) {
       const c = STICKY_COLORS[s.color];
-      svg += `<rect x="${s.x}" y="${s.y}" width="${s.width}" height="${s.height}" rx="8" fill="${c.bg}" stroke="${c.border}" stroke-width="1.5" />`;
-      svg += `<text x="${s.x + 12}" y="${s.y + 20}" font-family="sans-serif" font-size="12" fill="${c.text}">${s.text.length > 40 ? s.text.substring(0, 38) + '…' : s.text}</text>`;
+      shapes.push({ kind: 'rect', x: s.x, y: s.y, w: s.width, h: s.height, rx: 8, fill: c.bg, stroke: c.border, strokeWidth: 1.5 });
+      shapes.push({ kind: 'text', x: s.x + 12, y: s.y + 20, text: s.text.length > 40 ? s.text.substring(0, 38) + '…' : s.text, size: 12, fill: c.text });
     }
 
     // Connections
     for (const conn of connections) {
-      const fromNode = nodes.find(n => n.id === conn.from);
-      const toNode = nodes.find(n => n.id === conn.to);
+      const fromNode = nodeById.get(conn.from);
+      const toNode = nodeById.get(conn.to);
       if (!fromNode || !toNode) continue;
-      const pathD = getConnectionPath(fromNode, toNode, conn.fromPort || 'right', conn.toPort || 'left');
-      svg += `<path d="${pathD}" stroke="#a855f7" stroke-width="2" fill="none" opacity="0.6" />`;
+      const d = getConnectionPath(fromNode, toNode, conn.fromPort || 'right', conn.toPort || 'left');
+      shapes.push({ kind: 'path', d, stroke: '#a855f7', strokeWidth: 2, opacity: 0.6 });
     }
 
     // Nodes
     for (const node of nodes) {
       const st = NODE_STYLES[node.type];
-      svg += `<rect x="${node.x}" y="${node.y}" width="${NODE_W}" height="${NODE_H}" rx="12" fill="${st.bg}" stroke="${st.border}" stroke-width="1" />`;
-      svg += `<circle cx="${node.x + 24}" cy="${node.y + NODE_H / 2}" r="16" fill="${st.accent}18" />`;
-      svg += `<text x="${node.x + 50}" y="${node.y + NODE_H / 2 - 4}" font-family="sans-serif" font-size="13" font-weight="600" fill="${isDark ? '#fff' : '#111'}">${node.label.length > 22 ? node.label.substring(0, 20) + '…' : node.label}</text>`;
+      shapes.push({ kind: 'rect', x: node.x, y: node.y, w: NODE_W, h: NODE_H, rx: 12, fill: st.bg, stroke: st.border, strokeWidth: 1 });
+      shapes.push({ kind: 'circle', cx: node.x + 24, cy: node.y + NODE_H / 2, r: 16, fill: `${st.accent}18` });
+      shapes.push({ kind: 'text', x: node.x + 50, y: node.y + NODE_H / 2 - 4, text: node.label.length > 22 ? node.label.substring(0, 20) + '…' : node.label, size: 13, weight: 600, fill: isDark ? '#fff' : '#111' });
       if (node.description) {
-        svg += `<text x="${node.x + 50}" y="${node.y + NODE_H / 2 + 14}" font-family="sans-serif" font-size="10" fill="${isDark ? '#71717a' : '#6b7280'}">${node.description.length > 30 ? node.description.substring(0, 28) + '…' : node.description}</text>`;
+        shapes.push({ kind: 'text', x: node.x + 50, y: node.y + NODE_H / 2 + 14, text: node.description.length > 30 ? node.description.substring(0, 28) + '…' : node.description, size: 10, fill: isDark ? '#71717a' : '#6b7280' });
       }
       // Type badge
-      svg += `<rect x="${node.x + NODE_W - 50}" y="${node.y - 8}" width="48" height="16" rx="5" fill="${st.bg}" stroke="${st.border}" stroke-width="1" />`;
-      svg += `<text x="${node.x + NODE_W - 26}" y="${node.y + 4}" font-family="sans-serif" font-size="8" font-weight="700" fill="${st.accent}" text-anchor="middle">${st.label}</text>`;
+      shapes.push({ kind: 'rect', x: node.x + NODE_W - 50, y: node.y - 8, w: 48, h: 16, rx: 5, fill: st.bg, stroke: st.border, strokeWidth: 1 });
+      shapes.push({ kind: 'text', x: node.x + NODE_W - 26, y: node.y + 4, text: st.label, size: 8, weight: 700, fill: st.accent, anchor: 'middle' });
     }
 
-    svg += '</svg>';
-
-    // Convert SVG to PNG via Canvas
-    const blob = new Blob([svg], { type: 'image/svg+xml;charset=utf-8' });
-    const url = URL.createObjectURL(blob);
-    const img = new window.Image();
-    img.onload = () => {
-      const canvas = document.createElement('canvas');
-      canvas.width = w * 2;
-      canvas.height = h * 2;
-      const ctx = canvas.getContext('2d');
-      if (!ctx) return;
-      ctx.drawImage(img, 0, 0);
-      URL.revokeObjectURL(url);
-
-      const pngUrl = canvas.toDataURL('image/png');
-      const a = document.createElement('a');
-      a.href = pngUrl;
-      a.download = `workflow-${(initialSystem?.name || 'export').replace(/\s+/g, '-').toLowerCase()}.png`;
-      document.body.appendChild(a);
-      a.click();
-      document.body.removeChild(a);
-    };
-    img.src = url;
-  }, [nodes, connections, groups, stickyNotes, isDark, initialSystem]);
+    const bounds = sceneBounds([
+      ...nodes.map(n => ({ x: n.x, y: n.y, w: NODE_W, h: NODE_H })),
+      ...groups.map(g => ({ x: g.x, y: g.y, w: g.width, h: g.height })),
+      ...stickyNotes.map(s => ({ x: s.x, y: s.y, w: s.width, h: s.height })),
+    ], 40);
+    const scene: ExportScene = { ...bounds, background: isDark ? '#0a0a0e' : '#f9fafb', shapes };
+
+    exportAbortRef.current?.abort();
+    const controller = new AbortController();
+    exportAbortRef.current = controller;
+    setExportProgress(0);
+    exportScene(scene, { format: 'png', scale: 2, signal: controller.signal, onProgress: setExportProgress })
+      .then(blob => downloadBlob(blob, `workflow-${(initialSystem?.name || 'export').replace(/\s+/g, '-').toLowerCase()}.png`))
+      .catch(err => { if (!(err instanceof DOMException && err.name === 'AbortError')) console.warn('PNG export failed:', err); })
+      .finally(() => {
+        if (exportAbortRef.current !== controller) return;
+        exportAbortRef.current = null;
+        setExportProgress(null);
+      });
+  }, [nodes, nodeById, connections, groups, stickyNotes, isDark, initialSystem]);
+
+  const cancelExport = useCallback(() => exportAbortRef.current?.abort(), []);
 
   // ─── Drag & Drop from Palette ─────────────────────────────────────────────
 
@@ -1347,35 +1397,18 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     executionTimeoutsRef.current.forEach(clearTimeout);
     executionTimeoutsRef.current = [];
 
-    const hasIncoming = new Set(connections.map(c => c.to));
-    const startNodes = nodes.filter(n => n.type === 'trigger' || !hasIncoming.has(n.id));
-    if (startNodes.length === 0 && nodes.length > 0) startNodes.push(nodes[0]);
-
-    const visited = new Set<string>();
-    const queue: { id: string; depth: number }[] = startNodes.map(n => ({ id: n.id, depth: 0 }));
-    const schedule: { id: string; delay: number }[] = [];
-
-    while (queue.length > 0) {
-      const item = queue.shift()!;
-      if (visited.has(item.id)) continue;
-      visited.add(item.id);
-      schedule.push({ id: item.id, delay: item.depth * 600 });
-      for (const conn of connections.filter(c => c.from === item.id)) {
-        if (!visited.has(conn.to)) queue.push({ id: conn.to, depth: item.depth + 1 });
-      }
-    }
-    for (const node of nodes) {
-      if (!visited.has(node.id)) schedule.push({ id: node.id, delay: schedule.length * 600 });
-    }
+    // Each node lights up once all of its predecessors have finished
+    const dag = buildDag(nodes.map(n => n.id), connections, { isRoot: id => nodeById.get(id)?.type === 'trigger' });
+    const schedule = planSchedule(dag, { duration: () => 600 });
 
-    schedule.forEach(({ id, delay }) => {
+    schedule.nodes.forEach(({ nodeId, start }) => {
       const t = setTimeout(() => {
-        setExecutingNodes(prev => new Set([...prev, id]));
-      }, delay);
+        setExecutingNodes(prev => new Set([...prev, nodeId]));
+      }, start);
       executionTimeoutsRef.current.push(t);
     });
 
-    const totalDuration = schedule.length > 0 ? Math.max(...schedule.map(s => s.delay)) + 800 : 800;
+    const totalDuration = Math.max(0, schedule.makespan - 600) + 800;
     const t1 = setTimeout(() => {
       setExecutionDone(true);
       const t2 = setTimeout(() => {
@@ -1386,7 +1419,7 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
       executionTimeoutsRef.current.push(t2);
     }, totalDuration);
     executionTimeoutsRef.current.push(t1);
-  }, [isExecuting, nodes, connections, onExecute]);
+  }, [isExecuting, nodes, nodeById, connections, onExecute]);
 
   // ─── Render Icon ───────────────────────────────────────────────────────────
 
@@ -1586,9 +1619,15 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
           )}
 
           {/* Export PNG */}
-          <button onClick={handleExportPNG} disabled={nodes.length === 0} className="p-1.5 rounded-lg text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors disabled:opacity-30" title={t('toolbar.exportPNG')} aria-label={t('toolbar.exportPNG')}>
-            <Download size={15} />
-          </button>
+          {exportProgress !== null ? (
+            <button onClick={cancelExport} className="px-1.5 py-1 rounded-lg text-[10px] font-semibold tabular-nums text-purple-600 dark:text-purple-400 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors" title={t('toolbar.cancelExport')} aria-label={t('toolbar.cancelExport')}>
+              {Math.round(exportProgress * 100)}%
+            </button>
+          ) : (
+            <button onClick={handleExportPNG} disabled={nodes.length === 0} className="p-1.5 rounded-lg text-gray-500 hover:bg-gray-100 dark:hover:bg-zinc-800 transition-colors disabled:opacity-30" title={t('toolbar.exportPNG')} aria-label={t('toolbar.exportPNG')}>
+              <Download size={15} />
+            </button>
+          )}
 
           {/* #23 – Search */}
           {!readOnly && (
@@ -1776,28 +1815,12 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
               {/* No <defs> needed — solid colors replace gradients to fix
                    rendering failure on horizontal/vertical paths (zero-height bounding box) */}
 
-              {connections.map((conn, i) => {
-                const fromNode = nodes.find(n => n.id === conn.from);
-                const toNode = nodes.find(n => n.id === conn.to);
-                if (!fromNode || !toNode) return null;
-                const pathD = getConnectionPath(fromNode, toNode, conn.fromPort || 'right', conn.toPort || 'left');
+              {visibleConnections.map(({ conn, i }) => {
+                const pathD = connectionPaths.get(connKey(conn))?.d;
+                if (!pathD) return null;
                 const isSelected = selectedConnId === i;
                 const isHovered = hoveredConnId === i;
 
-                // Connection dot color based on node execution states
-                const fromStatus = externalNodeStates?.get(conn.from) || 'idle';
-                const toStatus = externalNodeStates?.get(conn.to) || 'idle';
-                let dotColor = '#a855f7';
-                let dotSpeed = 2.5 + i * 0.3;
-                let dotR = 3;
-                if (fromStatus === 'completed' && toStatus === 'completed') {
-                  dotColor = '#10b981'; dotSpeed = 2; dotR = 3.5;
-                } else if (fromStatus === 'completed' && (toStatus === 'running' || toStatus === 'pending')) {
-                  dotColor = '#3b82f6'; dotSpeed = 1.2; dotR = 4;
-                } else if (fromStatus === 'running') {
-                  dotColor = '#3b82f6'; dotSpeed = 1.8; dotR = 3.5;
-                }
-
                 return (
                   <g
                     key={i}
@@ -1814,16 +1837,14 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
                       strokeWidth={isSelected ? 3 : isHovered ? 2.5 : 2}
                       fill="none"
                     />
-                    <circle r={dotR} fill={dotColor} opacity={0.8}>
-                      <animateMotion dur={`${dotSpeed}s`} repeatCount="indefinite" path={pathD} />
-                    </circle>
+                    <ConnectionDot store={executionStore} from={conn.from} to={conn.to} pathD={pathD} index={i} />
                   </g>
                 );
               })}
 
               {/* Temp connection line */}
               {connectState && (() => {
-                const fromNode = nodes.find(n => n.id === connectState.fromId);
+                const fromNode = nodeById.get(connectState.fromId);
                 if (!fromNode) return null;
                 const p = getPortPosition(fromNode, connectState.fromPort);
                 const dir = PORT_DIR[connectState.fromPort];
@@ -1875,7 +1896,7 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
             </svg>
 
             {/* ─── Groups ─── */}
-            {groups.map(group => {
+            {visibleGroups.map(group => {
               const colors = GROUP_COLORS[group.color] || GROUP_COLORS.gray;
               const isSelected = selectedGroupId === group.id;
               return (
@@ -1916,7 +1937,7 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
             })}
 
             {/* ─── Sticky Notes ─── */}
-            {stickyNotes.map(sticky => {
+            {visibleStickies.map(sticky => {
               const colors = STICKY_COLORS[sticky.color];
               const isSelected = selectedStickyId === sticky.id;
               return (
@@ -1966,37 +1987,23 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
             })}
 
             {/* ─── Nodes ─── */}
-            {nodes.map(node => {
+            {visibleNodes.map(node => {
               const style = NODE_STYLES[node.type];
               const isSelected = selectedNodeId === node.id;
               const isMultiSelected = multiSelectedIds.has(node.id);
               const isConnecting = connectState?.fromId === node.id;
 
-              // Derive execution status: external event-system states take priority, fallback to legacy executingNodes
-              const nodeStatus: NodeExecutionStatus = externalNodeStates?.get(node.id)
-                || (executingNodes.has(node.id) ? 'completed' : 'idle');
-              const isNodeActive = nodeStatus !== 'idle';
-
-              // Per-status visual config — single accent color (purple), subtle transitions
-              const statusStyles: Record<NodeExecutionStatus, { ring: string; bg: string; border: string; shadow: string }> = {
-                idle:      { ring: '', bg: style.bg, border: (isSelected || isMultiSelected) && !readOnly ? style.accent : style.border, shadow: '' },
-                pending:   { ring: 'ring-1 ring-purple-400/40', bg: style.bg, border: 'rgba(168,85,247,0.4)', shadow: '' },
-                running:   { ring: 'ring-2 ring-purple-500/70', bg: 'rgba(168,85,247,0.06)', border: '#a855f7', shadow: 'shadow-md shadow-purple-500/10' },
-                completed: { ring: 'ring-2 ring-emerald-500', bg: 'rgba(16,185,129,0.08)', border: '#10b981', shadow: 'shadow-md shadow-emerald-500/15' },
-                failed:    { ring: 'ring-2 ring-red-500/70', bg: 'rgba(239,68,68,0.06)', border: '#ef4444', shadow: '' },
-              };
-              const ss = statusStyles[nodeStatus];
 
               return (
                 <div
                   key={node.id}
-                  className={`absolute rounded-xl border backdrop-blur-sm select-none ${dragState?.nodeId === node.id ? '' : 'transition-[box-shadow,border-color,background-color] duration-500'} ${(isSelected || isMultiSelected) && !readOnly && !isNodeActive ? 'ring-2 ring-purple-500 shadow-lg shadow-purple-500/10' : ''} ${isConnecting ? 'ring-2 ring-purple-400 ring-dashed' : ''} ${isNodeActive ? `${ss.ring} ${ss.shadow}` : ''}`}
+                  className={`absolute rounded-xl border backdrop-blur-sm select-none ${dragState?.nodeId === node.id ? '' : 'transition-[box-shadow,border-color,background-color] duration-500'} ${(isSelected || isMultiSelected) && !readOnly ? 'ring-2 ring-purple-500 shadow-lg shadow-purple-500/10' : ''} ${isConnecting ? 'ring-2 ring-purple-400 ring-dashed' : ''}`}
                   style={{
                     left: node.x, top: node.y, width: NODE_W, height: NODE_H,
-                    background: ss.bg,
-                    borderColor: ss.border,
+                    background: style.bg,
+                    borderColor: (isSelected || isMultiSelected) && !readOnly ? style.accent : style.border,
                     cursor: readOnly ? 'default' : (dragState?.nodeId === node.id ? 'grabbing' : 'grab'),
-                    zIndex: isNodeActive ? 15 : (isSelected ? 20 : 10),
+                    zIndex: isSelected ? 20 : 10,
                   }}
                   onMouseDown={e => handleNodeMouseDown(e, node.id)}
                   onMouseEnter={() => { if (!readOnly) setHoveredNodeId(node.id); }}
@@ -2021,16 +2028,8 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
                     {style.label}
                   </div>
 
-                  {/* Status overlay icon (bottom-right) — minimal, single accent */}
-                  {(nodeStatus === 'running' || nodeStatus === 'completed' || nodeStatus === 'failed') && (
-                    <div className="absolute -bottom-1.5 -right-1.5 w-5 h-5 rounded-full flex items-center justify-center z-20 border border-white dark:border-zinc-900 transition-colors duration-300"
-                      style={{ background: nodeStatus === 'completed' ? '#10b981' : nodeStatus === 'failed' ? '#ef4444' : '#a855f7' }}
-                    >
-                      {nodeStatus === 'running' && <Loader2 size={10} className="text-white animate-spin" />}
-                      {nodeStatus === 'completed' && <Check size={10} className="text-white" />}
-                      {nodeStatus === 'failed' && <X size={10} className="text-white" />}
-                    </div>
-                  )}
+                  {/* Execution status: external event-system states take priority, fallback to legacy executingNodes */}
+                  <NodeStatusOverlay store={executionStore} nodeId={node.id} fallback={executingNodes.has(node.id) ? 'completed' : 'idle'} />
 
                   {/* 4-Directional Hover Ports */}
                   {!readOnly && (hoveredNodeId === node.id || connectState) && (
@@ -2309,3 +2308,5 @@ export default function WorkflowCanvas({ onSave, onExecute, initialSystem, readO
     </div>
   );
 }
+
+export default memo(WorkflowCanvas);
@@ -0,0 +1,133 @@
+import { createAnalyticsEngine, createFactTable } from '@/lib/analytics';
+import type { AnalyticsEngine, FactTable } from '@/lib/analytics';
+
+// ─── Demo-Feeds ───────────────────────────────────────────────────────────────
+
+/**
+ * Eine Quelle im Feed (z.B. Kampagne oder Post) mit ihrer mittleren
+ * Tagesrate pro Metrik. Die Zeilen landen im angegebenen Segment.
+ */
+export interface FeedSource<M extends string> {
+  seed: string;
+  segment: number;
+  daily: Readonly<Record<M, number>>;
+  /** Quellnummer der Zeilen (siehe `sourceTotals`); Standard: Position in der Liste */
+  source?: number;
+}
+
+export interface DemoFeedOptions {
+  /** Anzahl Tage bis einschließlich `lastDay` */
+  days: number;
+  /** Letzter Tag (siehe `toDay`) */
+  lastDay: number;
+  /** Wachstum über den gesamten Zeitraum (0.3 = letzter Tag 30 % über dem ersten) */
+  growth?: number;
+}
+
+/** Wochentags-Faktoren, Mo–So (Wochenende schwächer) */
+const WEEKDAY = [1.08, 1.12, 1.1, 1.06, 0.98, 0.82, 0.84];
+
+/** Deterministischer PRNG (mulberry32) – gleiche Seeds, gleiche Zahlen */
+function createRandom(seed: string) {
+  let h = 1779033703 ^ seed.length;
+  for (let i = 0; i < seed.length; i++) {
+    h = Math.imul(h ^ seed.charCodeAt(i), 3432918353);
+    h = (h << 13) | (h >>> 19);
+  }
+  return () => {
+    h = (h + 0x6d2b79f5) | 0;
+    let t = Math.imul(h ^ (h >>> 15), 1 | h);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Erzeugt Tageszeilen (Quelle × Tag) als FactTable, bis echte Ads-/LinkedIn-
+ * Feeds angebunden sind. Auf die Tagesrate kommen Wochentags-Saisonalität,
+ * ein linearer Trend und ±20 % Rauschen; der Mittelwert bleibt die Tagesrate.
+ */
+export function createDemoFeed<M extends string>(
+  metrics: readonly M[],
+  sources: readonly FeedSource<M>[],
+  { days, lastDay, growth = 0.3 }: DemoFeedOptions,
+): FactTable<M> {
+  const table = createFactTable(metrics, sources.length * days);
+  const firstDay = lastDay - days + 1;
+  const values = {} as Record<M, number>;
+  sources.forEach((source, index) => {
+    const random = createRandom(source.seed);
+    const rates = metrics.map(m => source.daily[m]);
+    for (let d = 0; d < days; d++) {
+      const day = firstDay + d;
+      // Epoch-Tag 0 war ein Donnerstag
+      const weekday = WEEKDAY[(day + 3) % 7];
+      const trend = 1 + growth * (days > 1 ? d / (days - 1) - 0.5 : 0);
+      const noise = 0.8 + random() * 0.4;
+      for (let k = 0; k < metrics.length; k++) values[metrics[k]] = rates[k] * weekday * trend * noise;
+      table.append(day, source.segment, values, source.source ?? index);
+    }
+  });
+  return table;
+}
+
+// ─── Demo-Engine ──────────────────────────────────────────────────────────────
+
+/** Quellen pro Teil-Feed – begrenzt den Zwischenspeicher beim ersten Abgleich */
+const SYNC_CHUNK = 1024;
+
+export interface DemoAnalytics<M extends string> {
+  /** Quellnummer eines Seeds für `engine.sourceTotals` */
+  sourceOf(seed: string): number | undefined;
+  /**
+   * Gleicht die Engine mit der aktuellen Quellenliste ab. Nur neue, geänderte
+   * und entfernte Quellen erzeugen bzw. ersetzen Zeilen; ohne Änderung kommt
+   * dieselbe Engine-Instanz zurück (stabile Memo-Abhängigkeit).
+   */
+  sync(sources: readonly FeedSource<M>[]): AnalyticsEngine<M>;
+}
+
+export interface DemoAnalyticsOptions extends DemoFeedOptions {
+  /** Anzahl Segmente – wenige, z.B. Plattformen; einzelne Quellen über `sourceOf` */
+  segments: number;
+}
+
+export function createDemoAnalytics<M extends string>(metrics: readonly M[], options: DemoAnalyticsOptions): DemoAnalytics<M> {
+  const { segments, ...feed } = options;
+  let engine = createAnalyticsEngine(createFactTable(metrics, 0), {
+    segments,
+    range: { firstDay: feed.lastDay - feed.days + 1, endDay: feed.lastDay + 1 },
+  });
+  const known = new Map<string, { source: number; segment: number; daily: Readonly<Record<M, number>> }>();
+  let nextSource = 0;
+
+  const sameDaily = (a: Readonly<Record<M, number>>, b: Readonly<Record<M, number>>) => metrics.every(m => a[m] === b[m]);
+
+  return {
+    sourceOf: seed => known.get(seed)?.source,
+
+    sync(sources) {
+      const changed: FeedSource<M>[] = [];
+      const seen = new Set<string>();
+      for (const s of sources) {
+        seen.add(s.seed);
+        const prev = known.get(s.seed);
+        if (prev && prev.segment === s.segment && sameDaily(prev.daily, s.daily)) continue;
+        const source = prev?.source ?? nextSource++;
+        known.set(s.seed, { source, segment: s.segment, daily: s.daily });
+        changed.push({ ...s, source });
+      }
+      const removed: number[] = [];
+      for (const [seed, entry] of known) {
+        if (!seen.has(seed)) { removed.push(entry.source); known.delete(seed); }
+      }
+      if (changed.length === 0 && removed.length === 0) return engine;
+
+      engine = engine.update(createDemoFeed(metrics, changed.slice(0, SYNC_CHUNK), feed), removed);
+      for (let i = SYNC_CHUNK; i < changed.length; i += SYNC_CHUNK) {
+        engine = engine.update(createDemoFeed(metrics, changed.slice(i, i + SYNC_CHUNK), feed));
+      }
+      return engine;
+    },
+  };
+}
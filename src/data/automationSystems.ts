@@ -1,4 +1,5 @@
-import type { AutomationSystem } from '@/types/automation';
+import type { AutomationSystem, AutomationSystemMeta } from '@/types/automation';
+import { createRecordStore } from '@/services/recordStore';
 
 /**
  * Position helper: convert column/row indices to pixel coordinates.
@@ -157,28 +158,38 @@ export const DEMO_SYSTEMS: AutomationSystem[] = [
 
 // ─── Storage Keys ──────────────────────────────────────────────────────────────
 
+/** Früherer localStorage-Key – wird beim ersten Öffnen nach IndexedDB migriert */
 export const STORAGE_KEY = 'flowstack-automation-systems';
 const HIDDEN_DEMOS_KEY = 'flowstack-hidden-demos';
 
 // ─── User Systems CRUD ─────────────────────────────────────────────────────────
 
-export function loadUserSystems(): AutomationSystem[] {
-  try {
-    const stored = localStorage.getItem(STORAGE_KEY);
-    return stored ? JSON.parse(stored) : [];
-  } catch {
-    return [];
-  }
+/** Ein Record pro System in IndexedDB */
+export const userSystemStore = createRecordStore<AutomationSystem, AutomationSystemMeta>({
+  name: 'automation-systems',
+  legacyKey: STORAGE_KEY,
+  toMeta: ({ id, name, description, category, icon, status, lastExecuted, executionCount }) => (
+    { id, name, description, category, icon, status, lastExecuted, executionCount }
+  ),
+});
+
+/** Alle Systeme vollständig – für Listen reicht `userSystemStore.listMeta()` */
+export function loadUserSystems(): Promise<AutomationSystem[]> {
+  return userSystemStore.getAll();
 }
 
-export function saveUserSystems(systems: AutomationSystem[]): boolean {
-  try {
-    localStorage.setItem(STORAGE_KEY, JSON.stringify(systems));
-    return true;
-  } catch (e) {
-    console.warn('localStorage Fehler beim Speichern:', e);
-    return false;
-  }
+/** Body eines Systems, erst beim Öffnen geladen */
+export function loadUserSystem(id: string): Promise<AutomationSystem | undefined> {
+  return userSystemStore.get(id);
+}
+
+/** Speichert ein neues oder geändertes System – nur dieser Record wird (debounced) geschrieben */
+export function saveUserSystem(system: AutomationSystem): void {
+  userSystemStore.put(system);
+}
+
+export function deleteUserSystem(id: string): void {
+  userSystemStore.delete(id);
 }
 
 // ─── Hidden Demo Systems ───────────────────────────────────────────────────────
@@ -219,10 +230,10 @@ export function getVisibleDemoSystems(): AutomationSystem[] {
   return DEMO_SYSTEMS.filter(d => !hidden.includes(d.id));
 }
 
-export function getAllSystems(): AutomationSystem[] {
-  return [...getVisibleDemoSystems(), ...loadUserSystems()];
+export async function getAllSystems(): Promise<AutomationSystem[]> {
+  return [...getVisibleDemoSystems(), ...await loadUserSystems()];
 }
 
-export function findSystem(id: string): AutomationSystem | undefined {
-  return getAllSystems().find(s => s.id === id);
+export async function findSystem(id: string): Promise<AutomationSystem | undefined> {
+  return DEMO_SYSTEMS.find(s => s.id === id && !getHiddenDemoIds().includes(id)) ?? userSystemStore.get(id);
 }
@@ -1,9 +1,40 @@
-import type { FunnelBoard } from '@/types/funnel';
+import type { FunnelBoard, FunnelBoardMeta } from '@/types/funnel';
+import { createRecordStore, shallowEqualMeta } from '@/services/recordStore';
 
-// ─── Storage Key ──────────────────────────────────────────────────────────────
+// ─── Storage ──────────────────────────────────────────────────────────────────
 
+/** Früherer localStorage-Key – wird beim ersten Öffnen nach IndexedDB migriert */
 const STORAGE_KEY = 'flowstack-funnel-boards';
 
+export function toFunnelBoardMeta(board: FunnelBoard): FunnelBoardMeta {
+  return {
+    id: board.id,
+    name: board.name,
+    description: board.description,
+    linkedSystemId: board.linkedSystemId,
+    elementCount: board.elements.length,
+    createdAt: board.createdAt,
+    updatedAt: board.updatedAt,
+  };
+}
+
+/** Ein Record pro Board; Listen lesen nur den Metadaten-Index */
+/**
+ * Jeder Autosave setzt `updatedAt` neu; die Board-Liste zeigt aber nur das
+ * Datum. Daher zählt `updatedAt` nur tageweise, sonst würde jeder Autosave
+ * alle Listener (und damit den ganzen Canvas) neu rendern.
+ */
+function isSameFunnelBoardMeta(previous: FunnelBoardMeta, next: FunnelBoardMeta): boolean {
+  return shallowEqualMeta({ ...previous, updatedAt: previous.updatedAt.slice(0, 10) }, { ...next, updatedAt: next.updatedAt.slice(0, 10) });
+}
+
+export const funnelBoardStore = createRecordStore<FunnelBoard, FunnelBoardMeta>({
+  name: 'funnel-boards',
+  legacyKey: STORAGE_KEY,
+  toMeta: toFunnelBoardMeta,
+  isSameMeta: isSameFunnelBoardMeta,
+});
+
 // ─── Demo Board ───────────────────────────────────────────────────────────────
 
 export const DEMO_FUNNEL_BOARD: FunnelBoard = {
@@ -38,51 +69,45 @@ export const DEMO_FUNNEL_BOARD: FunnelBoard = {
 
 // ─── CRUD Functions ───────────────────────────────────────────────────────────
 
-export function loadFunnelBoards(): FunnelBoard[] {
-  try {
-    const stored = localStorage.getItem(STORAGE_KEY);
-    return stored ? JSON.parse(stored) : [];
-  } catch {
-    return [];
-  }
+/** Lädt ein Board vollständig (lazy aus IndexedDB, danach gecacht) */
+export async function loadFunnelBoard(id: string): Promise<FunnelBoard | undefined> {
+  const board = await funnelBoardStore.get(id);
+  return board ?? (id === DEMO_FUNNEL_BOARD.id ? DEMO_FUNNEL_BOARD : undefined);
+}
+
+/** Merkt das Board zum Speichern vor (debounced, nur dieses Board wird geschrieben) */
+export function saveFunnelBoard(board: FunnelBoard): void {
+  funnelBoardStore.put(board);
 }
 
-export function saveFunnelBoards(boards: FunnelBoard[]): boolean {
-  try {
-    localStorage.setItem(STORAGE_KEY, JSON.stringify(boards));
-    return true;
-  } catch (e) {
-    console.warn('localStorage Fehler beim Speichern:', e);
-    return false;
-  }
+/** Schreibt ausstehende Änderungen sofort */
+export function flushFunnelBoards(): Promise<void> {
+  return funnelBoardStore.flush();
 }
 
-export function deleteFunnelBoard(id: string): FunnelBoard[] {
-  const boards = loadFunnelBoards().filter(b => b.id !== id);
-  saveFunnelBoards(boards);
-  return boards;
+export function deleteFunnelBoard(id: string): void {
+  funnelBoardStore.delete(id);
 }
 
-export function duplicateFunnelBoard(id: string): FunnelBoard | null {
-  const boards = loadFunnelBoards();
-  const board = boards.find(b => b.id === id);
+export async function duplicateFunnelBoard(id: string): Promise<FunnelBoard | null> {
+  const board = await loadFunnelBoard(id);
   if (!board) return null;
 
   const now = new Date().toISOString();
   const copy: FunnelBoard = {
-    ...JSON.parse(JSON.stringify(board)),
+    ...structuredClone(board),
     id: `funnel-${Date.now()}-${Math.random().toString(36).slice(2, 6)}`,
     name: `${board.name} (Kopie)`,
     createdAt: now,
     updatedAt: now,
   };
 
-  saveFunnelBoards([...boards, copy]);
+  funnelBoardStore.put(copy);
   return copy;
 }
 
-export function getAllFunnelBoards(): FunnelBoard[] {
-  const userBoards = loadFunnelBoards();
+/** Metadaten aller Boards inkl. Demo-Board (sofern nicht überschrieben) */
+export function withDemoFunnelBoard(userBoards: readonly FunnelBoardMeta[]): FunnelBoardMeta[] {
   const hasDemoBoard = userBoards.some(b => b.id === DEMO_FUNNEL_BOARD.id);
-  return hasDemoBoard ? userBoards : [DEMO_FUNNEL_BOARD, ...userBoards];
+  return hasDemoBoard ? [...userBoards] : [toFunnelBoardMeta(DEMO_FUNNEL_BOARD), ...userBoards];
 }
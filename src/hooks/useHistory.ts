@@ -0,0 +1,58 @@
+/**
+ * useHistory
+ *
+ * Custom Hook für die gemeinsame Undo/Redo-Engine (`@/lib/history`).
+ * Die Einträge leben in einem Ref (kein Kopieren pro Änderung);
+ * nur canUndo/canRedo sind React-State für Toolbar-Buttons.
+ */
+
+import { useState, useRef, useMemo, useCallback } from 'react';
+import { createHistory } from '@/lib/history';
+import type { History, HistoryOptions } from '@/lib/history';
+
+export interface UseHistoryReturn<S extends object> {
+  /** Gibt es einen Undo-Schritt? */
+  canUndo: boolean;
+  /** Gibt es einen Redo-Schritt? */
+  canRedo: boolean;
+  /** Speichert den Zustand *vor* einer Änderung (gleicher coalesceKey kurz hintereinander → ein Eintrag) */
+  push: (snapshot: S, coalesceKey?: string) => void;
+  /** Beginn einer fortlaufenden Geste (Drag/Resize) */
+  begin: (snapshot: S) => void;
+  /** Ende der Geste – legt genau einen Eintrag an, falls sich etwas geändert hat */
+  commit: (current: S) => void;
+  undo: (current: S) => S | null;
+  redo: (current: S) => S | null;
+  jumpTo: (index: number, current: S) => S | null;
+  clear: () => void;
+  /** Undo-Einträge, älteste zuerst */
+  entries: () => S[];
+}
+
+export function useHistory<S extends object>(options?: HistoryOptions<S>): UseHistoryReturn<S> {
+  const engineRef = useRef<History<S> | null>(null);
+  if (!engineRef.current) engineRef.current = createHistory<S>(options);
+  const [flags, setFlags] = useState({ canUndo: false, canRedo: false });
+
+  const sync = useCallback(() => {
+    const h = engineRef.current!;
+    const canUndo = h.undoCount > 0, canRedo = h.redoCount > 0;
+    setFlags(prev => (prev.canUndo === canUndo && prev.canRedo === canRedo ? prev : { canUndo, canRedo }));
+  }, []);
+
+  const api = useMemo(() => {
+    const h = engineRef.current!;
+    return {
+      push: (snapshot: S, coalesceKey?: string) => { h.push(snapshot, coalesceKey); sync(); },
+      begin: (snapshot: S) => h.begin(snapshot),
+      commit: (current: S) => { if (h.commit(current)) sync(); },
+      undo: (current: S) => { const s = h.undo(current); sync(); return s; },
+      redo: (current: S) => { const s = h.redo(current); sync(); return s; },
+      jumpTo: (index: number, current: S) => { const s = h.jumpTo(index, current); sync(); return s; },
+      clear: () => { h.clear(); sync(); },
+      entries: () => h.entries(),
+    };
+  }, [sync]);
+
+  return useMemo(() => ({ ...api, ...flags }), [api, flags]);
+}
@@ -0,0 +1,47 @@
+/**
+ * useRoutePrefetch
+ *
+ * Lädt den Chunk einer Route vor, sobald ein Link dorthin gehovert oder
+ * fokussiert wird (Pointer-Events decken auch Touch ab). Ein delegierter
+ * Listener am Dokument erfasst alle <Link>/<a href>, ohne die Links selbst
+ * anzupassen. Im Datensparmodus wird nichts vorgeladen.
+ */
+
+import { useEffect } from 'react';
+
+export interface PrefetchRoute {
+  path: string;
+  preload: () => Promise<unknown>;
+}
+
+const normalizePath = (path: string) => path.replace(/\/+$/, '') || '/';
+
+export function useRoutePrefetch(routes: readonly PrefetchRoute[]) {
+  useEffect(() => {
+    const connection = (navigator as Navigator & { connection?: { saveData?: boolean } }).connection;
+    if (connection?.saveData) return;
+
+    const preloadByPath = new Map(routes.map(r => [normalizePath(r.path), r.preload]));
+    const started = new Set<string>();
+
+    const onIntent = (e: Event) => {
+      if (!(e.target instanceof Element)) return;
+      const link = e.target.closest('a[href]');
+      if (!(link instanceof HTMLAnchorElement) || link.origin !== window.location.origin) return;
+      const path = normalizePath(link.pathname);
+      if (started.has(path) || path === normalizePath(window.location.pathname)) return;
+      const preload = preloadByPath.get(path);
+      if (!preload) return;
+      started.add(path);
+      // Fehlgeschlagen (z.B. offline): beim nächsten Hover erneut versuchen
+      preload().catch(() => started.delete(path));
+    };
+
+    document.addEventListener('pointerover', onIntent, { passive: true });
+    document.addEventListener('focusin', onIntent);
+    return () => {
+      document.removeEventListener('pointerover', onIntent);
+      document.removeEventListener('focusin', onIntent);
+    };
+  }, [routes]);
+}
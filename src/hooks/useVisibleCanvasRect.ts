@@ -0,0 +1,45 @@
+/**
+ * useVisibleCanvasRect
+ *
+ * Liefert das sichtbare Canvas-Rechteck (in Canvas-Koordinaten, inkl. Rand)
+ * für einen Viewport mit Pan/Zoom. Die Viewport-Größe wird per
+ * ResizeObserver verfolgt, damit Vollbild/Resize neu culled.
+ */
+
+import { useState, useEffect, useMemo } from 'react';
+import type { RefObject } from 'react';
+import { getVisibleRect, CULL_MARGIN } from '@/lib/viewport';
+import type { Rect } from '@/lib/viewport';
+
+export function useVisibleCanvasRect(
+  viewportRef: RefObject<HTMLElement | null>,
+  zoom: number,
+  pan: { x: number; y: number },
+  /** Wechselt, wenn das Viewport-Element neu gemountet wird (z.B. Board-Liste ↔ Canvas) */
+  mountKey?: unknown,
+  margin = CULL_MARGIN,
+): Rect {
+  const [size, setSize] = useState({ width: 0, height: 0 });
+
+  useEffect(() => {
+    const el = viewportRef.current;
+    if (!el) return;
+    const measure = () => {
+      const { width, height } = el.getBoundingClientRect();
+      setSize(prev => (prev.width === width && prev.height === height ? prev : { width, height }));
+    };
+    measure();
+    if (typeof ResizeObserver === 'undefined') return;
+    const ro = new ResizeObserver(measure);
+    ro.observe(el);
+    return () => ro.disconnect();
+  }, [viewportRef, mountKey]);
+
+  return useMemo(() => {
+    // Noch nicht gemessen → nichts cullen
+    if (size.width === 0 && size.height === 0) {
+      return { x: -1e9, y: -1e9, w: 2e9, h: 2e9 };
+    }
+    return getVisibleRect(size.width, size.height, pan, zoom, margin);
+  }, [size, pan, zoom, margin]);
+}
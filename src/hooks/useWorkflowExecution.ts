@@ -4,22 +4,27 @@
  * Custom Hook der eine WorkflowEventSource konsumiert und
  * reaktiven UI-State für Node-Status, Artifacts und Ausführung liefert.
  *
+ * Events werden im ExecutionStore gepuffert und einmal pro Frame (oder
+ * Intervall) übernommen. Der Hook selbst rendert nur bei neuen Artifacts
+ * und Laufwechseln; Node-Status wird per `useNodeExecutionStatus` pro
+ * Node abonniert, der Gesamtzustand per `useExecutionPhase`.
+ *
  * Funktioniert identisch mit Mock- und echten Event-Quellen.
  */
 
-import { useState, useEffect, useCallback, useRef } from 'react';
+import { useState, useEffect, useCallback, useRef, useMemo, useSyncExternalStore } from 'react';
 import type {
   WorkflowEventSource,
   NodeExecutionStatus,
   Artifact,
   WorkflowExecutionResult,
 } from '@/types/workflowEvents';
+import { createExecutionStore } from '@/services/executionStore';
+import type { ExecutionStore, ExecutionStoreOptions, ExecutionPhase } from '@/services/executionStore';
 
 export interface UseWorkflowExecutionReturn {
-  /** Map von nodeId → aktueller Status */
-  nodeStates: Map<string, NodeExecutionStatus>;
   /** Gesammelte Artifacts der aktuellen/letzten Ausführung */
-  artifacts: Artifact[];
+  artifacts: readonly Artifact[];
   /** Läuft gerade eine Ausführung? */
   isRunning: boolean;
   /** Ist die letzte Ausführung fertig? (bleibt true bis nächste Ausführung) */
@@ -30,32 +35,35 @@ export interface UseWorkflowExecutionReturn {
   execute: (systemId: string, nodeIds: string[], connections: { from: string; to: string }[], nodeTypes?: Record<string, string>) => void;
   /** Setzt alle States zurück */
   reset: () => void;
+  /** Zugrunde liegender Store (für useNodeExecutionStatus/useExecutionPhase) */
+  store: ExecutionStore;
 }
 
-export function useWorkflowExecution(eventSource: WorkflowEventSource): UseWorkflowExecutionReturn {
-  const [nodeStates, setNodeStates] = useState<Map<string, NodeExecutionStatus>>(new Map());
-  const [artifacts, setArtifacts] = useState<Artifact[]>([]);
+export function useWorkflowExecution(
+  eventSource: WorkflowEventSource,
+  options?: ExecutionStoreOptions,
+): UseWorkflowExecutionReturn {
+  const storeRef = useRef<ExecutionStore | null>(null);
+  if (!storeRef.current) storeRef.current = createExecutionStore(options);
+  const store = storeRef.current;
+
+  // Nur die Artifacts abonnieren – Status-Flushes ohne neue Artifacts rendern hier nicht
+  const getArtifacts = useCallback(() => store.getSnapshot().artifacts, [store]);
+  const artifacts = useSyncExternalStore(store.subscribe, getArtifacts);
   const [isRunning, setIsRunning] = useState(false);
   const [isComplete, setIsComplete] = useState(false);
   const [executionResult, setExecutionResult] = useState<WorkflowExecutionResult | null>(null);
   const eventSourceRef = useRef(eventSource);
   eventSourceRef.current = eventSource;
 
-  // Subscribe to event source
+  // Subscribe to event source – Events landen im Puffer, nicht direkt im State
   useEffect(() => {
-    const unsub1 = eventSource.onNodeStatus((event) => {
-      setNodeStates(prev => {
-        const next = new Map(prev);
-        next.set(event.nodeId, event.status);
-        return next;
-      });
-    });
-
-    const unsub2 = eventSource.onArtifact((artifact) => {
-      setArtifacts(prev => [...prev, artifact]);
-    });
+    const unsub1 = eventSource.onNodeStatus(store.pushStatus);
+    const unsub2 = eventSource.onArtifact(store.pushArtifact);
 
     const unsub3 = eventSource.onComplete((result) => {
+      // Restliche Events vor dem Abschluss übernehmen
+      store.flush();
       setIsRunning(false);
       setIsComplete(true);
       setExecutionResult(result);
@@ -66,14 +74,15 @@ export function useWorkflowExecution(eventSource: WorkflowEventSource): UseWorkf
       unsub2();
       unsub3();
     };
-  }, [eventSource]);
+  }, [eventSource, store]);
 
   // Cleanup on unmount
   useEffect(() => {
     return () => {
       eventSourceRef.current.dispose();
+      store.dispose();
     };
-  }, []);
+  }, [store]);
 
   const execute = useCallback((
     systemId: string,
@@ -82,19 +91,44 @@ export function useWorkflowExecution(eventSource: WorkflowEventSource): UseWorkf
   ) => {
     setIsRunning(true);
     setIsComplete(false);
-    setArtifacts([]);
-    setNodeStates(new Map());
+    store.reset();
     setExecutionResult(null);
     eventSourceRef.current.execute(systemId, nodeIds, connections);
-  }, []);
+  }, [store]);
 
   const reset = useCallback(() => {
-    setNodeStates(new Map());
-    setArtifacts([]);
+    store.reset();
     setIsRunning(false);
     setIsComplete(false);
     setExecutionResult(null);
-  }, []);
+  }, [store]);
+
+  return {
+    artifacts,
+    isRunning, isComplete, executionResult, execute, reset, store,
+  };
+}
 
-  return { nodeStates, artifacts, isRunning, isComplete, executionResult, execute, reset };
+/**
+ * Abonniert den Status eines einzelnen Nodes. Die Komponente rendert nur,
+ * wenn sich genau dieser Status ändert.
+ */
+export function useNodeExecutionStatus(store: ExecutionStore | null | undefined, nodeId: string): NodeExecutionStatus {
+  const subscribe = useMemo(() => (listener: () => void) => (
+    store ? store.subscribeNode(nodeId, listener) : noop
+  ), [store, nodeId]);
+  const getStatus = useCallback(() => (store ? store.getNodeStatus(nodeId) : 'idle'), [store, nodeId]);
+  return useSyncExternalStore(subscribe, getStatus);
 }
+
+/**
+ * Gesamtzustand des Laufs (idle/running/done). Rendert bei Flushes nur,
+ * wenn sich die Phase tatsächlich ändert.
+ */
+export function useExecutionPhase(store: ExecutionStore | null | undefined): ExecutionPhase {
+  const subscribe = useCallback((listener: () => void) => (store ? store.subscribe(listener) : noop), [store]);
+  const getPhase = useCallback(() => (store ? store.getPhase() : 'idle'), [store]);
+  return useSyncExternalStore(subscribe, getPhase);
+}
+
+function noop() {}
@@ -56,6 +56,8 @@ const de: TranslationMap = {
   'detail.resultsTitle': 'Ergebnisse',
   'detail.entries': 'Einträge',
   'detail.new': 'neu',
+  'detail.criticalPath': 'kritischer Pfad',
+  'detail.speedup': 'Parallelisierung',
   'detail.lastExecution': 'Letzte Ausführung',
 
   // ─── Template Picker ─────────────────────────────────────
@@ -168,6 +170,7 @@ const de: TranslationMap = {
   'toolbar.autoLayout': 'Auto-Layout',
   'toolbar.autoLayoutLabel': 'Automatische Anordnung',
   'toolbar.exportPNG': 'Als PNG exportieren',
+  'toolbar.cancelExport': 'Export abbrechen',
   'toolbar.searchNode': 'Node suchen',
   'toolbar.searchNodeKey': 'Node suchen (Ctrl+F)',
   'toolbar.zoomOut': 'Herauszoomen',
@@ -276,6 +279,8 @@ const de: TranslationMap = {
   'toast.settingUpdated': 'Einstellung aktualisiert',
   'toast.settingsReset': 'Einstellungen zurückgesetzt',
   'toast.outputSaved': 'Änderungen gespeichert',
+  'toast.systemsLoading': 'Systeme werden noch geladen',
+  'toast.systemsLoadFailed': 'Gespeicherte Systeme konnten nicht geladen werden',
 };
 
 const en: TranslationMap = {
@@ -332,6 +337,8 @@ const en: TranslationMap = {
   'detail.resultsTitle': 'Results',
   'detail.entries': 'Entries',
   'detail.new': 'new',
+  'detail.criticalPath': 'critical path',
+  'detail.speedup': 'speedup',
   'detail.lastExecution': 'Last Execution',
 
   // ─── Template Picker ─────────────────────────────────────
@@ -444,6 +451,7 @@ const en: TranslationMap = {
   'toolbar.autoLayout': 'Auto-Layout',
   'toolbar.autoLayoutLabel': 'Automatic arrangement',
   'toolbar.exportPNG': 'Export as PNG',
+  'toolbar.cancelExport': 'Cancel export',
   'toolbar.searchNode': 'Search node',
   'toolbar.searchNodeKey': 'Search node (Ctrl+F)',
   'toolbar.zoomOut': 'Zoom out',
@@ -552,6 +560,8 @@ const en: TranslationMap = {
   'toast.settingUpdated': 'Setting updated',
   'toast.settingsReset': 'Settings reset',
   'toast.outputSaved': 'Changes saved',
+  'toast.systemsLoading': 'Systems are still loading',
+  'toast.systemsLoadFailed': 'Saved systems could not be loaded',
 };
 
 export const translations: Record<Language, TranslationMap> = { de, en };
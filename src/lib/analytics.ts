@@ -0,0 +1,713 @@
+/**
+ * Analytics core shared by DashboardPage and LinkedInDashboardPage.
+ *
+ * Fact rows (one per day and source, e.g. a campaign-day from an ads feed)
+ * live in a columnar `FactTable` of typed arrays. `createAnalyticsEngine`
+ * folds them into per-segment, per-day prefix sums for a few low-cardinality
+ * segments (platform, status, …), so the totals of any date window are two
+ * lookups per metric; per-source figures (campaign or post cards) come from
+ * a sparse per-source index. Edits replace the rows of single sources and
+ * patch the affected prefix rows in place. Window totals and bucketed chart
+ * series are memoized in an LRU cache keyed by range and segment.
+ * `createRowIndex` covers the list views: interned group codes, pre-lowered
+ * search text and cached sort permutations, so a filter change is a single
+ * linear pass without re-sorting. `createColumnTable` stores editable records
+ * (leads) column by column with the same filtering.
+ */
+
+export const DAY_MS = 86_400_000;
+
+/** Days since the Unix epoch (UTC) */
+export const toDay = (time: number | Date) => Math.floor(+time / DAY_MS);
+export const fromDay = (day: number) => new Date(day * DAY_MS);
+
+// ─── LRU cache ──────────────────────────────────────────────────────────────
+
+export interface LruCache<K, V> {
+  get(key: K): V | undefined;
+  set(key: K, value: V): void;
+  getOrCompute(key: K, compute: () => V): V;
+  clear(): void;
+  readonly size: number;
+}
+
+/** Map-backed LRU: insertion order doubles as recency order */
+export function createLruCache<K, V>(capacity: number): LruCache<K, V> {
+  const map = new Map<K, V>();
+  const touch = (key: K, value: V) => {
+    map.delete(key);
+    map.set(key, value);
+    if (map.size > capacity) map.delete(map.keys().next().value as K);
+  };
+  return {
+    get(key) {
+      if (!map.has(key)) return undefined;
+      const value = map.get(key) as V;
+      touch(key, value);
+      return value;
+    },
+    set: touch,
+    getOrCompute(key, compute) {
+      if (map.has(key)) {
+        const value = map.get(key) as V;
+        touch(key, value);
+        return value;
+      }
+      const value = compute();
+      touch(key, value);
+      return value;
+    },
+    clear: () => map.clear(),
+    get size() { return map.size; },
+  };
+}
+
+// ─── Fact table ─────────────────────────────────────────────────────────────
+
+export interface FactTable<M extends string> {
+  readonly metrics: readonly M[];
+  readonly length: number;
+  /** Day per row (see `toDay`); valid up to `length` */
+  readonly day: Int32Array;
+  /** Segment per row (platform, status, …); valid up to `length` */
+  readonly segment: Uint32Array;
+  /** Source per row (campaign, post, …); valid up to `length` */
+  readonly source: Uint32Array;
+  column(metric: M): Float64Array;
+  append(day: number, segment: number, values: Readonly<Record<M, number>>, source?: number): void;
+}
+
+export function createFactTable<M extends string>(metrics: readonly M[], capacity = 1024): FactTable<M> {
+  let size = 0;
+  let cap = Math.max(16, capacity);
+  let day = new Int32Array(cap);
+  let segment = new Uint32Array(cap);
+  let source = new Uint32Array(cap);
+  const columns = new Map<M, Float64Array>(metrics.map(m => [m, new Float64Array(cap)]));
+  // Same order as `metrics`, so append writes by index instead of iterating the map
+  let ordered = metrics.map(m => columns.get(m)!);
+
+  const grow = () => {
+    cap *= 2;
+    const d = new Int32Array(cap); d.set(day); day = d;
+    const s = new Uint32Array(cap); s.set(segment); segment = s;
+    const o = new Uint32Array(cap); o.set(source); source = o;
+    for (const [m, col] of columns) {
+      const c = new Float64Array(cap);
+      c.set(col);
+      columns.set(m, c);
+    }
+    ordered = metrics.map(m => columns.get(m)!);
+  };
+
+  return {
+    metrics,
+    get length() { return size; },
+    get day() { return day; },
+    get segment() { return segment; },
+    get source() { return source; },
+    column(metric) {
+      const col = columns.get(metric);
+      if (!col) throw new Error(`Unknown metric "${metric}"`);
+      return col;
+    },
+    append(d, seg, values, src = 0) {
+      if (size === cap) grow();
+      day[size] = d;
+      segment[size] = seg;
+      source[size] = src;
+      for (let k = 0; k < metrics.length; k++) ordered[k][size] = values[metrics[k]];
+      size++;
+    },
+  };
+}
+
+// ─── Engine ─────────────────────────────────────────────────────────────────
+
+export type MetricTotals<M extends string> = Readonly<Record<M, number>>;
+
+export interface SeriesBucket<M extends string> {
+  /** Day range [from, to) covered by the bucket */
+  from: number;
+  to: number;
+  totals: MetricTotals<M>;
+}
+
+export interface AnalyticsEngine<M extends string> {
+  /** Covered days [firstDay, endDay) */
+  readonly firstDay: number;
+  readonly endDay: number;
+  readonly segments: number;
+  /** Sums over the days [from, to) for one segment, or all when omitted */
+  totals(from: number, to: number, segment?: number): MetricTotals<M>;
+  /** [from, to) split into `buckets` near-equal consecutive slices */
+  series(from: number, to: number, buckets: number, segment?: number): readonly SeriesBucket<M>[];
+  /** Sums over the days [from, to) for one source; unknown sources sum to zero */
+  sourceTotals(from: number, to: number, source: number): MetricTotals<M>;
+  /**
+   * Replaces all rows of the sources present in `table` and empties the
+   * `removed` sources. Prefix rows and the source index are patched in place;
+   * the returned handle reads the same data under a new identity, so it can
+   * serve as a memo dependency.
+   */
+  update(table: FactTable<M>, removed?: Iterable<number>): AnalyticsEngine<M>;
+}
+
+export interface AnalyticsEngineOptions {
+  /** Number of segments; rows with a larger segment are ignored */
+  segments: number;
+  /** Covered days [firstDay, endDay); derived from the initial rows when omitted. Rows outside are ignored */
+  range?: { firstDay: number; endDay: number };
+  /** Memoized window/series results (default 128) */
+  cacheSize?: number;
+}
+
+/** First position in [lo, hi) whose day is >= `day` */
+function lowerBound(days: Int32Array, lo: number, hi: number, day: number): number {
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (days[mid] < day) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+export function createAnalyticsEngine<M extends string>(table: FactTable<M>, options: AnalyticsEngineOptions): AnalyticsEngine<M> {
+  const { segments } = options;
+  const metrics = table.metrics;
+
+  let firstDay = 0, endDay = 0;
+  if (options.range) {
+    ({ firstDay, endDay } = options.range);
+  } else if (table.length > 0) {
+    firstDay = Infinity; endDay = -Infinity;
+    for (let i = 0; i < table.length; i++) {
+      if (table.day[i] < firstDay) firstDay = table.day[i];
+      if (table.day[i] + 1 > endDay) endDay = table.day[i] + 1;
+    }
+  }
+  const span = Math.max(0, endDay - firstDay);
+  const stride = span + 1;
+  // Row `segments` holds the sum over all segments
+  const allRow = segments * stride;
+
+  // Per metric: (segments + 1) rows of prefix sums, P[d] = sum of days before d.
+  // Segments are kept low-cardinality (platform, status, …) – per-campaign or
+  // per-post figures come from the sparse source index below.
+  const prefix = metrics.map(() => new Float64Array((segments + 1) * stride));
+
+  // Source index: each source owns a run [start, start + count) in a shared
+  // pool, sorted by day, holding running sums per metric. Only days with rows
+  // are stored. A run that outgrows its slot moves to the end of the pool;
+  // freed slots are reclaimed by compaction.
+  let sourceCap = 0;
+  let runStart = new Int32Array(0);
+  let runCount = new Int32Array(0);
+  let runSegment = new Uint32Array(0);
+  let poolCap = 0, poolUsed = 0, garbage = 0;
+  let poolDay = new Int32Array(0);
+  let poolSum = metrics.map(() => new Float64Array(0));
+
+  const ensureSources = (count: number) => {
+    if (count <= sourceCap) return;
+    sourceCap = Math.max(count, Math.ceil(sourceCap * 1.5), 16);
+    const s = new Int32Array(sourceCap); s.set(runStart); runStart = s;
+    const c = new Int32Array(sourceCap); c.set(runCount); runCount = c;
+    const g = new Uint32Array(sourceCap); g.set(runSegment); runSegment = g;
+  };
+
+  const resizePool = (cap: number) => {
+    poolCap = cap;
+    const d = new Int32Array(cap); d.set(poolDay.subarray(0, poolUsed)); poolDay = d;
+    poolSum = poolSum.map(col => {
+      const c = new Float64Array(cap);
+      c.set(col.subarray(0, poolUsed));
+      return c;
+    });
+  };
+
+  const compact = () => {
+    const order: number[] = [];
+    for (let s = 0; s < sourceCap; s++) if (runCount[s] > 0) order.push(s);
+    order.sort((a, b) => runStart[a] - runStart[b]);
+    // Runs keep their relative order, so moving each one down never overwrites a live run
+    let used = 0;
+    for (const s of order) {
+      const from = runStart[s], count = runCount[s];
+      if (from !== used) {
+        poolDay.copyWithin(used, from, from + count);
+        for (const col of poolSum) col.copyWithin(used, from, from + count);
+      }
+      runStart[s] = used;
+      used += count;
+    }
+    poolUsed = used;
+    garbage = 0;
+    if (poolCap > used * 2) resizePool(used);
+  };
+
+  const applyUpdate = (rows: FactTable<M>, removed: Iterable<number>) => {
+    const n = rows.length;
+    const days = rows.day, rowSegment = rows.segment, rowSource = rows.source;
+    const values = metrics.map(m => rows.column(m));
+    const inRange = (i: number) => rowSegment[i] < segments && days[i] >= firstDay && days[i] < endDay;
+
+    // New row count per touched source; sources without rows in range are emptied
+    const counts = new Map<number, number>();
+    for (let i = 0; i < n; i++) counts.set(rowSource[i], (counts.get(rowSource[i]) ?? 0) + (inRange(i) ? 1 : 0));
+    for (const src of removed) if (!counts.has(src)) counts.set(src, 0);
+    let maxSource = -1;
+    for (const src of counts.keys()) if (src > maxSource) maxSource = src;
+    ensureSources(maxSource + 1);
+
+    // Point deltas per prefix row, turned into running sums at the end
+    const delta = metrics.map(() => new Float64Array((segments + 1) * stride));
+    const touched = new Uint8Array(segments);
+
+    // Take out the old rows and plan the new runs
+    const cursor = new Map<number, number>();
+    let grow = 0;
+    for (const [src, count] of counts) {
+      const start = runStart[src], old = runCount[src];
+      if (old > 0) {
+        const base = runSegment[src] * stride;
+        touched[runSegment[src]] = 1;
+        for (let k = start; k < start + old; k++) {
+          const d = poolDay[k] - firstDay + 1;
+          for (let m = 0; m < metrics.length; m++) {
+            const v = poolSum[m][k] - (k > start ? poolSum[m][k - 1] : 0);
+            delta[m][base + d] -= v;
+            delta[m][allRow + d] -= v;
+          }
+        }
+      }
+      if (count <= old) {
+        garbage += old - count;
+      } else {
+        garbage += old;
+        runStart[src] = -1;
+        grow += count;
+      }
+      runCount[src] = count;
+    }
+    if (poolUsed + grow > poolCap) resizePool(Math.max(poolUsed + grow, Math.ceil(poolCap * 1.5)));
+    for (const [src, count] of counts) {
+      if (runStart[src] === -1) { runStart[src] = poolUsed; poolUsed += count; }
+      cursor.set(src, runStart[src]);
+    }
+
+    // Write the new rows (raw values first, running sums below)
+    for (let i = 0; i < n; i++) {
+      if (!inRange(i)) continue;
+      const src = rowSource[i], seg = rowSegment[i];
+      const k = cursor.get(src)!;
+      cursor.set(src, k + 1);
+      poolDay[k] = days[i];
+      runSegment[src] = seg;
+      touched[seg] = 1;
+      const base = seg * stride, d = days[i] - firstDay + 1;
+      for (let m = 0; m < metrics.length; m++) {
+        const v = values[m][i];
+        poolSum[m][k] = v;
+        delta[m][base + d] += v;
+        delta[m][allRow + d] += v;
+      }
+    }
+
+    for (const [src, count] of counts) {
+      const start = runStart[src], end = start + count;
+      let sorted = true;
+      for (let k = start + 1; k < end && sorted; k++) sorted = poolDay[k - 1] <= poolDay[k];
+      if (!sorted) {
+        const perm = Array.from({ length: count }, (_, j) => start + j).sort((a, b) => poolDay[a] - poolDay[b] || a - b);
+        poolDay.set(perm.map(k => poolDay[k]), start);
+        for (const col of poolSum) col.set(perm.map(k => col[k]), start);
+      }
+      for (const col of poolSum) for (let k = start + 1; k < end; k++) col[k] += col[k - 1];
+    }
+
+    // Patch the touched prefix rows in place: O(span) per row and metric
+    const patch = (base: number) => {
+      for (let m = 0; m < metrics.length; m++) {
+        const p = prefix[m], dm = delta[m];
+        let run = 0;
+        for (let d = 1; d <= span; d++) {
+          run += dm[base + d];
+          p[base + d] += run;
+        }
+      }
+    };
+    let any = false;
+    for (let seg = 0; seg < segments; seg++) if (touched[seg]) { patch(seg * stride); any = true; }
+    if (any) patch(allRow);
+
+    if (garbage > 1024 && garbage * 2 > poolUsed) compact();
+    cache.clear();
+  };
+
+  // Non-finite days (e.g. from an empty date input) clamp to the start, i.e. an empty window
+  const clamp = (day: number) => (!Number.isFinite(day) || day < firstDay ? 0 : day > endDay ? span : day - firstDay);
+
+  const computeTotals = (from: number, to: number, segment?: number): MetricTotals<M> => {
+    const base = segment === undefined ? allRow : segment * stride;
+    const f = clamp(from), t = clamp(to);
+    const out = {} as Record<M, number>;
+    for (let m = 0; m < metrics.length; m++) out[metrics[m]] = t > f ? prefix[m][base + t] - prefix[m][base + f] : 0;
+    return out;
+  };
+
+  const cache = createLruCache<string, MetricTotals<M> | readonly SeriesBucket<M>[]>(options.cacheSize ?? 128);
+  const checkSegment = (segment?: number) => {
+    if (segment !== undefined && (segment < 0 || segment >= segments)) throw new RangeError(`Segment ${segment} out of range`);
+  };
+
+  const totals = (from: number, to: number, segment?: number) => {
+    checkSegment(segment);
+    return cache.getOrCompute(`t:${from}:${to}:${segment ?? '*'}`, () => computeTotals(from, to, segment)) as MetricTotals<M>;
+  };
+
+  const series = (from: number, to: number, buckets: number, segment?: number) => {
+    checkSegment(segment);
+    const count = Number.isFinite(buckets) ? Math.max(1, Math.floor(buckets)) : 1;
+    return cache.getOrCompute(`s:${from}:${to}:${count}:${segment ?? '*'}`, () => {
+      const len = Math.max(0, to - from);
+      const out: SeriesBucket<M>[] = [];
+      for (let b = 0; b < count; b++) {
+        const bFrom = from + Math.floor((len * b) / count);
+        const bTo = from + Math.floor((len * (b + 1)) / count);
+        out.push({ from: bFrom, to: bTo, totals: computeTotals(bFrom, bTo, segment) });
+      }
+      return out;
+    }) as readonly SeriesBucket<M>[];
+  };
+
+  // Two binary searches per call; not cached, a page of cards would evict the window results
+  const sourceTotals = (from: number, to: number, source: number): MetricTotals<M> => {
+    const out = {} as Record<M, number>;
+    const count = source >= 0 && source < sourceCap ? runCount[source] : 0;
+    const start = count > 0 ? runStart[source] : 0;
+    const lo = count > 0 && to > from ? lowerBound(poolDay, start, start + count, from) : 0;
+    const hi = count > 0 && to > from ? lowerBound(poolDay, lo, start + count, to) : 0;
+    for (let m = 0; m < metrics.length; m++) {
+      const sum = poolSum[m];
+      out[metrics[m]] = hi > lo ? sum[hi - 1] - (lo > start ? sum[lo - 1] : 0) : 0;
+    }
+    return out;
+  };
+
+  const handle = (): AnalyticsEngine<M> => ({
+    firstDay,
+    endDay,
+    segments,
+    totals,
+    series,
+    sourceTotals,
+    update(rows, removed = []) {
+      applyUpdate(rows, removed);
+      return handle();
+    },
+  });
+
+  applyUpdate(table, []);
+  return handle();
+}
+
+// ─── Row filtering ──────────────────────────────────────────────────────────
+
+export interface ColumnQuery<G extends string> {
+  /** Case-insensitive substring over the row's search text */
+  search?: string;
+  /** Exact match per group; missing or "all" keeps every row */
+  where?: Partial<Record<G, string>>;
+}
+
+export interface RowQuery<G extends string, S extends string> extends ColumnQuery<G> {
+  sortBy?: S;
+  dir?: 'asc' | 'desc';
+}
+
+interface GroupColumn {
+  codes: Uint16Array;
+  dict: Map<string, number>;
+}
+
+/** Predicate over row positions for `q`, or null when no row can match */
+function rowFilter<G extends string>(
+  q: ColumnQuery<G>,
+  groups: ReadonlyMap<G, GroupColumn>,
+  haystack: readonly string[] | null,
+): ((i: number) => boolean) | null {
+  const needle = q.search ? q.search.toLowerCase() : '';
+  const filters: { codes: Uint16Array; code: number }[] = [];
+  if (q.where) {
+    for (const key of Object.keys(q.where) as G[]) {
+      const value = q.where[key];
+      const group = groups.get(key);
+      if (value === undefined || value === 'all' || !group) continue;
+      const code = group.dict.get(value);
+      if (code === undefined) return null;
+      filters.push({ codes: group.codes, code });
+    }
+  }
+  return (i) => {
+    for (const f of filters) if (f.codes[i] !== f.code) return false;
+    return !needle || !haystack || haystack[i].includes(needle);
+  };
+}
+
+// ─── Row index ──────────────────────────────────────────────────────────────
+
+export interface RowIndex<R, G extends string, S extends string> {
+  readonly rows: readonly R[];
+  query(q?: RowQuery<G, S>): R[];
+}
+
+export interface RowIndexSpec<R, G extends string, S extends string> {
+  /** Text searched by `RowQuery.search` (lowercased once) */
+  text?: (row: R) => string;
+  /** Low-cardinality string columns (platform, status, …) stored as codes */
+  groups?: Record<G, (row: R) => string>;
+  /** Sortable columns; permutations are built on first use */
+  sort?: Record<S, (row: R) => number | string>;
+}
+
+export function createRowIndex<R, G extends string = never, S extends string = never>(
+  rows: readonly R[],
+  spec: RowIndexSpec<R, G, S>,
+): RowIndex<R, G, S> {
+  const n = rows.length;
+  const haystack = spec.text ? rows.map(r => spec.text!(r).toLowerCase()) : null;
+
+  // Interned group columns: value → code per group, one Uint16Array per group
+  const groups = new Map<G, GroupColumn>();
+  if (spec.groups) {
+    for (const key of Object.keys(spec.groups) as G[]) {
+      const get = spec.groups[key];
+      const dict = new Map<string, number>();
+      const codes = new Uint16Array(n);
+      for (let i = 0; i < n; i++) {
+        const value = get(rows[i]);
+        let code = dict.get(value);
+        if (code === undefined) { code = dict.size; dict.set(value, code); }
+        codes[i] = code;
+      }
+      groups.set(key, { codes, dict });
+    }
+  }
+
+  const orders = new Map<string, Int32Array>();
+  const collator = new Intl.Collator();
+  const order = (field: S, dir: 'asc' | 'desc') => {
+    const cacheKey = `${field}:${dir}`;
+    let perm = orders.get(cacheKey);
+    if (perm) return perm;
+    const get = spec.sort![field];
+    const sign = dir === 'asc' ? 1 : -1;
+    perm = new Int32Array(n);
+    for (let i = 0; i < n; i++) perm[i] = i;
+    if (n > 0 && typeof get(rows[0]) === 'string') {
+      const keys = rows.map(r => String(get(r)));
+      perm.sort((a, b) => sign * collator.compare(keys[a], keys[b]) || a - b);
+    } else {
+      const keys = new Float64Array(n);
+      for (let i = 0; i < n; i++) keys[i] = Number(get(rows[i]));
+      perm.sort((a, b) => sign * (keys[a] - keys[b]) || a - b);
+    }
+    orders.set(cacheKey, perm);
+    return perm;
+  };
+
+  return {
+    rows,
+    query(q = {}) {
+      const matches = rowFilter(q, groups, haystack);
+      if (!matches) return [];
+      const perm = q.sortBy && spec.sort ? order(q.sortBy, q.dir ?? 'asc') : null;
+      const out: R[] = [];
+      for (let k = 0; k < n; k++) {
+        const i = perm ? perm[k] : k;
+        if (matches(i)) out.push(rows[i]);
+      }
+      return out;
+    },
+  };
+}
+
+// ─── Column table ───────────────────────────────────────────────────────────
+
+/** Read view of a `ColumnTable`; every write produces a new view */
+export interface ColumnTableView<R, G extends string> {
+  readonly length: number;
+  /** Materializes the row at position `i` */
+  row(i: number): R;
+  rows(positions: ArrayLike<number>): R[];
+  /** Positions of the matching rows, in table order */
+  query(q?: ColumnQuery<G>): Int32Array;
+  /** Rows per value of a group column, over `positions` or the whole table */
+  countBy(field: G, positions?: ArrayLike<number>): Partial<Record<string, number>>;
+}
+
+export interface ColumnTable<R extends { id: string }, G extends string> {
+  /** Current view (useSyncExternalStore) */
+  getSnapshot(): ColumnTableView<R, G>;
+  subscribe(listener: () => void): () => void;
+  /** Patches one row in place; unknown ids are ignored */
+  update(id: string, patch: Partial<R> | ((row: R) => Partial<R>)): void;
+  remove(id: string): void;
+  /** Replaces all rows */
+  reset(rows: readonly R[]): void;
+}
+
+export interface ColumnTableSpec<R, G extends string> {
+  /** Low-cardinality string fields (status, source, …), interned as Uint16 codes and filterable via `where` */
+  groups: readonly G[];
+  /** Numeric fields, stored as Float64Array */
+  numbers?: readonly (keyof R & string)[];
+  /** Text searched by `ColumnQuery.search` (lowercased once per row) */
+  text?: (row: R) => string;
+}
+
+/**
+ * Row records stored column by column: group fields as codes, numeric fields
+ * as typed arrays, everything else as one plain array per field. Rows are only
+ * materialized for what is rendered.
+ */
+export function createColumnTable<R extends { id: string }, G extends keyof R & string>(
+  initial: readonly R[],
+  spec: ColumnTableSpec<R, G>,
+): ColumnTable<R, G> {
+  const numberFields = new Set<string>(spec.numbers ?? []);
+  let length = 0;
+  let fields: string[] = [];
+  let groups = new Map<G, GroupColumn & { values: string[] }>();
+  let numbers = new Map<string, Float64Array>();
+  let plain = new Map<string, unknown[]>();
+  let haystack: string[] | null = null;
+  let idIndex: Map<string, number> | null = null;
+  const listeners = new Set<() => void>();
+
+  const intern = (group: GroupColumn & { values: string[] }, value: string) => {
+    let code = group.dict.get(value);
+    if (code === undefined) {
+      if (group.values.length > 0xffff) throw new RangeError('Too many distinct values for a group column');
+      code = group.values.length;
+      group.dict.set(value, code);
+      group.values.push(value);
+    }
+    return code;
+  };
+
+  const write = (i: number, key: string, value: unknown) => {
+    const group = groups.get(key as G);
+    if (group) group.codes[i] = intern(group, String(value));
+    else if (numbers.has(key)) numbers.get(key)![i] = Number(value);
+    else {
+      let col = plain.get(key);
+      if (!col) { col = new Array(length); plain.set(key, col); fields.push(key); }
+      col[i] = value;
+    }
+  };
+
+  const row = (i: number): R => {
+    const out: Record<string, unknown> = {};
+    for (const key of fields) {
+      const group = groups.get(key as G);
+      out[key] = group ? group.values[group.codes[i]] : numbers.has(key) ? numbers.get(key)![i] : plain.get(key)![i];
+    }
+    return out as R;
+  };
+
+  const load = (rows: readonly R[]) => {
+    length = rows.length;
+    const keys = new Set<string>(spec.groups);
+    for (const r of rows) for (const key of Object.keys(r)) keys.add(key);
+    fields = [...keys];
+    groups = new Map<G, GroupColumn & { values: string[] }>(spec.groups.map(g => [g, { codes: new Uint16Array(length), dict: new Map(), values: [] }]));
+    numbers = new Map();
+    plain = new Map();
+    for (const key of fields) {
+      if (groups.has(key as G)) continue;
+      if (numberFields.has(key)) numbers.set(key, new Float64Array(length));
+      else plain.set(key, new Array(length));
+    }
+    for (let i = 0; i < length; i++) {
+      const r = rows[i] as Record<string, unknown>;
+      for (const key of fields) write(i, key, r[key]);
+    }
+    haystack = spec.text ? rows.map(r => spec.text!(r).toLowerCase()) : null;
+    idIndex = null;
+  };
+
+  const indexOf = (id: string) => {
+    if (!idIndex) {
+      const ids = plain.get('id')!;
+      idIndex = new Map();
+      for (let i = 0; i < length; i++) idIndex.set(ids[i] as string, i);
+    }
+    return idIndex.get(id) ?? -1;
+  };
+
+  const createView = (): ColumnTableView<R, G> => ({
+    length,
+    row,
+    rows: positions => Array.from(positions, i => row(i)),
+    query(q = {}) {
+      const matches = rowFilter(q, groups, haystack);
+      const out = new Int32Array(matches ? length : 0);
+      let count = 0;
+      if (matches) for (let i = 0; i < length; i++) if (matches(i)) out[count++] = i;
+      return out.subarray(0, count);
+    },
+    countBy(field, positions) {
+      const group = groups.get(field)!;
+      const counts = new Uint32Array(group.values.length);
+      if (positions) for (let k = 0; k < positions.length; k++) counts[group.codes[positions[k]]]++;
+      else for (let i = 0; i < length; i++) counts[group.codes[i]]++;
+      const out: Partial<Record<string, number>> = {};
+      group.values.forEach((value, code) => { if (counts[code] > 0) out[value] = counts[code]; });
+      return out;
+    },
+  });
+
+  load(initial);
+  let view = createView();
+  const commit = () => {
+    view = createView();
+    listeners.forEach(l => l());
+  };
+
+  return {
+    getSnapshot: () => view,
+
+    subscribe(listener) {
+      listeners.add(listener);
+      return () => { listeners.delete(listener); };
+    },
+
+    update(id, patch) {
+      const i = indexOf(id);
+      if (i < 0) return;
+      const changes = typeof patch === 'function' ? (patch as (row: R) => Partial<R>)(row(i)) : patch;
+      for (const key of Object.keys(changes)) write(i, key, (changes as Record<string, unknown>)[key]);
+      if (haystack) haystack[i] = spec.text!(row(i)).toLowerCase();
+      commit();
+    },
+
+    remove(id) {
+      const i = indexOf(id);
+      if (i < 0) return;
+      for (const group of groups.values()) group.codes.copyWithin(i, i + 1, length);
+      for (const col of numbers.values()) col.copyWithin(i, i + 1, length);
+      for (const col of plain.values()) col.splice(i, 1);
+      haystack?.splice(i, 1);
+      length--;
+      idIndex = null;
+      commit();
+    },
+
+    reset(rows) {
+      load(rows);
+      commit();
+    },
+  };
+}
@@ -0,0 +1,46 @@
+/**
+ * Streaming CSV export for the dashboards.
+ *
+ * Rows are pulled from an iterable and serialized in fixed-size batches, each
+ * batch becoming one Blob part. Large exports never build one giant string
+ * or an intermediate array of row strings. Fields are quoted per RFC 4180
+ * when they contain a separator, quote or line break.
+ */
+
+import { downloadBlob } from './download';
+
+const ROWS_PER_PART = 2000;
+const NEEDS_QUOTES = /[",\r\n]/;
+
+export type CsvValue = string | number | boolean | null | undefined;
+
+function csvField(value: CsvValue): string {
+  if (value === null || value === undefined) return '';
+  const s = String(value);
+  return NEEDS_QUOTES.test(s) ? `"${s.replace(/"/g, '""')}"` : s;
+}
+
+/** Yields the CSV text in batches of `rowsPerPart` lines */
+export function* csvParts(headers: readonly string[], rows: Iterable<readonly CsvValue[]>, rowsPerPart = ROWS_PER_PART): Generator<string> {
+  let part = headers.map(csvField).join(',');
+  let count = 0;
+  for (const row of rows) {
+    let line = '\n';
+    for (let i = 0; i < row.length; i++) line += (i > 0 ? ',' : '') + csvField(row[i]);
+    part += line;
+    if (++count === rowsPerPart) {
+      yield part;
+      part = '';
+      count = 0;
+    }
+  }
+  if (part) yield part;
+}
+
+export function csvBlob(headers: readonly string[], rows: Iterable<readonly CsvValue[]>): Blob {
+  return new Blob([...csvParts(headers, rows)], { type: 'text/csv;charset=utf-8' });
+}
+
+export function downloadCsv(filename: string, headers: readonly string[], rows: Iterable<readonly CsvValue[]>) {
+  downloadBlob(csvBlob(headers, rows), filename);
+}
@@ -0,0 +1,15 @@
+/**
+ * Triggers a browser download for a Blob (canvas exports, CSV reports).
+ */
+
+export function downloadBlob(blob: Blob, filename: string) {
+  const url = URL.createObjectURL(blob);
+  const a = document.createElement('a');
+  a.href = url;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  document.body.removeChild(a);
+  // Revoke after the click; the download keeps its own reference
+  setTimeout(() => URL.revokeObjectURL(url), 1000);
+}
@@ -0,0 +1,271 @@
+/**
+ * Export scene shared by the WorkflowCanvas and FunnelCanvas image export.
+ *
+ * A canvas serializes its board once into a flat list of primitives
+ * (`ExportScene`, plain data so it can be posted to a worker). From there
+ * `renderSvg` streams the markup as Blob parts and `renderPng` paints the
+ * scene onto canvas tiles – as a single canvas when the output fits the
+ * browser limits, otherwise strip by strip into a streaming PNG encoder.
+ * Both report progress and stop at the next checkpoint when cancelled.
+ */
+
+import { createPngWriter } from './pngEncoder';
+
+// ─── Scene ──────────────────────────────────────────────────────────────────
+
+export type SceneShape =
+  | { kind: 'rect'; x: number; y: number; w: number; h: number; rx?: number; fill?: string; stroke?: string; strokeWidth?: number; dash?: number[] }
+  | { kind: 'circle'; cx: number; cy: number; r: number; fill: string }
+  | { kind: 'text'; x: number; y: number; text: string; size: number; weight?: number; fill: string; anchor?: 'start' | 'middle' }
+  | { kind: 'path'; d: string; stroke: string; strokeWidth: number; opacity?: number; dash?: number[] };
+
+export interface ExportScene {
+  /** Exported area in board coordinates */
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  background: string;
+  shapes: SceneShape[];
+}
+
+export interface RenderControl {
+  onProgress?: (done: number, total: number) => void;
+  /** Polled at checkpoints; a true result aborts with an AbortError */
+  isCancelled?: () => boolean;
+}
+
+/** Largest canvas edge / area we render in one piece (below all major browser limits) */
+export const MAX_CANVAS_EDGE = 8192;
+export const MAX_CANVAS_AREA = 8192 * 8192;
+const TILE = 4096;
+/** Rows per encoded strip – bounds the pixel buffers to width × STRIP */
+const STRIP = 512;
+const SHAPES_PER_CHECKPOINT = 2000;
+
+/** Bounds covering all items plus padding */
+export function sceneBounds(items: readonly { x: number; y: number; w: number; h: number }[], pad: number) {
+  let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+  for (const i of items) {
+    if (i.x < minX) minX = i.x;
+    if (i.y < minY) minY = i.y;
+    if (i.x + i.w > maxX) maxX = i.x + i.w;
+    if (i.y + i.h > maxY) maxY = i.y + i.h;
+  }
+  if (minX === Infinity) return { x: 0, y: 0, width: pad * 2, height: pad * 2 };
+  return { x: minX - pad, y: minY - pad, width: maxX - minX + pad * 2, height: maxY - minY + pad * 2 };
+}
+
+// ─── Checkpoints ────────────────────────────────────────────────────────────
+
+/** Yields to the event loop so cancel messages and progress posts get through */
+const nextTask = () => new Promise<void>(resolve => setTimeout(resolve, 0));
+
+async function checkpoint(control: RenderControl, done: number, total: number) {
+  control.onProgress?.(done, total);
+  await nextTask();
+  if (control.isCancelled?.()) throw new DOMException('Export cancelled', 'AbortError');
+}
+
+// ─── SVG ────────────────────────────────────────────────────────────────────
+
+const escapeXml = (s: string) => s.replace(/[&<>"]/g, c => (c === '&' ? '&amp;' : c === '<' ? '&lt;' : c === '>' ? '&gt;' : '&quot;'));
+
+function shapeToSvg(s: SceneShape): string {
+  switch (s.kind) {
+    case 'rect': {
+      const dash = s.dash ? ` stroke-dasharray="${s.dash.join(',')}"` : '';
+      const stroke = s.stroke ? ` stroke="${s.stroke}" stroke-width="${s.strokeWidth ?? 1}"` : '';
+      return `<rect x="${s.x}" y="${s.y}" width="${s.w}" height="${s.h}" rx="${s.rx ?? 0}" fill="${s.fill ?? 'none'}"${stroke}${dash} />`;
+    }
+    case 'circle':
+      return `<circle cx="${s.cx}" cy="${s.cy}" r="${s.r}" fill="${s.fill}" />`;
+    case 'text': {
+      const anchor = s.anchor === 'middle' ? ' text-anchor="middle"' : '';
+      const weight = s.weight ? ` font-weight="${s.weight}"` : '';
+      return `<text x="${s.x}" y="${s.y}" font-family="sans-serif" font-size="${s.size}"${weight} fill="${s.fill}"${anchor}>${escapeXml(s.text)}</text>`;
+    }
+    case 'path': {
+      const dash = s.dash ? ` stroke-dasharray="${s.dash.join(',')}"` : '';
+      return `<path d="${s.d}" stroke="${s.stroke}" stroke-width="${s.strokeWidth}" fill="none" opacity="${s.opacity ?? 1}"${dash} />`;
+    }
+  }
+}
+
+/** Serializes the scene as Blob parts, one part per checkpoint batch */
+export async function renderSvg(scene: ExportScene, scale: number, control: RenderControl = {}): Promise<Blob> {
+  const { x, y, width, height, shapes } = scene;
+  const parts: string[] = [
+    `<svg xmlns="http://www.w3.org/2000/svg" width="${width * scale}" height="${height * scale}" viewBox="${x} ${y} ${width} ${height}">`,
+    `<rect x="${x}" y="${y}" width="${width}" height="${height}" fill="${scene.background}" />`,
+  ];
+  for (let start = 0; start < shapes.length; start += SHAPES_PER_CHECKPOINT) {
+    const end = Math.min(shapes.length, start + SHAPES_PER_CHECKPOINT);
+    let batch = '';
+    for (let i = start; i < end; i++) batch += shapeToSvg(shapes[i]);
+    parts.push(batch);
+    await checkpoint(control, end, shapes.length);
+  }
+  parts.push('</svg>');
+  return new Blob(parts, { type: 'image/svg+xml;charset=utf-8' });
+}
+
+// ─── Canvas ─────────────────────────────────────────────────────────────────
+
+type Context2D = CanvasRenderingContext2D | OffscreenCanvasRenderingContext2D;
+type AnyCanvas = HTMLCanvasElement | OffscreenCanvas;
+
+function createCanvas(width: number, height: number): AnyCanvas {
+  if (typeof OffscreenCanvas !== 'undefined') return new OffscreenCanvas(width, height);
+  const canvas = document.createElement('canvas');
+  canvas.width = width;
+  canvas.height = height;
+  return canvas;
+}
+
+function getContext(canvas: AnyCanvas): Context2D {
+  // OffscreenCanvas is the one with convertToBlob; instanceof HTMLCanvasElement would throw in the export worker
+  if ('convertToBlob' in canvas) {
+    const ctx = canvas.getContext('2d');
+    if (!ctx) throw new Error('2D canvas context unavailable');
+    return ctx;
+  }
+  const ctx = canvas.getContext('2d');
+  if (!ctx) throw new Error('2D canvas context unavailable');
+  return ctx;
+}
+
+function canvasToBlob(canvas: AnyCanvas): Promise<Blob> {
+  if ('convertToBlob' in canvas) return canvas.convertToBlob({ type: 'image/png' });
+  return new Promise((resolve, reject) => canvas.toBlob(b => (b ? resolve(b) : reject(new Error('PNG encoding failed'))), 'image/png'));
+}
+
+/** Rough board-space bounds used to skip shapes outside a tile */
+function shapeBox(s: SceneShape): [number, number, number, number] | null {
+  switch (s.kind) {
+    case 'rect': return [s.x - 2, s.y - 2, s.w + 4, s.h + 4];
+    case 'circle': return [s.cx - s.r, s.cy - s.r, s.r * 2, s.r * 2];
+    case 'text': {
+      const w = s.text.length * s.size * 0.7;
+      return [s.anchor === 'middle' ? s.x - w / 2 : s.x, s.y - s.size * 1.2, w, s.size * 1.6];
+    }
+    case 'path': return null;
+  }
+}
+
+function paintShape(ctx: Context2D, s: SceneShape) {
+  switch (s.kind) {
+    case 'rect': {
+      ctx.beginPath();
+      ctx.roundRect(s.x, s.y, s.w, s.h, s.rx ?? 0);
+      if (s.fill) { ctx.fillStyle = s.fill; ctx.fill(); }
+      if (s.stroke) {
+        ctx.setLineDash(s.dash ?? []);
+        ctx.lineWidth = s.strokeWidth ?? 1;
+        ctx.strokeStyle = s.stroke;
+        ctx.stroke();
+      }
+      break;
+    }
+    case 'circle':
+      ctx.beginPath();
+      ctx.arc(s.cx, s.cy, s.r, 0, Math.PI * 2);
+      ctx.fillStyle = s.fill;
+      ctx.fill();
+      break;
+    case 'text':
+      ctx.font = `${s.weight ?? 400} ${s.size}px sans-serif`;
+      ctx.textAlign = s.anchor === 'middle' ? 'center' : 'left';
+      ctx.textBaseline = 'alphabetic';
+      ctx.fillStyle = s.fill;
+      ctx.fillText(s.text, s.x, s.y);
+      break;
+    case 'path':
+      ctx.save();
+      ctx.globalAlpha = s.opacity ?? 1;
+      ctx.setLineDash(s.dash ?? []);
+      ctx.lineWidth = s.strokeWidth;
+      ctx.strokeStyle = s.stroke;
+      ctx.stroke(new Path2D(s.d));
+      ctx.restore();
+      break;
+  }
+}
+
+/**
+ * Paints the part of the scene covering the pixel rect (px, py, pw, ph) of
+ * the scaled output. Returns the number of shapes drawn.
+ */
+function paintTile(ctx: Context2D, scene: ExportScene, scale: number, px: number, py: number, pw: number, ph: number) {
+  ctx.setTransform(1, 0, 0, 1, 0, 0);
+  ctx.fillStyle = scene.background;
+  ctx.fillRect(0, 0, pw, ph);
+  ctx.setTransform(scale, 0, 0, scale, -px - scene.x * scale, -py - scene.y * scale);
+
+  // Tile in board coordinates
+  const tx = scene.x + px / scale, ty = scene.y + py / scale, tw = pw / scale, th = ph / scale;
+  for (const s of scene.shapes) {
+    const box = shapeBox(s);
+    if (box && (box[0] > tx + tw || box[0] + box[2] < tx || box[1] > ty + th || box[1] + box[3] < ty)) continue;
+    paintShape(ctx, s);
+  }
+}
+
+/** Output size in pixels for the requested scale */
+export function pngSize(scene: ExportScene, scale: number) {
+  return { width: Math.max(1, Math.ceil(scene.width * scale)), height: Math.max(1, Math.ceil(scene.height * scale)) };
+}
+
+/**
+ * Rasterizes the scene. Fits-in-one-canvas exports use the native encoder;
+ * larger ones are rendered in TILE-wide, STRIP-tall pieces and streamed row
+ * by row into a PNG encoder, so neither the output size nor peak memory is
+ * bound by the export size.
+ */
+export async function renderPng(scene: ExportScene, scale: number, control: RenderControl = {}): Promise<Blob> {
+  const { width, height } = pngSize(scene, scale);
+
+  if (width <= MAX_CANVAS_EDGE && height <= MAX_CANVAS_EDGE && width * height <= MAX_CANVAS_AREA) {
+    const canvas = createCanvas(width, height);
+    paintTile(getContext(canvas), scene, scale, 0, 0, width, height);
+    await checkpoint(control, 1, 2);
+    const blob = await canvasToBlob(canvas);
+    control.onProgress?.(2, 2);
+    return blob;
+  }
+
+  if (typeof CompressionStream === 'undefined') {
+    // No streaming encoder available – fall back to the largest single canvas that fits
+    const fit = Math.min(MAX_CANVAS_EDGE / width, MAX_CANVAS_EDGE / height, Math.sqrt(MAX_CANVAS_AREA / (width * height)));
+    return renderPng(scene, scale * fit * 0.999, control);
+  }
+
+  const png = createPngWriter(width, height);
+  const cols = Math.ceil(width / TILE);
+  const strips = Math.ceil(height / STRIP);
+  const tile = createCanvas(Math.min(TILE, width), Math.min(STRIP, height));
+  const ctx = getContext(tile);
+  // One buffer for all strips; the encoder copies rows out before the next strip
+  const strip = new Uint8ClampedArray(width * Math.min(STRIP, height) * 4);
+  try {
+    for (let sy = 0; sy < strips; sy++) {
+      const py = sy * STRIP;
+      const rows = Math.min(STRIP, height - py);
+      for (let sx = 0; sx < cols; sx++) {
+        const px = sx * TILE;
+        const cw = Math.min(TILE, width - px);
+        paintTile(ctx, scene, scale, px, py, cw, rows);
+        const data = ctx.getImageData(0, 0, cw, rows).data;
+        for (let r = 0; r < rows; r++) {
+          strip.set(data.subarray(r * cw * 4, (r + 1) * cw * 4), (r * width + px) * 4);
+        }
+        await checkpoint(control, sy * cols + sx + 1, strips * cols);
+      }
+      await png.writeRows(strip, rows);
+    }
+    return await png.finish();
+  } catch (e) {
+    png.abort();
+    throw e;
+  }
+}
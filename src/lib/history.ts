@@ -0,0 +1,208 @@
+/**
+ * Undo/redo history engine shared by WorkflowCanvas and FunnelCanvas.
+ *
+ * Snapshots are plain objects of immutable arrays (`{ nodes, connections, … }`).
+ * They are stored by reference, so consecutive entries share every array and
+ * item that did not change. The undo side is a fixed-capacity ring buffer
+ * (O(1) push/undo, oldest entry evicted first), the redo side a plain stack.
+ * Memory is bounded by an entry budget and an estimated byte budget.
+ */
+
+export interface HistoryOptions<S extends object> {
+  /** Maximum number of undo entries (ring buffer capacity) */
+  maxEntries?: number;
+  /** Approximate byte budget for undo + redo entries */
+  maxBytes?: number;
+  /** Pushes with the same coalesce key within this window become one entry */
+  coalesceMs?: number;
+  /** Byte estimate for `snapshot`, given the previous newest entry */
+  sizeOf?: (snapshot: S, prev: S | undefined) => number;
+}
+
+export interface History<S extends object> {
+  /** Records `snapshot` (the state *before* an edit) and clears redo */
+  push(snapshot: S, coalesceKey?: string): void;
+  /** Starts a continuous gesture (drag/resize); the pre-gesture state is kept pending */
+  begin(snapshot: S): void;
+  /** Ends the gesture: pushes the pending snapshot once if `current` differs from it */
+  commit(current: S): boolean;
+  /** Returns the state to restore; `current` moves onto the redo stack */
+  undo(current: S): S | null;
+  redo(current: S): S | null;
+  /** Restores entry `index` (0 = oldest); later entries and `current` become redo */
+  jumpTo(index: number, current: S): S | null;
+  clear(): void;
+  /** Undo entries, oldest first */
+  entries(): S[];
+  readonly undoCount: number;
+  readonly redoCount: number;
+  readonly bytes: number;
+}
+
+interface Slot<S extends object> {
+  snap: S;
+  bytes: number;
+}
+
+const DEFAULT_MAX_ENTRIES = 100;
+const DEFAULT_MAX_BYTES = 8 * 1024 * 1024;
+const DEFAULT_COALESCE_MS = 800;
+/** Rough heap cost of one changed canvas item (object + a few strings) */
+const ITEM_BYTES = 320;
+const SLOT_BYTES = 8;
+
+/**
+ * Default size estimate: arrays shared with the previous entry are free,
+ * changed arrays cost their slots plus every item not shared by reference.
+ */
+export function estimateSnapshotBytes<S extends object>(snapshot: S, prev: S | undefined): number {
+  let bytes = 64;
+  const cur = snapshot as Record<string, unknown>;
+  const old = prev as Record<string, unknown> | undefined;
+  for (const key of Object.keys(cur)) {
+    const arr = cur[key];
+    if (!Array.isArray(arr)) continue;
+    const prevArr = old?.[key];
+    if (prevArr === arr) continue;
+    bytes += arr.length * SLOT_BYTES;
+    if (!Array.isArray(prevArr)) { bytes += arr.length * ITEM_BYTES; continue; }
+    for (let i = 0; i < arr.length; i++) {
+      if (arr[i] !== prevArr[i]) bytes += ITEM_BYTES;
+    }
+  }
+  return bytes;
+}
+
+/** True if any top-level field of the two snapshots differs by reference */
+function changed<S extends object>(a: S, b: S): boolean {
+  const ra = a as Record<string, unknown>, rb = b as Record<string, unknown>;
+  for (const key of Object.keys(ra)) if (ra[key] !== rb[key]) return true;
+  return false;
+}
+
+export function createHistory<S extends object>(options: HistoryOptions<S> = {}): History<S> {
+  const cap = Math.max(1, options.maxEntries ?? DEFAULT_MAX_ENTRIES);
+  const maxBytes = options.maxBytes ?? DEFAULT_MAX_BYTES;
+  const coalesceMs = options.coalesceMs ?? DEFAULT_COALESCE_MS;
+  const sizeOf = options.sizeOf ?? estimateSnapshotBytes;
+
+  const ring: (Slot<S> | undefined)[] = new Array(cap);
+  let start = 0;
+  let count = 0;
+  let redo: Slot<S>[] = [];
+  let bytes = 0;
+  let pending: S | null = null;
+  let lastKey: string | undefined;
+  let lastAt = 0;
+
+  const newest = () => (count > 0 ? ring[(start + count - 1) % cap] : undefined);
+
+  const evictOldest = () => {
+    const slot = ring[start];
+    ring[start] = undefined;
+    start = (start + 1) % cap;
+    count--;
+    if (slot) bytes -= slot.bytes;
+  };
+
+  const pushUndo = (slot: Slot<S>) => {
+    if (count === cap) evictOldest();
+    ring[(start + count) % cap] = slot;
+    count++;
+    bytes += slot.bytes;
+    while (bytes > maxBytes && count > 1) evictOldest();
+  };
+
+  const popUndo = (): Slot<S> | undefined => {
+    if (count === 0) return undefined;
+    const idx = (start + count - 1) % cap;
+    const slot = ring[idx];
+    ring[idx] = undefined;
+    count--;
+    return slot;
+  };
+
+  const clearRedo = () => {
+    for (const slot of redo) bytes -= slot.bytes;
+    redo = [];
+  };
+
+  const push = (snapshot: S, coalesceKey?: string) => {
+    const now = Date.now();
+    const coalesce = coalesceKey !== undefined && coalesceKey === lastKey && now - lastAt < coalesceMs && count > 0;
+    lastKey = coalesceKey;
+    lastAt = now;
+    clearRedo();
+    // Same gesture (e.g. repeated arrow-key nudges): keep the first pre-state
+    if (coalesce) return;
+    pushUndo({ snap: snapshot, bytes: sizeOf(snapshot, newest()?.snap) });
+  };
+
+  const undo = (current: S): S | null => {
+    const slot = popUndo();
+    if (!slot) return null;
+    // The redo entry differs from the popped one by a single step → reuse its
+    // estimate, so the byte total is unchanged
+    redo.push({ snap: current, bytes: slot.bytes });
+    lastKey = undefined;
+    return slot.snap;
+  };
+
+  return {
+    push,
+
+    begin(snapshot) {
+      pending = snapshot;
+    },
+
+    commit(current) {
+      const pre = pending;
+      pending = null;
+      if (pre === null || !changed(pre, current)) return false;
+      push(pre);
+      return true;
+    },
+
+    undo,
+
+    redo(current) {
+      const slot = redo.pop();
+      if (!slot) return null;
+      bytes -= slot.bytes;
+      pushUndo({ snap: current, bytes: slot.bytes });
+      lastKey = undefined;
+      return slot.snap;
+    },
+
+    jumpTo(index, current) {
+      if (index < 0 || index >= count) return null;
+      let state = current;
+      while (count > index) {
+        const prev = undo(state);
+        if (prev === null) break;
+        state = prev;
+      }
+      return state;
+    },
+
+    clear() {
+      for (let i = 0; i < cap; i++) ring[i] = undefined;
+      start = 0;
+      count = 0;
+      redo = [];
+      bytes = 0;
+      pending = null;
+      lastKey = undefined;
+    },
+
+    entries() {
+      const out: S[] = [];
+      for (let i = 0; i < count; i++) out.push(ring[(start + i) % cap]!.snap);
+      return out;
+    },
+
+    get undoCount() { return count; },
+    get redoCount() { return redo.length; },
+    get bytes() { return bytes; },
+  };
+}
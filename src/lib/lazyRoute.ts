@@ -0,0 +1,32 @@
+/**
+ * Lazy route components with an explicit preload hook.
+ *
+ * `lazyWithPreload` wraps `React.lazy` and exposes the same import promise as
+ * `preload()`, so a route chunk can be fetched ahead of navigation (link
+ * hover/focus) and the later render resolves from the cached module. A failed
+ * import is forgotten so the next attempt retries instead of replaying the
+ * error.
+ */
+
+import { lazy } from 'react';
+import type { ComponentType, LazyExoticComponent } from 'react';
+
+export type PreloadableComponent<P extends object> = LazyExoticComponent<ComponentType<P>> & {
+  preload: () => Promise<{ default: ComponentType<P> }>;
+};
+
+export function lazyWithPreload<P extends object>(
+  factory: () => Promise<{ default: ComponentType<P> }>,
+): PreloadableComponent<P> {
+  let pending: Promise<{ default: ComponentType<P> }> | null = null;
+  const load = () => {
+    if (!pending) {
+      pending = factory().catch(err => {
+        pending = null;
+        throw err;
+      });
+    }
+    return pending;
+  };
+  return Object.assign(lazy(load), { preload: load });
+}
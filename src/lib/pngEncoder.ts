@@ -0,0 +1,90 @@
+/**
+ * Streaming PNG encoder (8-bit RGBA, no interlace).
+ *
+ * Rows are Sub-filtered and deflated through `CompressionStream('deflate')`
+ * (zlib format, which is exactly what IDAT expects), so arbitrarily tall
+ * images can be written strip by strip without holding the full bitmap.
+ */
+
+const SIGNATURE = new Uint8Array([137, 80, 78, 71, 13, 10, 26, 10]);
+
+let crcTable: Uint32Array | null = null;
+
+function crc32(bytes: Uint8Array, start: number, end: number): number {
+  if (!crcTable) {
+    crcTable = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+      let c = n;
+      for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+      crcTable[n] = c >>> 0;
+    }
+  }
+  let crc = 0xffffffff;
+  for (let i = start; i < end; i++) crc = crcTable[(crc ^ bytes[i]) & 0xff] ^ (crc >>> 8);
+  return (crc ^ 0xffffffff) >>> 0;
+}
+
+function chunk(type: string, data: Uint8Array): Uint8Array {
+  const out = new Uint8Array(12 + data.length);
+  const view = new DataView(out.buffer);
+  view.setUint32(0, data.length);
+  for (let i = 0; i < 4; i++) out[4 + i] = type.charCodeAt(i);
+  out.set(data, 8);
+  view.setUint32(8 + data.length, crc32(out, 4, 8 + data.length));
+  return out;
+}
+
+export interface PngWriter {
+  /** Appends `rows` rows of RGBA pixels (`width * 4` bytes each) */
+  writeRows(rgba: Uint8ClampedArray, rows: number): Promise<void>;
+  finish(): Promise<Blob>;
+  abort(): void;
+}
+
+export function createPngWriter(width: number, height: number): PngWriter {
+  const header = new Uint8Array(13);
+  const view = new DataView(header.buffer);
+  view.setUint32(0, width);
+  view.setUint32(4, height);
+  header[8] = 8;  // bit depth
+  header[9] = 6;  // RGBA
+  const parts: BlobPart[] = [SIGNATURE, chunk('IHDR', header)];
+
+  const stream = new CompressionStream('deflate');
+  const writer = stream.writable.getWriter();
+  // Drain compressed output concurrently, otherwise backpressure stalls the writer
+  const draining = (async () => {
+    const reader = stream.readable.getReader();
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      parts.push(chunk('IDAT', value));
+    }
+  })();
+
+  const stride = width * 4;
+  return {
+    async writeRows(rgba, rows) {
+      const out = new Uint8Array(rows * (stride + 1));
+      for (let r = 0; r < rows; r++) {
+        const src = r * stride, dst = r * (stride + 1);
+        out[dst] = 1; // Sub filter: difference to the pixel on the left
+        for (let i = 0; i < 4 && i < stride; i++) out[dst + 1 + i] = rgba[src + i];
+        for (let i = 4; i < stride; i++) out[dst + 1 + i] = rgba[src + i] - rgba[src + i - 4];
+      }
+      await writer.write(out);
+    },
+
+    async finish() {
+      await writer.close();
+      await draining;
+      parts.push(chunk('IEND', new Uint8Array(0)));
+      return new Blob(parts, { type: 'image/png' });
+    },
+
+    abort() {
+      writer.abort().catch(() => {});
+      draining.catch(() => {});
+    },
+  };
+}
@@ -0,0 +1,297 @@
+/**
+ * Dependency-aware scheduler shared by the execution mock, the WorkflowCanvas
+ * run animation and both auto-layouts.
+ *
+ * `buildDag` indexes the graph once (CSR adjacency, Kahn topological order,
+ * longest-path layers), so a node always lands after *all* of its
+ * predecessors. Cycles are broken deterministically: when no node is ready,
+ * the first unplaced node in input order is forced and its remaining incoming
+ * edges are dropped. `planSchedule` runs a list-scheduling simulation on top
+ * (critical-path-first, optional parallelism limit) and reports per-node
+ * timing, critical path and speedup. Everything is O(V + E log V).
+ */
+
+export interface DagEdge { from: string; to: string }
+
+export interface Dag {
+  /** Node ids in topological order */
+  readonly ids: readonly string[];
+  /** id → position in `ids` */
+  readonly indexOf: ReadonlyMap<string, number>;
+  /** Longest-path depth per position (0 for roots) */
+  readonly layer: Int32Array;
+  readonly layerCount: number;
+  /** CSR successors per position: `succ[succStart[i] .. succStart[i + 1])` */
+  readonly succStart: Int32Array;
+  readonly succ: Int32Array;
+  /** Number of incoming (forward) edges per position */
+  readonly predCount: Int32Array;
+  /** Edges dropped to break cycles */
+  readonly brokenEdges: number;
+}
+
+export interface DagOptions {
+  /**
+   * Nodes that always start a run (e.g. triggers). Edges pointing into them
+   * are treated as loop-backs and ignored for ordering.
+   */
+  isRoot?: (id: string) => boolean;
+}
+
+export function buildDag(nodeIds: readonly string[], edges: readonly DagEdge[], options: DagOptions = {}): Dag {
+  // Input indices (duplicates ignored)
+  const input: string[] = [];
+  const inputIndex = new Map<string, number>();
+  for (const id of nodeIds) {
+    if (!inputIndex.has(id)) { inputIndex.set(id, input.length); input.push(id); }
+  }
+  const n = input.length;
+  const root = new Uint8Array(n);
+  if (options.isRoot) for (let i = 0; i < n; i++) if (options.isRoot(input[i])) root[i] = 1;
+
+  // Adjacency on input indices
+  const from: number[] = [];
+  const to: number[] = [];
+  const outCount = new Int32Array(n + 1);
+  for (const e of edges) {
+    const a = inputIndex.get(e.from), b = inputIndex.get(e.to);
+    if (a === undefined || b === undefined || a === b || root[b]) continue;
+    from.push(a); to.push(b);
+    outCount[a + 1]++;
+  }
+  const outStart = new Int32Array(n + 1);
+  for (let i = 0; i < n; i++) outStart[i + 1] = outStart[i] + outCount[i + 1];
+  const out = new Int32Array(from.length);
+  const fill = outStart.slice(0, n);
+  const indeg = new Int32Array(n);
+  for (let k = 0; k < from.length; k++) { out[fill[from[k]]++] = to[k]; indeg[to[k]]++; }
+
+  // Kahn with an index-pointer queue; force the next unplaced node on cycles
+  const queue = new Int32Array(n);
+  let head = 0, tail = 0;
+  const queued = new Uint8Array(n);
+  const placed = new Uint8Array(n);
+  const depth = new Int32Array(n);
+  for (let i = 0; i < n; i++) if (indeg[i] === 0) { queue[tail++] = i; queued[i] = 1; }
+
+  const order: number[] = [];
+  let scan = 0;
+  let brokenEdges = 0;
+  while (order.length < n) {
+    if (head === tail) {
+      while (queued[scan]) scan++;
+      queue[tail++] = scan;
+      queued[scan] = 1;
+    }
+    const u = queue[head++];
+    placed[u] = 1;
+    order.push(u);
+    for (let k = outStart[u]; k < outStart[u + 1]; k++) {
+      const v = out[k];
+      if (placed[v]) { brokenEdges++; continue; }
+      if (depth[u] + 1 > depth[v]) depth[v] = depth[u] + 1;
+      if (--indeg[v] === 0 && !queued[v]) { queue[tail++] = v; queued[v] = 1; }
+    }
+  }
+
+  // Re-index everything by topological position, forward edges only
+  const pos = new Int32Array(n);
+  order.forEach((u, p) => { pos[u] = p; });
+  const ids = order.map(u => input[u]);
+  const layer = new Int32Array(n);
+  const succStart = new Int32Array(n + 1);
+  const predCount = new Int32Array(n);
+  let layerCount = 0;
+  for (let p = 0; p < n; p++) {
+    const u = order[p];
+    layer[p] = depth[u];
+    if (depth[u] + 1 > layerCount) layerCount = depth[u] + 1;
+    let count = 0;
+    for (let k = outStart[u]; k < outStart[u + 1]; k++) if (pos[out[k]] > p) count++;
+    succStart[p + 1] = succStart[p] + count;
+  }
+  const succ = new Int32Array(succStart[n]);
+  for (let p = 0; p < n; p++) {
+    const u = order[p];
+    let w = succStart[p];
+    for (let k = outStart[u]; k < outStart[u + 1]; k++) {
+      const q = pos[out[k]];
+      if (q > p) { succ[w++] = q; predCount[q]++; }
+    }
+  }
+
+  const indexOf = new Map<string, number>();
+  ids.forEach((id, p) => indexOf.set(id, p));
+  return { ids, indexOf, layer, layerCount, succStart, succ, predCount, brokenEdges };
+}
+
+/** Groups node ids by layer, each layer in topological order */
+export function dagLayers(dag: Dag): string[][] {
+  const layers: string[][] = Array.from({ length: dag.layerCount }, () => []);
+  dag.ids.forEach((id, p) => layers[dag.layer[p]].push(id));
+  return layers;
+}
+
+// ─── Timing ─────────────────────────────────────────────────────────────────
+
+export interface ScheduleSummary {
+  /** Wall time from first start to last end */
+  makespan: number;
+  /** Sum of all node durations (= sequential run time) */
+  totalWork: number;
+  /** Longest dependency chain by duration, root first */
+  criticalPath: string[];
+  criticalPathLength: number;
+  /** totalWork / makespan */
+  speedup: number;
+}
+
+export interface ScheduledNode {
+  nodeId: string;
+  layer: number;
+  start: number;
+  end: number;
+}
+
+export interface Schedule extends ScheduleSummary {
+  /** Sorted by start time */
+  nodes: ScheduledNode[];
+}
+
+export interface ScheduleOptions {
+  /** Duration per node; default 1 */
+  duration?: (id: string) => number;
+  /** Max. nodes running at once; default unlimited */
+  parallelism?: number;
+}
+
+/** Longest remaining path (incl. own duration) per position */
+function bottomLevels(dag: Dag, dur: Float64Array): Float64Array {
+  const n = dag.ids.length;
+  const bl = new Float64Array(n);
+  for (let p = n - 1; p >= 0; p--) {
+    let best = 0;
+    for (let k = dag.succStart[p]; k < dag.succStart[p + 1]; k++) {
+      if (bl[dag.succ[k]] > best) best = bl[dag.succ[k]];
+    }
+    bl[p] = dur[p] + best;
+  }
+  return bl;
+}
+
+function summarize(dag: Dag, dur: Float64Array, makespan: number): ScheduleSummary {
+  const n = dag.ids.length;
+  const bl = bottomLevels(dag, dur);
+  let totalWork = 0;
+  let cur = -1;
+  for (let p = 0; p < n; p++) {
+    totalWork += dur[p];
+    if (dag.predCount[p] === 0 && (cur === -1 || bl[p] > bl[cur])) cur = p;
+  }
+  const criticalPath: string[] = [];
+  const criticalPathLength = cur === -1 ? 0 : bl[cur];
+  while (cur !== -1) {
+    criticalPath.push(dag.ids[cur]);
+    let next = -1;
+    for (let k = dag.succStart[cur]; k < dag.succStart[cur + 1]; k++) {
+      if (next === -1 || bl[dag.succ[k]] > bl[next]) next = dag.succ[k];
+    }
+    cur = next;
+  }
+  return { makespan, totalWork, criticalPath, criticalPathLength, speedup: makespan > 0 ? totalWork / makespan : 1 };
+}
+
+/** Binary min-heap over positions with a custom "a before b" comparator */
+function createHeap(before: (a: number, b: number) => boolean) {
+  const items: number[] = [];
+  return {
+    get size() { return items.length; },
+    peek: () => items[0],
+    push(x: number) {
+      let i = items.push(x) - 1;
+      while (i > 0) {
+        const parent = (i - 1) >> 1;
+        if (!before(items[i], items[parent])) break;
+        [items[i], items[parent]] = [items[parent], items[i]];
+        i = parent;
+      }
+    },
+    pop(): number {
+      const top = items[0];
+      const last = items.pop()!;
+      if (items.length > 0) {
+        items[0] = last;
+        let i = 0;
+        for (;;) {
+          const l = 2 * i + 1, r = l + 1;
+          let m = i;
+          if (l < items.length && before(items[l], items[m])) m = l;
+          if (r < items.length && before(items[r], items[m])) m = r;
+          if (m === i) break;
+          [items[i], items[m]] = [items[m], items[i]];
+          i = m;
+        }
+      }
+      return top;
+    },
+  };
+}
+
+/**
+ * Simulates a run: a node starts once all predecessors have finished and a
+ * slot is free; among ready nodes the one with the longest remaining chain
+ * goes first.
+ */
+export function planSchedule(dag: Dag, options: ScheduleOptions = {}): Schedule {
+  const n = dag.ids.length;
+  const limit = Math.max(1, options.parallelism ?? Infinity);
+  const dur = new Float64Array(n);
+  for (let p = 0; p < n; p++) dur[p] = Math.max(0, options.duration?.(dag.ids[p]) ?? 1);
+  const bl = bottomLevels(dag, dur);
+
+  const start = new Float64Array(n);
+  const end = new Float64Array(n);
+  const waiting = dag.predCount.slice();
+  const ready = createHeap((a, b) => bl[a] > bl[b] || (bl[a] === bl[b] && a < b));
+  const running = createHeap((a, b) => end[a] < end[b] || (end[a] === end[b] && a < b));
+  for (let p = 0; p < n; p++) if (waiting[p] === 0) ready.push(p);
+
+  let time = 0;
+  let makespan = 0;
+  for (;;) {
+    while (ready.size > 0 && running.size < limit) {
+      const p = ready.pop();
+      start[p] = time;
+      end[p] = time + dur[p];
+      running.push(p);
+    }
+    if (running.size === 0) break;
+    time = end[running.peek()];
+    while (running.size > 0 && end[running.peek()] === time) {
+      const p = running.pop();
+      if (end[p] > makespan) makespan = end[p];
+      for (let k = dag.succStart[p]; k < dag.succStart[p + 1]; k++) {
+        if (--waiting[dag.succ[k]] === 0) ready.push(dag.succ[k]);
+      }
+    }
+  }
+
+  const nodes: ScheduledNode[] = dag.ids.map((nodeId, p) => ({ nodeId, layer: dag.layer[p], start: start[p], end: end[p] }));
+  nodes.sort((a, b) => a.start - b.start || a.layer - b.layer);
+  return { ...summarize(dag, dur, makespan), nodes };
+}
+
+/** Critical path and speedup from measured start/end times of a finished run */
+export function analyzeRun(dag: Dag, timing: (id: string) => { start: number; end: number } | undefined): ScheduleSummary {
+  const n = dag.ids.length;
+  const dur = new Float64Array(n);
+  let first = Infinity, last = -Infinity;
+  for (let p = 0; p < n; p++) {
+    const t = timing(dag.ids[p]);
+    if (!t) continue;
+    dur[p] = Math.max(0, t.end - t.start);
+    if (t.start < first) first = t.start;
+    if (t.end > last) last = t.end;
+  }
+  return summarize(dag, dur, last > first ? last - first : 0);
+}
@@ -0,0 +1,261 @@
+/**
+ * Spatial index shared by WorkflowCanvas and FunnelCanvas.
+ *
+ * Uniform grid keyed on the x/y/w/h of canvas items (nodes, elements,
+ * stickies, groups/phases). `sync` re-buckets only items whose source
+ * object changed, so one drag frame touches a handful of cells instead of
+ * rebuilding and sorting the full item list. Used for snap-line lookup,
+ * equal-spacing neighbours, lasso selection and context-menu hit-testing.
+ */
+
+import type { Rect } from './viewport';
+
+export interface CanvasItem { id: string; x: number; y: number; w: number; h: number }
+
+export interface IndexedItem extends CanvasItem {
+  /** Item category, e.g. 'node' | 'sticky' | 'group' */
+  kind: string;
+}
+
+export interface SpatialIndex {
+  /**
+   * Brings all items of `kind` in line with `list`. Items whose source object
+   * is referentially unchanged are skipped; missing ones are removed.
+   */
+  sync<T extends { id: string }>(kind: string, list: readonly T[], bounds: (item: T) => Rect): void;
+  /** Moves/inserts a single item (e.g. the one being dragged) */
+  upsert(kind: string, item: CanvasItem): void;
+  remove(kind: string, id: string): void;
+  /** All items intersecting the rect (the scan is clamped to occupied cells) */
+  query(rect: Rect, kinds?: readonly string[]): IndexedItem[];
+  /** Items containing the point (callers rank them, e.g. nodes above groups) */
+  hitTest(x: number, y: number, kinds?: readonly string[]): IndexedItem[];
+  readonly size: number;
+}
+
+interface Entry {
+  item: IndexedItem;
+  src: unknown;
+  c0x: number; c0y: number; c1x: number; c1y: number;
+}
+
+const CELL_SIZE = 256;
+/** Half-extent used for unbounded band queries (clamped to occupied cells) */
+const FAR = 1e9;
+
+export function createSpatialIndex(cellSize = CELL_SIZE): SpatialIndex {
+  const cells = new Map<string, Set<Entry>>();
+  const byKind = new Map<string, Map<string, Entry>>();
+  // Occupied cell range – grows only, reset when the index runs empty
+  const ext = { x0: Infinity, y0: Infinity, x1: -Infinity, y1: -Infinity };
+  let size = 0;
+
+  const cellOf = (v: number) => Math.floor(v / cellSize);
+
+  const link = (e: Entry) => {
+    for (let cx = e.c0x; cx <= e.c1x; cx++) {
+      for (let cy = e.c0y; cy <= e.c1y; cy++) {
+        const key = `${cx},${cy}`;
+        let cell = cells.get(key);
+        if (!cell) { cell = new Set(); cells.set(key, cell); }
+        cell.add(e);
+      }
+    }
+    if (e.c0x < ext.x0) ext.x0 = e.c0x;
+    if (e.c0y < ext.y0) ext.y0 = e.c0y;
+    if (e.c1x > ext.x1) ext.x1 = e.c1x;
+    if (e.c1y > ext.y1) ext.y1 = e.c1y;
+  };
+
+  const unlink = (e: Entry) => {
+    for (let cx = e.c0x; cx <= e.c1x; cx++) {
+      for (let cy = e.c0y; cy <= e.c1y; cy++) {
+        const key = `${cx},${cy}`;
+        const cell = cells.get(key);
+        if (!cell) continue;
+        cell.delete(e);
+        if (cell.size === 0) cells.delete(key);
+      }
+    }
+  };
+
+  const kindMap = (kind: string) => {
+    let m = byKind.get(kind);
+    if (!m) { m = new Map(); byKind.set(kind, m); }
+    return m;
+  };
+
+  const put = (kind: string, item: CanvasItem, src: unknown) => {
+    const m = kindMap(kind);
+    const c0x = cellOf(item.x), c0y = cellOf(item.y);
+    const c1x = cellOf(item.x + Math.max(0, item.w)), c1y = cellOf(item.y + Math.max(0, item.h));
+    const prev = m.get(item.id);
+    if (prev) {
+      prev.src = src;
+      prev.item = { ...item, kind };
+      // Same cells → only the stored bounds change
+      if (prev.c0x === c0x && prev.c0y === c0y && prev.c1x === c1x && prev.c1y === c1y) return;
+      unlink(prev);
+      prev.c0x = c0x; prev.c0y = c0y; prev.c1x = c1x; prev.c1y = c1y;
+      link(prev);
+      return;
+    }
+    const entry: Entry = { item: { ...item, kind }, src, c0x, c0y, c1x, c1y };
+    m.set(item.id, entry);
+    link(entry);
+    size++;
+  };
+
+  const drop = (kind: string, id: string) => {
+    const m = byKind.get(kind);
+    const e = m?.get(id);
+    if (!m || !e) return;
+    unlink(e);
+    m.delete(id);
+    size--;
+    if (size === 0) { ext.x0 = Infinity; ext.y0 = Infinity; ext.x1 = -Infinity; ext.y1 = -Infinity; }
+  };
+
+  const collect = (
+    x0: number, y0: number, x1: number, y1: number,
+    kinds: readonly string[] | undefined,
+    accept: (it: IndexedItem) => boolean,
+  ): IndexedItem[] => {
+    const cx0 = Math.max(ext.x0, cellOf(x0)), cy0 = Math.max(ext.y0, cellOf(y0));
+    const cx1 = Math.min(ext.x1, cellOf(x1)), cy1 = Math.min(ext.y1, cellOf(y1));
+    const seen = new Set<Entry>();
+    const out: IndexedItem[] = [];
+    for (let cx = cx0; cx <= cx1; cx++) {
+      for (let cy = cy0; cy <= cy1; cy++) {
+        const cell = cells.get(`${cx},${cy}`);
+        if (!cell) continue;
+        for (const e of cell) {
+          if (seen.has(e)) continue;
+          seen.add(e);
+          if (kinds && !kinds.includes(e.item.kind)) continue;
+          if (accept(e.item)) out.push(e.item);
+        }
+      }
+    }
+    return out;
+  };
+
+  return {
+    sync(kind, list, bounds) {
+      const m = kindMap(kind);
+      const live = new Set<string>();
+      for (const src of list) {
+        live.add(src.id);
+        if (m.get(src.id)?.src === src) continue;
+        const b = bounds(src);
+        put(kind, { id: src.id, x: b.x, y: b.y, w: b.w, h: b.h }, src);
+      }
+      if (m.size !== live.size) {
+        for (const id of [...m.keys()]) if (!live.has(id)) drop(kind, id);
+      }
+    },
+
+    upsert(kind, item) {
+      put(kind, item, null);
+    },
+
+    remove(kind, id) {
+      drop(kind, id);
+    },
+
+    query(rect, kinds) {
+      const x1 = rect.x + rect.w, y1 = rect.y + rect.h;
+      return collect(rect.x, rect.y, x1, y1, kinds, it =>
+        it.x <= x1 && it.x + it.w >= rect.x && it.y <= y1 && it.y + it.h >= rect.y);
+    },
+
+    hitTest(x, y, kinds) {
+      return collect(x, y, x, y, kinds, it =>
+        x >= it.x && x <= it.x + it.w && y >= it.y && y <= it.y + it.h);
+    },
+
+    get size() { return size; },
+  };
+}
+
+// ─── Snap Candidates ────────────────────────────────────────────────────────
+
+/**
+ * Items that can produce an alignment snap for a box at (x, y, w, h):
+ * everything overlapping the vertical band through the box (x-aligned)
+ * or the horizontal band (y-aligned), widened by `pad`.
+ */
+export function querySnapCandidates(
+  index: SpatialIndex,
+  x: number, y: number, w: number, h: number,
+  pad: number, excludeId: string, kinds?: readonly string[],
+): IndexedItem[] {
+  const vBand = index.query({ x: x - pad, y: -FAR, w: w + 2 * pad, h: 2 * FAR }, kinds);
+  const hBand = index.query({ x: -FAR, y: y - pad, w: 2 * FAR, h: h + 2 * pad }, kinds);
+  const out: IndexedItem[] = [];
+  const seen = new Set<string>();
+  for (const it of vBand.concat(hBand)) {
+    const key = `${it.kind}:${it.id}`;
+    if (it.id === excludeId || seen.has(key)) continue;
+    seen.add(key);
+    out.push(it);
+  }
+  return out;
+}
+
+// ─── Equal-Spacing Detection ────────────────────────────────────────────────
+
+export type EqGuide = { axis: 'x' | 'y'; segA: { from: number; to: number; cross: number }; segB: { from: number; to: number; cross: number }; dist: number };
+
+/**
+ * Snaps the dragged box so its gaps to the nearest left/right (top/bottom)
+ * neighbours are equal. Neighbours are looked up in the band around the
+ * box via the index and picked with a linear min-scan (no sorting).
+ */
+export function detectEqualSpacing(
+  index: SpatialIndex, dragId: string,
+  dx: number, dy: number, dw: number, dh: number,
+  threshold: number, kinds?: readonly string[],
+): { snapX: number | null; snapY: number | null; guides: EqGuide[] } {
+  const guides: EqGuide[] = [];
+  let snapX: number | null = null;
+  let snapY: number | null = null;
+
+  // ── X-axis: nearest left & right neighbours in the same horizontal band ──
+  const dragCY = dy + dh / 2;
+  const hNeighbors = index.query({ x: -FAR, y: dy - dh * 0.5, w: 2 * FAR, h: dh * 2 }, kinds);
+  let A: CanvasItem | null = null, C: CanvasItem | null = null;
+  for (const o of hNeighbors) {
+    if (o.id === dragId || !(o.y + o.h > dy - dh * 0.5 && o.y < dy + dh * 1.5)) continue;
+    if (o.x + o.w <= dx + threshold && (!A || o.x + o.w > A.x + A.w)) A = o;
+    if (o.x >= dx + dw - threshold && (!C || o.x < C.x)) C = o;
+  }
+  if (A && C) {
+    const equalGap = (C.x - (A.x + A.w) - dw) / 2;
+    const equalX = A.x + A.w + equalGap;
+    if (equalGap > 4 && Math.abs(dx - equalX) < threshold) {
+      snapX = equalX;
+      guides.push({ axis: 'x', segA: { from: A.x + A.w, to: equalX, cross: dragCY }, segB: { from: equalX + dw, to: C.x, cross: dragCY }, dist: equalGap });
+    }
+  }
+
+  // ── Y-axis: nearest top & bottom neighbours in the same vertical band ──
+  const dragCX = dx + dw / 2;
+  const vNeighbors = index.query({ x: dx - dw * 0.5, y: -FAR, w: dw * 2, h: 2 * FAR }, kinds);
+  let T: CanvasItem | null = null, B: CanvasItem | null = null;
+  for (const o of vNeighbors) {
+    if (o.id === dragId || !(o.x + o.w > dx - dw * 0.5 && o.x < dx + dw * 1.5)) continue;
+    if (o.y + o.h <= dy + threshold && (!T || o.y + o.h > T.y + T.h)) T = o;
+    if (o.y >= dy + dh - threshold && (!B || o.y < B.y)) B = o;
+  }
+  if (T && B) {
+    const equalGap = (B.y - (T.y + T.h) - dh) / 2;
+    const equalY = T.y + T.h + equalGap;
+    if (equalGap > 4 && Math.abs(dy - equalY) < threshold) {
+      snapY = equalY;
+      guides.push({ axis: 'y', segA: { from: T.y + T.h, to: equalY, cross: dragCX }, segB: { from: equalY + dh, to: B.y, cross: dragCX }, dist: equalGap });
+    }
+  }
+
+  return { snapX, snapY, guides };
+}
@@ -0,0 +1,88 @@
+/**
+ * Viewport helpers shared by WorkflowCanvas and FunnelCanvas.
+ *
+ * Both canvases position items in canvas space and map them to the screen
+ * with `translate(pan) scale(zoom)`. These helpers compute the visible
+ * canvas-space rectangle for a given pan/zoom so only intersecting items
+ * need to be mounted, and cache connection path strings between renders.
+ */
+
+export interface Rect {
+  x: number;
+  y: number;
+  w: number;
+  h: number;
+}
+
+/** Extra canvas-space margin (in screen px) around the viewport that is still rendered */
+export const CULL_MARGIN = 240;
+
+/**
+ * Visible canvas-space rectangle for a viewport of `width`×`height` screen px.
+ * Inverse of the canvas transform, i.e. the same mapping as `screenToCanvas`.
+ */
+export function getVisibleRect(
+  width: number, height: number,
+  pan: { x: number; y: number }, zoom: number,
+  margin = CULL_MARGIN,
+): Rect {
+  const m = margin / zoom;
+  return {
+    x: -pan.x / zoom - m,
+    y: -pan.y / zoom - m,
+    w: width / zoom + 2 * m,
+    h: height / zoom + 2 * m,
+  };
+}
+
+export function intersects(view: Rect, x: number, y: number, w: number, h: number): boolean {
+  return x < view.x + view.w && x + w > view.x && y < view.y + view.h && y + h > view.y;
+}
+
+/**
+ * Conservative visibility test for a bezier connection between two boxes.
+ * The curve's control points stick out at most `max(60, dist * 0.35)` past
+ * the port positions (see getConnectionPath), so the union of both boxes
+ * grown by that offset always contains the whole path.
+ */
+export function connectionIntersects(view: Rect, a: Rect, b: Rect): boolean {
+  const l = Math.min(a.x, b.x), t = Math.min(a.y, b.y);
+  const r = Math.max(a.x + a.w, b.x + b.w), btm = Math.max(a.y + a.h, b.y + b.h);
+  const pad = Math.max(60, Math.hypot(r - l, btm - t) * 0.35);
+  return intersects(view, l - pad, t - pad, r - l + 2 * pad, btm - t + 2 * pad);
+}
+
+// ─── Connection Path Cache ──────────────────────────────────────────────────
+
+export interface PathEntry<T> {
+  from: T;
+  to: T;
+  d: string;
+}
+
+/**
+ * Rebuilds a connection-path cache for `conns`, reusing the previous path
+ * string whenever both endpoint objects are referentially unchanged.
+ * Canvas state is updated immutably (`prev.map(n => n.id === id ? {...} : n)`),
+ * so dragging one item only invalidates the paths touching it.
+ * Entries for connections not passed in are dropped, which keeps the cache
+ * bounded by the number of rendered connections.
+ */
+export function reusePaths<C, T>(
+  prev: Map<string, PathEntry<T>>,
+  conns: Iterable<C>,
+  keyOf: (conn: C) => string,
+  endpoints: (conn: C) => [T, T] | null,
+  build: (conn: C, from: T, to: T) => string,
+): Map<string, PathEntry<T>> {
+  const next = new Map<string, PathEntry<T>>();
+  for (const conn of conns) {
+    const ends = endpoints(conn);
+    if (!ends) continue;
+    const [from, to] = ends;
+    const key = keyOf(conn);
+    const cached = prev.get(key);
+    next.set(key, cached && cached.from === from && cached.to === to ? cached : { from, to, d: build(conn, from, to) });
+  }
+  return next;
+}
@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo, useCallback, useRef, Component } from 'react';
+import { useState, useEffect, useMemo, useCallback, useRef, useSyncExternalStore, Component, Suspense, lazy } from 'react';
 import type { ReactNode, ErrorInfo } from 'react';
 import {
   Zap, Plus, ArrowRight, Activity, Layers, Clock,
@@ -9,15 +9,20 @@ import {
   Edit3, ChevronDown, ChevronUp, Check, Settings, Bell, Shield, RefreshCw, X, Maximize2, Minimize2,
 } from 'lucide-react';
 import { useTheme } from '@/components/theme-provider';
-import WorkflowCanvas from '@/components/automation/WorkflowCanvas';
-import FunnelCanvas from '@/components/automation/FunnelCanvas';
-import type { AutomationSystem, SystemOutput, OutputType } from '@/types/automation';
-import { DEMO_SYSTEMS, loadUserSystems, saveUserSystems, getVisibleDemoSystems, hideDemoSystem } from '@/data/automationSystems';
+import type { AutomationSystem, AutomationSystemMeta, SystemOutput, OutputType } from '@/types/automation';
+import { DEMO_SYSTEMS, userSystemStore, loadUserSystem, saveUserSystem, deleteUserSystem, getVisibleDemoSystems, hideDemoSystem } from '@/data/automationSystems';
 import { WORKFLOW_TEMPLATES } from '@/data/automationTemplates';
 import { createMockEventSource } from '@/services/mockEventSource';
+import { createLiveEventSource } from '@/services/liveEventSource';
 import { useWorkflowExecution } from '@/hooks/useWorkflowExecution';
 import { LanguageProvider, useLanguage } from '@/i18n/LanguageContext';
 
+const WORKFLOW_EVENTS_URL = import.meta.env.VITE_WORKFLOW_EVENTS_URL as string | undefined;
+
+// Canvases erst laden, wenn sie angezeigt werden (eigener Chunk, siehe vite.config.ts)
+const WorkflowCanvas = lazy(() => import('@/components/automation/WorkflowCanvas'));
+const FunnelCanvas = lazy(() => import('@/components/automation/FunnelCanvas'));
+
 // ─── Error Boundary (#26) ────────────────────────────────────────────────────
 
 interface ErrorBoundaryState { hasError: boolean; error?: Error }
@@ -45,7 +50,11 @@ class CanvasErrorBoundary extends Component<{ children: ReactNode; fallback?: Re
         </div>
       );
     }
-    return this.props.children;
+    return (
+      <Suspense fallback={<div className="h-full min-h-64 rounded-2xl bg-gray-100 dark:bg-zinc-900/40 animate-pulse" />}>
+        {this.props.children}
+      </Suspense>
+    );
   }
 }
 
@@ -304,7 +313,7 @@ function OutputTable({ outputs, onToast }: { outputs: SystemOutput[]; onToast?:
 
 // ─── Dashboard Overview ───────────────────────────────────────────────────────
 
-function DashboardOverview({ systems, onSelect }: { systems: AutomationSystem[]; onSelect: (id: string) => void }) {
+function DashboardOverview({ systems, onSelect }: { systems: AutomationSystemMeta[]; onSelect: (id: string) => void }) {
   const { t, lang } = useLanguage();
   const [searchQuery, setSearchQuery] = useState('');
   const [statusFilter, setStatusFilter] = useState<'all' | 'active' | 'draft'>('all');
@@ -434,6 +443,8 @@ function DashboardOverview({ systems, onSelect }: { systems: AutomationSystem[];
 
 // ─── System Detail View (Redesigned) ─────────────────────────────────────────
 
+const LIVE_CANVAS_STYLE = { height: '100%' };
+
 function SystemDetailView({ system, onSave, onExecute, onDelete, onToggleStatus, isUserSystem, isDemoSystem, onToast }: {
   system: AutomationSystem;
   onSave?: (system: AutomationSystem) => void;
@@ -449,9 +460,13 @@ function SystemDetailView({ system, onSave, onExecute, onDelete, onToggleStatus,
   const isActive = system.status === 'active';
   const dateLang = lang === 'de' ? 'de-DE' : 'en-US';
 
-  // Event-system integration (mock today, real backend later)
-  const eventSource = useMemo(() => createMockEventSource(), []);
-  const { nodeStates, artifacts, isComplete, execute, reset } = useWorkflowExecution(eventSource);
+  // Event-system integration (mock by default, live backend via VITE_WORKFLOW_EVENTS_URL)
+  const eventSource = useMemo(() => (
+    WORKFLOW_EVENTS_URL ? createLiveEventSource({ url: WORKFLOW_EVENTS_URL }) : createMockEventSource()
+  ), []);
+  // Kein nodeStates-Abo hier: die Canvas-Nodes abonnieren den Store einzeln
+  const { store: executionStore, artifacts, isComplete, executionResult, execute, reset } = useWorkflowExecution(eventSource);
+  const timing = isComplete ? executionResult?.timing : undefined;
 
   // Reset execution state when switching systems
   useEffect(() => { reset(); }, [system.id, reset]);
@@ -468,6 +483,8 @@ function SystemDetailView({ system, onSave, onExecute, onDelete, onToggleStatus,
 
   // Resizable canvas height
   const [canvasHeight, setCanvasHeight] = useState(560);
+  // Stabile Style-Objekte, damit die memoisierte Canvas bei Artifact-Updates nicht neu rendert
+  const canvasStyle = useMemo(() => ({ height: canvasHeight }), [canvasHeight]);
   const resizeRef = useRef<{ startY: number; startH: number } | null>(null);
 
   useEffect(() => {
@@ -592,7 +609,7 @@ function SystemDetailView({ system, onSave, onExecute, onDelete, onToggleStatus,
           {/* Full Canvas */}
           <div className="flex-1 overflow-hidden">
             <CanvasErrorBoundary>
-              <WorkflowCanvas initialSystem={system} readOnly onExecute={handleExecuteWithEvents} nodeStates={nodeStates} style={{ height: '100%' }} />
+              <WorkflowCanvas initialSystem={system} readOnly onExecute={handleExecuteWithEvents} executionStore={executionStore} style={LIVE_CANVAS_STYLE} />
             </CanvasErrorBoundary>
           </div>
         </div>
@@ -630,7 +647,7 @@ function SystemDetailView({ system, onSave, onExecute, onDelete, onToggleStatus,
         </div>
         <div className="rounded-2xl border border-gray-200 dark:border-zinc-800/40 overflow-hidden">
           <CanvasErrorBoundary>
-            <WorkflowCanvas initialSystem={system} onSave={onSave} onExecute={handleExecuteWithEvents} nodeStates={nodeStates} style={{ height: canvasHeight }} />
+            <WorkflowCanvas initialSystem={system} onSave={onSave} onExecute={handleExecuteWithEvents} executionStore={executionStore} style={canvasStyle} />
           </CanvasErrorBoundary>
         </div>
         {/* Resize handle */}
@@ -679,6 +696,12 @@ function SystemDetailView({ system, onSave, onExecute, onDelete, onToggleStatus,
               <span className="text-xs text-gray-400 dark:text-zinc-600">
                 {artifacts.length} {t('detail.entries')}
                 {artifacts.length > 0 && isComplete && <span className="ml-1 text-emerald-500"> · {t('detail.new')}</span>}
+                {timing && (
+                  <span className="ml-1">
+                    · {t('detail.criticalPath')} {(timing.criticalPathMs / 1000).toLocaleString(dateLang, { maximumFractionDigits: 1 })} s
+                    · {t('detail.speedup')} {timing.speedup.toLocaleString(dateLang, { maximumFractionDigits: 1 })}×
+                  </span>
+                )}
               </span>
             </div>
           </div>
@@ -916,7 +939,11 @@ function AutomationDashboardContent() {
   const [section, setSection] = useState<string>('dashboard');
   const [sidebarOpen, setSidebarOpen] = useState(false);
   const [sidebarCollapsed, setSidebarCollapsed] = useState(false);
-  const [userSystems, setUserSystems] = useState<AutomationSystem[]>([]);
+  // Listen kommen aus dem Metadaten-Index; den Body lädt erst das geöffnete System
+  const userSystems = useSyncExternalStore(userSystemStore.subscribe, userSystemStore.listMeta);
+  const [openedSystem, setOpenedSystem] = useState<AutomationSystem | null>(null);
+  // Änderungen erst zulassen, wenn der Store geöffnet ist
+  const [systemsStatus, setSystemsStatus] = useState<'loading' | 'ready' | 'error'>('loading');
   const [demoVersion, setDemoVersion] = useState(0); // Incremented when demo hidden list changes
   const { toasts, addToast, dismissToast } = useToast();
 
@@ -928,10 +955,64 @@ function AutomationDashboardContent() {
     compactView: false,
   });
 
-  useEffect(() => { setUserSystems(loadUserSystems()); }, []);
+  useEffect(() => {
+    let cancelled = false;
+    userSystemStore.ready()
+      .then(() => { if (!cancelled) setSystemsStatus('ready'); })
+      .catch(e => {
+        console.warn('Systeme konnten nicht geladen werden:', e);
+        if (cancelled) return;
+        setSystemsStatus('error');
+        addToast(t('toast.systemsLoadFailed'), 'error');
+      });
+    return () => { cancelled = true; };
+  // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  const canModifySystems = () => {
+    if (systemsStatus === 'ready') return true;
+    addToast(t(systemsStatus === 'loading' ? 'toast.systemsLoading' : 'toast.systemsLoadFailed'), 'error');
+    return false;
+  };
+
+  const allSystems = useMemo<AutomationSystemMeta[]>(() => [...getVisibleDemoSystems(), ...userSystems], [userSystems, demoVersion]);
+  const selectedMeta = allSystems.find(s => s.id === section);
+  const isUserSection = userSystems.some(s => s.id === section);
 
-  const allSystems = useMemo(() => [...getVisibleDemoSystems(), ...userSystems], [userSystems, demoVersion]);
-  const selectedSystem = allSystems.find(s => s.id === section);
+  useEffect(() => {
+    if (!isUserSection || openedSystem?.id === section) return;
+    let cancelled = false;
+    loadUserSystem(section)
+      .then(system => { if (!cancelled) setOpenedSystem(system ?? null); })
+      .catch(e => {
+        console.warn('System konnte nicht geladen werden:', e);
+        if (cancelled) return;
+        addToast(t('toast.systemsLoadFailed'), 'error');
+        setSection('dashboard');
+      });
+    return () => { cancelled = true; };
+  }, [section, isUserSection, openedSystem, addToast, t]);
+
+  const selectedSystem = isUserSection
+    ? (openedSystem?.id === section ? openedSystem : undefined)
+    : DEMO_SYSTEMS.find(d => d.id === selectedMeta?.id);
+
+  /** Ändert ein User-System – Body aus dem geöffneten System oder lazy aus dem Store */
+  const updateUserSystem = async (systemId: string, update: (system: AutomationSystem) => AutomationSystem) => {
+    let current: AutomationSystem | undefined;
+    try {
+      current = openedSystem?.id === systemId ? openedSystem : await loadUserSystem(systemId);
+    } catch (e) {
+      console.warn('System konnte nicht geladen werden:', e);
+      addToast(t('toast.systemsLoadFailed'), 'error');
+      return undefined;
+    }
+    if (!current) return undefined;
+    const updated = update(current);
+    saveUserSystem(updated);
+    setOpenedSystem(prev => (prev?.id === systemId ? updated : prev));
+    return updated;
+  };
 
   const isDark = theme === 'dark' || (theme === 'system' && typeof window !== 'undefined' && window.matchMedia('(prefers-color-scheme: dark)').matches);
 
@@ -947,29 +1028,29 @@ function AutomationDashboardContent() {
   }, [theme]);
 
   const handleCreated = (system: AutomationSystem) => {
-    const updated = [...userSystems, system];
-    setUserSystems(updated);
-    saveUserSystems(updated);
+    if (!canModifySystems()) return;
+    saveUserSystem(system);
+    setOpenedSystem(system);
     setSection(system.id);
     addToast(t('toast.systemCreated'), 'success');
   };
 
   const handleSaveSystem = (system: AutomationSystem) => {
-    const existingIdx = userSystems.findIndex(s => s.id === system.id);
-    let updated: AutomationSystem[];
-    if (existingIdx >= 0) {
-      updated = [...userSystems];
-      updated[existingIdx] = system;
+    if (!canModifySystems()) return;
+    if (userSystems.some(s => s.id === system.id)) {
+      saveUserSystem(system);
+      setOpenedSystem(prev => (prev?.id === system.id ? system : prev));
     } else {
       const isDemo = DEMO_SYSTEMS.some(d => d.id === system.id);
       const newSystem = isDemo
         ? { ...system, id: `user-${Date.now()}`, name: `${system.name} ${t('system.copy')}` }
         : system;
-      updated = [...userSystems, newSystem];
-      if (isDemo) setSection(newSystem.id);
+      saveUserSystem(newSystem);
+      if (isDemo) {
+        setOpenedSystem(newSystem);
+        setSection(newSystem.id);
+      }
     }
-    setUserSystems(updated);
-    saveUserSystems(updated);
     addToast(t('toast.systemSaved'), 'success');
   };
 
@@ -978,6 +1059,7 @@ function AutomationDashboardContent() {
     const confirmMsg = isDemo
       ? t('confirm.hideDemo')
       : t('confirm.deleteSystem');
+    if (!isDemo && !canModifySystems()) return;
     if (!window.confirm(confirmMsg)) return;
 
     if (isDemo) {
@@ -985,40 +1067,31 @@ function AutomationDashboardContent() {
       setDemoVersion(n => n + 1);
       addToast(t('toast.demoHidden'), 'info');
     } else {
-      const updated = userSystems.filter(s => s.id !== systemId);
-      setUserSystems(updated);
-      saveUserSystems(updated);
+      deleteUserSystem(systemId);
+      setOpenedSystem(prev => (prev?.id === systemId ? null : prev));
       addToast(t('toast.systemDeleted'), 'success');
     }
     setSection('dashboard');
   };
 
-  const handleToggleStatus = (systemId: string) => {
-    const current = userSystems.find(s => s.id === systemId);
-    const newStatus = current?.status === 'active' ? 'draft' : 'active';
-    const updated = userSystems.map(s =>
-      s.id === systemId ? { ...s, status: newStatus as 'active' | 'draft' } : s
-    );
-    setUserSystems(updated);
-    saveUserSystems(updated);
+  const handleToggleStatus = async (systemId: string) => {
+    if (!canModifySystems()) return;
+    const updated = await updateUserSystem(systemId, s => ({ ...s, status: s.status === 'active' ? 'draft' : 'active' }));
+    if (!updated) return;
     addToast(
-      newStatus === 'active' ? t('toast.statusActive') : t('toast.statusDraft'),
+      updated.status === 'active' ? t('toast.statusActive') : t('toast.statusDraft'),
       'info'
     );
   };
 
   const handleExecuteSystem = (systemId: string) => {
     // Update user system execution count
-    const userIdx = userSystems.findIndex(s => s.id === systemId);
-    if (userIdx >= 0) {
-      const updated = [...userSystems];
-      updated[userIdx] = {
-        ...updated[userIdx],
-        executionCount: updated[userIdx].executionCount + 1,
+    if (systemsStatus === 'ready' && userSystems.some(s => s.id === systemId)) {
+      void updateUserSystem(systemId, s => ({
+        ...s,
+        executionCount: s.executionCount + 1,
         lastExecuted: new Date().toISOString(),
-      };
-      setUserSystems(updated);
-      saveUserSystems(updated);
+      }));
     }
     addToast(t('toast.executionStarted'), 'info');
   };
@@ -1041,14 +1114,14 @@ function AutomationDashboardContent() {
   const isUserSystem = selectedSystem ? userSystems.some(s => s.id === selectedSystem.id) : false;
   const isDemoSystem = selectedSystem ? DEMO_SYSTEMS.some(d => d.id === selectedSystem.id) : false;
 
-  const sectionTitle = section === 'dashboard' ? t('page.dashboard') : section === 'create' ? t('page.templates') : section === 'builder' ? t('page.builder') : section === 'visualizer' ? t('page.visualizer') : section === 'settings' ? t('page.settings') : selectedSystem?.name || '';
+  const sectionTitle = section === 'dashboard' ? t('page.dashboard') : section === 'create' ? t('page.templates') : section === 'builder' ? t('page.builder') : section === 'visualizer' ? t('page.visualizer') : section === 'settings' ? t('page.settings') : selectedMeta?.name || '';
   const sectionSubtitle = section === 'dashboard'
     ? t('page.systemsAndActive', { count: allSystems.length, active: allSystems.filter(s => s.status === 'active').length })
     : section === 'create' ? t('page.templateSubtitle')
     : section === 'builder' ? t('page.builderSubtitle')
     : section === 'visualizer' ? t('page.visualizerSubtitle')
     : section === 'settings' ? t('page.settingsSubtitle')
-    : selectedSystem ? t('page.executionsSubtitle', { category: selectedSystem.category, count: selectedSystem.executionCount }) : '';
+    : selectedMeta ? t('page.executionsSubtitle', { category: selectedMeta.category, count: selectedMeta.executionCount }) : '';
 
   return (
     <div className="min-h-screen bg-gray-50 dark:bg-[#0a0a0e] text-gray-900 dark:text-white">
@@ -1230,9 +1303,9 @@ function AutomationDashboardContent() {
             <CanvasErrorBoundary>
               <WorkflowCanvas
                 onSave={(system) => {
-                  const updated = [...userSystems, system];
-                  setUserSystems(updated);
-                  saveUserSystems(updated);
+                  if (!canModifySystems()) return;
+                  saveUserSystem(system);
+                  setOpenedSystem(system);
                   setSection(system.id);
                 }}
               />
@@ -1331,7 +1404,7 @@ function AutomationDashboardContent() {
               onSave={handleSaveSystem}
               onExecute={() => handleExecuteSystem(selectedSystem.id)}
               onDelete={() => handleDeleteSystem(selectedSystem.id)}
-              onToggleStatus={() => handleToggleStatus(selectedSystem.id)}
+              onToggleStatus={() => void handleToggleStatus(selectedSystem.id)}
               onToast={addToast}
             />
           )}
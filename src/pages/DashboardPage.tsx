@@ -3,7 +3,7 @@
  * FULLY INTERACTIVE - Every element works as intended
  */
 
-import React, { useState, useEffect, useMemo, ReactNode } from "react";
+import React, { useState, useEffect, useMemo, useSyncExternalStore, ReactNode } from "react";
 import {
   TrendingUp,
   TrendingDown,
@@ -55,6 +55,10 @@ import {
   ChevronRight,
 } from "lucide-react";
 import { LanguageProvider, useLanguage } from '../i18n/LanguageContext';
+import { createColumnTable, createRowIndex, toDay, fromDay, DAY_MS } from '@/lib/analytics';
+import type { MetricTotals } from '@/lib/analytics';
+import { downloadCsv } from '@/lib/csv';
+import { createDemoAnalytics } from '@/data/analyticsFeed';
 
 // ============================================
 // TYPES
@@ -137,58 +141,6 @@ interface BudgetData {
 // ============================================
 // MOCK DATA
 // ============================================
-const generateMetrics = (dateRange: DateRange, platform: Platform, customDays?: number) => {
-  if (dateRange === "custom" && customDays) {
-    const m = (customDays / 7);
-    const platformData: Record<Platform, { share: number; roas: number }> = {
-      all: { share: 1, roas: 3.6 }, meta: { share: 0.65, roas: 3.5 }, google: { share: 0.25, roas: 4.2 }, tiktok: { share: 0.07, roas: 2.1 }, linkedin: { share: 0.03, roas: 2.8 },
-    };
-    const p = platformData[platform];
-    const baseSpend = 24850 * m * p.share;
-    const baseLeads = 342 * m * p.share;
-    return { totalSpend: Math.round(baseSpend), totalRevenue: Math.round(baseSpend * p.roas), totalLeads: Math.round(baseLeads), totalRoas: p.roas, avgCpl: baseLeads > 0 ? Math.round((baseSpend / baseLeads) * 100) / 100 : 0, avgCpa: baseLeads > 0 ? Math.round((baseSpend / (baseLeads * 0.5)) * 100) / 100 : 0, totalImpressions: Math.round(1245000 * m * p.share), totalClicks: Math.round(18675 * m * p.share), avgCtr: 1.5 + Math.random() * 0.3, avgCvr: 1.83 + Math.random() * 0.2, totalConversions: Math.round(171 * m * p.share), avgCpm: 19.96 };
-  }
-  const mult: Record<string, number> = { today: 0.15, "7d": 1, "30d": 4.2, "90d": 12, "6m": 26, "12m": 52 };
-  const m = mult[dateRange] ?? 1;
-  const platformData = {
-    all: { share: 1, roas: 3.6 },
-    meta: { share: 0.65, roas: 3.5 },
-    google: { share: 0.25, roas: 4.2 },
-    tiktok: { share: 0.07, roas: 2.1 },
-    linkedin: { share: 0.03, roas: 2.8 },
-  };
-  const p = platformData[platform];
-  const baseSpend = 24850 * m * p.share;
-  const baseLeads = 342 * m * p.share;
-  return {
-    totalSpend: Math.round(baseSpend),
-    totalRevenue: Math.round(baseSpend * p.roas),
-    totalLeads: Math.round(baseLeads),
-    totalRoas: p.roas,
-    avgCpl: baseLeads > 0 ? Math.round((baseSpend / baseLeads) * 100) / 100 : 0,
-    avgCpa: baseLeads > 0 ? Math.round((baseSpend / (baseLeads * 0.5)) * 100) / 100 : 0,
-    totalImpressions: Math.round(1245000 * m * p.share),
-    totalClicks: Math.round(18675 * m * p.share),
-    avgCtr: 1.5 + Math.random() * 0.3,
-    avgCvr: 1.83 + Math.random() * 0.2,
-    totalConversions: Math.round(171 * m * p.share),
-    avgCpm: 19.96,
-  };
-};
-
-const generateChartData = (dateRange: DateRange, customDays?: number) => {
-  const points: Record<string, number> = { today: 24, "7d": 7, "30d": 30, "90d": 12, "6m": 26, "12m": 12, custom: customDays ? Math.min(customDays, 60) : 14 };
-  const numPoints = points[dateRange] ?? 14;
-  return Array.from({ length: numPoints }, (_, i) => {
-    const spend = 2000 + Math.random() * 3000;
-    return {
-      date: dateRange === "today" ? `${i}:00` : dateRange === "90d" || dateRange === "12m" ? `KW ${i + 1}` : dateRange === "6m" ? `KW ${i + 1}` : `${String(i + 1).padStart(2, "0")}.01`,
-      value: Math.round(spend),
-      value2: Math.round(spend * (2.5 + Math.random() * 2)),
-    };
-  });
-};
-
 const allCampaigns: CampaignData[] = [
   { id: "1", name: "Brand Awareness Q1", status: "active", platform: "meta", spend: 8450, revenue: 32400, roas: 3.83, leads: 124, cpl: 68.15, impressions: 456000, clicks: 6840, ctr: 1.5, conversions: 62, cvr: 0.91 },
   { id: "2", name: "Lead Gen - Retargeting", status: "active", platform: "meta", spend: 5200, revenue: 21800, roas: 4.19, leads: 89, cpl: 58.43, impressions: 234000, clicks: 4212, ctr: 1.8, conversions: 44, cvr: 1.04 },
@@ -211,6 +163,63 @@ const allLeads: LeadData[] = [
   { id: "8", name: "Julia Fischer", email: "j.fischer@corp.de", phone: "+49 177 8901234", source: "meta", campaign: "Brand Awareness Q1", status: "contacted", date: "31.12.2024", value: 0 },
 ];
 
+// ============================================
+// ANALYTICS
+// ============================================
+const PLATFORM_KEYS = ["meta", "google", "tiktok", "linkedin"] as const;
+const AD_METRICS = ["spend", "revenue", "leads", "impressions", "clicks", "conversions"] as const;
+type AdMetric = typeof AD_METRICS[number];
+
+const FEED_DAYS = 400;
+const RANGE_DAYS: Record<Exclude<DateRange, "custom">, number> = { today: 1, "7d": 7, "30d": 30, "90d": 90, "6m": 182, "12m": 365 };
+const CHART_POINTS: Record<Exclude<DateRange, "custom">, number> = { today: 24, "7d": 7, "30d": 30, "90d": 12, "6m": 26, "12m": 12 };
+const COMPARE_DAYS = { "7d": 7, "30d": 30, "90d": 90 };
+// Share of a day's volume per hour (sums to 1)
+const HOURLY_PROFILE = [0.008, 0.005, 0.004, 0.003, 0.004, 0.008, 0.018, 0.034, 0.05, 0.058, 0.062, 0.063, 0.064, 0.063, 0.062, 0.06, 0.058, 0.056, 0.056, 0.058, 0.058, 0.051, 0.039, 0.028];
+
+// Campaign figures are weekly; the demo feed spreads them into one row per campaign and day, segmented by platform
+const createAdsAnalytics = () => createDemoAnalytics(AD_METRICS, { segments: PLATFORM_KEYS.length, days: FEED_DAYS, lastDay: toDay(Date.now()) });
+const adsSources = (campaigns: CampaignData[]) => campaigns.map(c => ({
+  seed: c.id,
+  segment: PLATFORM_KEYS.indexOf(c.platform),
+  daily: { spend: c.spend / 7, revenue: c.revenue / 7, leads: c.leads / 7, impressions: c.impressions / 7, clicks: c.clicks / 7, conversions: c.conversions / 7 },
+}));
+
+// Leads are stored column by column; rows are materialized only for rendering
+const createLeadTable = () => createColumnTable(allLeads, {
+  groups: ["source", "status"],
+  numbers: ["value"],
+  text: l => `${l.name}\n${l.email}`,
+});
+
+const summarizeMetrics = (t: MetricTotals<AdMetric>) => ({
+  totalSpend: Math.round(t.spend),
+  totalRevenue: Math.round(t.revenue),
+  totalLeads: Math.round(t.leads),
+  totalRoas: t.spend > 0 ? t.revenue / t.spend : 0,
+  avgCpl: t.leads > 0 ? t.spend / t.leads : 0,
+  avgCpa: t.conversions > 0 ? t.spend / t.conversions : 0,
+  totalImpressions: Math.round(t.impressions),
+  totalClicks: Math.round(t.clicks),
+  avgCtr: t.impressions > 0 ? (t.clicks / t.impressions) * 100 : 0,
+  avgCvr: t.clicks > 0 ? (t.leads / t.clicks) * 100 : 0,
+  totalConversions: Math.round(t.conversions),
+  avgCpm: t.impressions > 0 ? (t.spend / t.impressions) * 1000 : 0,
+});
+
+const isoWeek = (date: Date) => {
+  const d = new Date(Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate()));
+  d.setUTCDate(d.getUTCDate() + 4 - (d.getUTCDay() || 7));
+  return Math.ceil(((d.getTime() - Date.UTC(d.getUTCFullYear(), 0, 1)) / DAY_MS + 1) / 7);
+};
+
+const bucketLabel = (from: number, to: number, lang: string) => {
+  const d = fromDay(from);
+  if (to - from <= 1) return `${String(d.getUTCDate()).padStart(2, "0")}.${String(d.getUTCMonth() + 1).padStart(2, "0")}`;
+  if (to - from <= 10) return `KW ${isoWeek(d)}`;
+  return d.toLocaleDateString(lang === "de" ? "de-DE" : "en-US", { month: "short", year: "2-digit", timeZone: "UTC" });
+};
+
 const notificationData: Record<string, { de: { title: string; message: string; time: string }; en: { title: string; message: string; time: string } }> = {
   "1": { de: { title: "Neuer Lead", message: "Max Mustermann über Meta Ads", time: "Vor 5 Min" }, en: { title: "New lead", message: "Max Mustermann via Meta Ads", time: "5 min ago" } },
   "2": { de: { title: "Conversion!", message: "Michael Koch hat konvertiert (€8.500)", time: "Vor 1 Std" }, en: { title: "Conversion!", message: "Michael Koch converted (€8,500)", time: "1 hr ago" } },
@@ -248,18 +257,13 @@ const formatCurrency = (v: number) => new Intl.NumberFormat("de-DE", { minimumFr
 const formatNumber = (v: number) => v >= 1000000 ? (v / 1000000).toFixed(1) + "M" : v >= 1000 ? (v / 1000).toFixed(1) + "K" : v.toFixed(0);
 const formatPercent = (v: number) => v.toFixed(2) + "%";
 
-const exportToCSV = (data: CampaignData[], filename: string) => {
-  const headers = ["Name", "Platform", "Status", "Spend", "Revenue", "ROAS", "Leads", "CPL", "Impressions", "Clicks", "CTR", "Conversions", "CVR"];
-  const rows = data.map(c => [c.name, c.platform, c.status, c.spend, c.revenue, c.roas, c.leads, c.cpl, c.impressions, c.clicks, c.ctr, c.conversions, c.cvr]);
-  const csv = [headers.join(","), ...rows.map(r => r.join(","))].join("\n");
-  const blob = new Blob([csv], { type: "text/csv" });
-  const url = URL.createObjectURL(blob);
-  const a = document.createElement("a");
-  a.href = url;
-  a.download = filename;
-  a.click();
-  URL.revokeObjectURL(url);
-};
+const CAMPAIGN_CSV_HEADERS = ["Name", "Platform", "Status", "Spend", "Revenue", "ROAS", "Leads", "CPL", "Impressions", "Clicks", "CTR", "Conversions", "CVR"];
+
+function* campaignCsvRows(data: CampaignData[]) {
+  for (const c of data) yield [c.name, c.platform, c.status, c.spend, c.revenue, c.roas, c.leads, c.cpl, c.impressions, c.clicks, c.ctr, c.conversions, c.cvr];
+}
+
+const exportToCSV = (data: CampaignData[], filename: string) => downloadCsv(filename, CAMPAIGN_CSV_HEADERS, campaignCsvRows(data));
 
 // ============================================
 // COMPONENTS
@@ -384,15 +388,39 @@ const CustomDropdown = <T extends string>({
 };
 
 // Interactive Area Chart with Tooltips
+const AREA_PADDING = { top: 20, right: 20, bottom: 40, left: 60 };
+const AREA_WIDTH = 800;
+
 const AreaChart = ({ data, height = 300 }: { data: { date: string; value: number; value2: number }[]; height?: number }) => {
   const [hovered, setHovered] = useState<number | null>(null);
-  if (data.length === 0) return null;
-
-  const max = Math.max(...data.map(d => Math.max(d.value, d.value2))) * 1.1;
-  const padding = { top: 20, right: 20, bottom: 40, left: 60 };
-  const chartWidth = 800;
+  const padding = AREA_PADDING;
+  const chartWidth = AREA_WIDTH;
   const chartHeight = height - padding.top - padding.bottom;
 
+  // Scale and paths depend only on the data, not on hover state
+  const { max, spendPath, revPath, spendArea, revArea } = useMemo(() => {
+    let top = 0;
+    for (const d of data) top = Math.max(top, d.value, d.value2);
+    const max = top * 1.1 || 1;
+    const x = (i: number) => AREA_PADDING.left + (i / (data.length - 1)) * (AREA_WIDTH - AREA_PADDING.left - AREA_PADDING.right);
+    const y = (v: number) => AREA_PADDING.top + chartHeight - (v / max) * chartHeight;
+    let spendPath = "", revPath = "";
+    data.forEach((d, i) => {
+      spendPath += `${i === 0 ? "M" : " L"} ${x(i)} ${y(d.value)}`;
+      revPath += `${i === 0 ? "M" : " L"} ${x(i)} ${y(d.value2)}`;
+    });
+    const close = `L ${x(data.length - 1)} ${y(0)} Z`;
+    return {
+      max,
+      spendPath,
+      revPath,
+      spendArea: `M ${x(0)} ${y(0)} ${spendPath.slice(1)} ${close}`,
+      revArea: `M ${x(0)} ${y(0)} ${revPath.slice(1)} ${close}`,
+    };
+  }, [data, chartHeight]);
+
+  if (data.length === 0) return null;
+
   // Show fewer labels when many data points (every nth label)
   const labelInterval = data.length > 20 ? 7 : data.length > 10 ? 3 : 1;
   const showDots = data.length <= 15; // Hide dots when too many points
@@ -400,11 +428,6 @@ const AreaChart = ({ data, height = 300 }: { data: { date: string; value: number
   const getX = (i: number) => padding.left + (i / (data.length - 1)) * (chartWidth - padding.left - padding.right);
   const getY = (v: number) => padding.top + chartHeight - (v / max) * chartHeight;
 
-  const spendPath = data.map((d, i) => `${i === 0 ? "M" : "L"} ${getX(i)} ${getY(d.value)}`).join(" ");
-  const revPath = data.map((d, i) => `${i === 0 ? "M" : "L"} ${getX(i)} ${getY(d.value2)}`).join(" ");
-  const spendArea = `M ${getX(0)} ${getY(0)} ${spendPath.slice(1)} L ${getX(data.length - 1)} ${getY(0)} Z`;
-  const revArea = `M ${getX(0)} ${getY(0)} ${revPath.slice(1)} L ${getX(data.length - 1)} ${getY(0)} Z`;
-
   return (
     <div className="relative" style={{ height }}>
       <svg className="w-full h-full" viewBox={`0 0 ${chartWidth} ${height}`} preserveAspectRatio="xMidYMid meet">
@@ -997,7 +1020,8 @@ const DashboardContent = () => {
 
   // Data
   const [notifications, setNotifications] = useState(initialNotifications);
-  const [leads, setLeads] = useState(allLeads);
+  const [leadTable] = useState(createLeadTable);
+  const leads = useSyncExternalStore(leadTable.subscribe, leadTable.getSnapshot);
   const [campaigns, setCampaigns] = useState(allCampaigns);
   const [settings, setSettings] = useState({ emailLeads: true, dailyReport: true, budgetAlerts: true, roasAlerts: false });
 
@@ -1065,8 +1089,15 @@ const DashboardContent = () => {
     return base[revenueTimeframe];
   }, [revenueTimeframe, lang]);
 
-  const revenueTotalCurrent = useMemo(() => revenueSales.reduce((s, r) => s + r.revenue, 0), [revenueSales]);
-  const revenueTotalDeals = useMemo(() => revenueSales.reduce((s, r) => s + r.deals, 0), [revenueSales]);
+  const { revenueTotalCurrent, revenueTotalDeals, revenueMax } = useMemo(() => {
+    let revenue = 0, deals = 0, max = 1;
+    for (const r of revenueSales) {
+      revenue += r.revenue;
+      deals += r.deals;
+      if (r.revenue > max) max = r.revenue;
+    }
+    return { revenueTotalCurrent: revenue, revenueTotalDeals: deals, revenueMax: max };
+  }, [revenueSales]);
   const revenueAvgDeal = revenueTotalDeals > 0 ? Math.round(revenueTotalCurrent / revenueTotalDeals) : 0;
 
   const revenueDeals = [
@@ -1096,6 +1127,8 @@ const DashboardContent = () => {
     { source: tx("Organisch", "Organic"), revenue: 3100, deals: 2, avgDays: 31, pct: 2.4 },
   ];
 
+  const revenuePipelineMax = Math.max(1, ...revenuePipeline.map(s => s.count));
+
   const avgDaysToClose = revenueDeals.length > 0 ? Math.round(revenueDeals.reduce((s, d) => s + d.daysToClose, 0) / revenueDeals.length) : 0;
 
   // Toggle dark mode
@@ -1129,36 +1162,65 @@ const DashboardContent = () => {
     const to = new Date(customDateTo);
     return Math.max(1, Math.round((to.getTime() - from.getTime()) / (1000 * 60 * 60 * 24)));
   }, [customDateFrom, customDateTo]);
-  const metrics = useMemo(() => generateMetrics(dateRange, platform, dateRange === "custom" ? customDays : undefined), [dateRange, platform, customDays]);
-  const chartData = useMemo(() => generateChartData(dateRange, dateRange === "custom" ? customDays : undefined), [dateRange, customDays]);
-
-  const filteredCampaigns = useMemo(() => {
-    let f = campaigns.filter(c => platform === "all" || c.platform === platform);
-    if (search) f = f.filter(c => c.name.toLowerCase().includes(search.toLowerCase()));
-    f.sort((a, b) => {
-      const aVal = a[sortField], bVal = b[sortField];
-      if (typeof aVal === "string") return sortDir === "asc" ? aVal.localeCompare(bVal as string) : (bVal as string).localeCompare(aVal);
-      return sortDir === "asc" ? (aVal as number) - (bVal as number) : (bVal as number) - (aVal as number);
-    });
-    return f;
-  }, [campaigns, platform, search, sortField, sortDir]);
 
-  const filteredLeads = useMemo(() => {
-    let f = leads.filter(l => platform === "all" || l.source === platform);
-    if (search) f = f.filter(l => l.name.toLowerCase().includes(search.toLowerCase()) || l.email.toLowerCase().includes(search.toLowerCase()));
-    if (leadStatusFilter !== "all") f = f.filter(l => l.status === leadStatusFilter);
-    return f;
-  }, [leads, platform, search, leadStatusFilter]);
+  // Analytics: prefix sums over the daily feed, window/series results memoized per range and platform.
+  // Syncing only regenerates edited campaigns and patches their platform rows in place; it is idempotent,
+  // and an unchanged list returns the same engine, so running it during render is safe.
+  const [adsAnalytics] = useState(createAdsAnalytics);
+  const adsEngine = useMemo(() => adsAnalytics.sync(adsSources(campaigns)), [adsAnalytics, campaigns]);
+  const platformSegment = platform === "all" ? undefined : PLATFORM_KEYS.indexOf(platform);
+  const dateWindow = useMemo(() => {
+    if (dateRange === "custom") {
+      const from = toDay(new Date(customDateFrom));
+      // A cleared date input yields NaN; fall back to the 30-day window like the old default multiplier
+      if (Number.isFinite(from) && Number.isFinite(customDays)) return { from, to: from + customDays };
+    }
+    const days = dateRange === "custom" ? RANGE_DAYS["30d"] : RANGE_DAYS[dateRange];
+    return { from: adsEngine.endDay - days, to: adsEngine.endDay };
+  }, [adsEngine, dateRange, customDateFrom, customDays]);
+
+  const metrics = useMemo(() => summarizeMetrics(adsEngine.totals(dateWindow.from, dateWindow.to, platformSegment)), [adsEngine, dateWindow, platformSegment]);
+  const chartData = useMemo(() => {
+    const { from, to } = dateWindow;
+    if (dateRange === "today") {
+      const day = adsEngine.totals(from, to, platformSegment);
+      return HOURLY_PROFILE.map((share, h) => ({ date: `${h}:00`, value: Math.round(day.spend * share), value2: Math.round(day.revenue * share) }));
+    }
+    const points = dateRange === "custom" ? Math.min(to - from, 60) : CHART_POINTS[dateRange];
+    return adsEngine.series(from, to, points, platformSegment).map(b => ({
+      date: bucketLabel(b.from, b.to, lang),
+      value: Math.round(b.totals.spend),
+      value2: Math.round(b.totals.revenue),
+    }));
+  }, [adsEngine, dateWindow, dateRange, platformSegment, lang]);
+  const spendToday = useMemo(() => adsEngine.totals(adsEngine.endDay - 1, adsEngine.endDay).spend, [adsEngine]);
+
+  const campaignIndex = useMemo(() => createRowIndex(campaigns, {
+    text: c => c.name,
+    groups: { platform: c => c.platform },
+    sort: { name: c => c.name, spend: c => c.spend, revenue: c => c.revenue, roas: c => c.roas, leads: c => c.leads, cpl: c => c.cpl, ctr: c => c.ctr, cvr: c => c.cvr },
+  }), [campaigns]);
+  const filteredCampaigns = useMemo(
+    () => campaignIndex.query({ search, where: { platform }, sortBy: sortField, dir: sortDir }),
+    [campaignIndex, platform, search, sortField, sortDir],
+  );
+
+  // Row positions only; the table materializes rows when the leads section renders them
+  const filteredLeads = useMemo(
+    () => leads.query({ search, where: { source: platform, status: leadStatusFilter } }),
+    [leads, platform, search, leadStatusFilter],
+  );
+  const leadStatusCounts: Partial<Record<LeadData["status"], number>> = useMemo(() => leads.countBy("status", filteredLeads), [leads, filteredLeads]);
 
   const pageSize = 5;
   const paginatedCampaigns = filteredCampaigns.slice((page - 1) * pageSize, page * pageSize);
   const totalPages = Math.ceil(filteredCampaigns.length / pageSize);
 
-  const platformSpend = useMemo(() => {
-    const data: Record<string, number> = {};
-    campaigns.forEach(c => { if (platform === "all" || c.platform === platform) data[c.platform] = (data[c.platform] || 0) + c.spend; });
-    return Object.entries(data).map(([p, v]) => ({ label: p.charAt(0).toUpperCase() + p.slice(1), value: v, color: platformColors[p as keyof typeof platformColors].fill }));
-  }, [campaigns, platform]);
+  const platformSpend = useMemo(() => PLATFORM_KEYS.flatMap((p, segment) => (
+    platform === "all" || platform === p
+      ? [{ label: p.charAt(0).toUpperCase() + p.slice(1), value: Math.round(adsEngine.totals(dateWindow.from, dateWindow.to, segment).spend), color: platformColors[p].fill }]
+      : []
+  )), [adsEngine, dateWindow, platform]);
 
   useEffect(() => { document.title = "Dashboard | Flowstack"; }, []);
 
@@ -1168,7 +1230,7 @@ const DashboardContent = () => {
   const handleExport = () => exportToCSV(filteredCampaigns, `campaigns-${dateRange}-${platform}.csv`);
   const handleMarkRead = (id: string) => setNotifications(n => n.map(x => x.id === id ? { ...x, read: true } : x));
   const handleClearNotifications = () => setNotifications([]);
-  const handleLeadStatusChange = (id: string, status: LeadData["status"]) => setLeads(l => l.map(x => x.id === id ? { ...x, status } : x));
+  const handleLeadStatusChange = (id: string, status: LeadData["status"]) => leadTable.update(id, { status });
   const handleCampaignAction = (action: string, id: string) => {
     if (action === "view") setSelectedCampaign(campaigns.find(c => c.id === id) || null);
     else if (action === "toggle") setCampaigns(c => c.map(x => x.id === id ? { ...x, status: x.status === "active" ? "paused" : "active" } : x));
@@ -1488,7 +1550,7 @@ const DashboardContent = () => {
           {section === "leads" && (
             <div className="space-y-6">
               <div className="grid md:grid-cols-4 gap-4">
-                {[{ l: tx("Gesamt", "Total"), v: filteredLeads.length }, { l: tx("Neu", "New"), v: filteredLeads.filter(l => l.status === "new").length, c: "text-purple-500" }, { l: tx("Qualifiziert", "Qualified"), v: filteredLeads.filter(l => l.status === "qualified").length, c: "text-emerald-500" }, { l: tx("Konvertiert", "Converted"), v: filteredLeads.filter(l => l.status === "converted").length, c: "text-blue-500" }].map((s, i) => (
+                {[{ l: tx("Gesamt", "Total"), v: filteredLeads.length }, { l: tx("Neu", "New"), v: leadStatusCounts.new ?? 0, c: "text-purple-500" }, { l: tx("Qualifiziert", "Qualified"), v: leadStatusCounts.qualified ?? 0, c: "text-emerald-500" }, { l: tx("Konvertiert", "Converted"), v: leadStatusCounts.converted ?? 0, c: "text-blue-500" }].map((s, i) => (
                   <div key={i} className="bg-white dark:bg-gray-900 rounded-2xl p-6 border border-gray-100 dark:border-gray-800"><p className="text-sm text-gray-500 mb-1">{s.l}</p><p className={`text-3xl font-bold ${s.c || ""}`}>{s.v}</p></div>
                 ))}
               </div>
@@ -1523,7 +1585,7 @@ const DashboardContent = () => {
               <div className="bg-white dark:bg-gray-900 rounded-2xl border border-gray-100 dark:border-gray-800 overflow-hidden">
                 <table className="w-full">
                   <thead><tr className="border-b border-gray-100 dark:border-gray-800 text-left text-sm text-gray-500"><th className="py-3 px-4 font-medium">{tx("Name", "Name")}</th><th className="py-3 px-4 font-medium">{tx("E-Mail", "Email")}</th><th className="py-3 px-4 font-medium">{tx("Quelle", "Source")}</th><th className="py-3 px-4 font-medium">{tx("Kampagne", "Campaign")}</th><th className="py-3 px-4 font-medium">{tx("Status", "Status")}</th><th className="py-3 px-4 font-medium">{tx("Wert", "Value")}</th><th className="py-3 px-4 font-medium">{tx("Datum", "Date")}</th></tr></thead>
-                  <tbody>{filteredLeads.map(l => {
+                  <tbody>{leads.rows(filteredLeads).map(l => {
                     const col = platformColors[l.source], sc = statusColors[l.status];
                     return (
                       <tr key={l.id} onClick={() => setSelectedLead(l)} className="border-b border-gray-100 dark:border-gray-800 hover:bg-gray-50 dark:hover:bg-gray-800/50 cursor-pointer">
@@ -1691,18 +1753,21 @@ const DashboardContent = () => {
                 </div>
               </div>
               {(() => {
-                const multiplier = compareRange === "7d" ? 1 : compareRange === "30d" ? 4.2 : 12;
+                const n = COMPARE_DAYS[compareRange];
+                const cur = summarizeMetrics(adsEngine.totals(adsEngine.endDay - n, adsEngine.endDay));
+                const prev = summarizeMetrics(adsEngine.totals(adsEngine.endDay - 2 * n, adsEngine.endDay - n));
+                const round2 = (v: number) => Math.round(v * 100) / 100;
                 const baseData = {
-                  spend: { current: Math.round(24850 * multiplier), previous: Math.round(22340 * multiplier) },
-                  revenue: { current: Math.round(89460 * multiplier), previous: Math.round(71200 * multiplier) },
-                  roas: { current: 3.6, previous: 3.19 },
-                  leads: { current: Math.round(342 * multiplier), previous: Math.round(287 * multiplier) },
-                  impressions: { current: Math.round(1245000 * multiplier), previous: Math.round(1089000 * multiplier) },
-                  clicks: { current: Math.round(18675 * multiplier), previous: Math.round(15420 * multiplier) },
-                  ctr: { current: 1.5, previous: 1.42 },
-                  cpl: { current: 72.66, previous: 77.84 },
-                  conversions: { current: Math.round(171 * multiplier), previous: Math.round(142 * multiplier) },
-                  cvr: { current: 1.83, previous: 1.68 },
+                  spend: { current: cur.totalSpend, previous: prev.totalSpend },
+                  revenue: { current: cur.totalRevenue, previous: prev.totalRevenue },
+                  roas: { current: round2(cur.totalRoas), previous: round2(prev.totalRoas) },
+                  leads: { current: cur.totalLeads, previous: prev.totalLeads },
+                  impressions: { current: cur.totalImpressions, previous: prev.totalImpressions },
+                  clicks: { current: cur.totalClicks, previous: prev.totalClicks },
+                  ctr: { current: round2(cur.avgCtr), previous: round2(prev.avgCtr) },
+                  cpl: { current: round2(cur.avgCpl), previous: round2(prev.avgCpl) },
+                  conversions: { current: cur.totalConversions, previous: prev.totalConversions },
+                  cvr: { current: round2(cur.avgCvr), previous: round2(prev.avgCvr) },
                 };
                 return (
                   <>
@@ -1809,8 +1874,7 @@ const DashboardContent = () => {
                 <h3 className="font-semibold mb-6">{tx("Umsatz-Entwicklung", "Revenue Trend")}</h3>
                 <div className="flex items-end gap-3 h-48">
                   {revenueSales.slice().reverse().map((entry, i) => {
-                    const maxRev = Math.max(...revenueSales.map(r => r.revenue), 1);
-                    const heightPct = (entry.revenue / maxRev) * 100;
+                    const heightPct = (entry.revenue / revenueMax) * 100;
                     return (
                       <div key={i} className="flex-1 flex flex-col items-center gap-2">
                         <span className="text-xs font-medium text-gray-600 dark:text-gray-400">€{formatCurrency(entry.revenue)}</span>
@@ -1834,8 +1898,7 @@ const DashboardContent = () => {
                   <h3 className="font-semibold mb-6">{tx("Deal-Pipeline", "Deal Pipeline")}</h3>
                   <div className="space-y-4">
                     {revenuePipeline.map((stage, i) => {
-                      const maxCount = Math.max(...revenuePipeline.map(s => s.count));
-                      const widthPct = (stage.count / maxCount) * 100;
+                      const widthPct = (stage.count / revenuePipelineMax) * 100;
                       const convRate = i > 0 ? ((stage.count / revenuePipeline[i - 1].count) * 100).toFixed(1) : null;
                       return (
                         <div key={i}>
@@ -2039,7 +2102,7 @@ const DashboardContent = () => {
           {section === "monitor" && (
             <div className="space-y-6">
               <div className="flex items-center gap-3"><div className="w-3 h-3 bg-emerald-500 rounded-full animate-pulse" /><span className="text-sm text-gray-500">{tx("Live – Updates alle 30s", "Live – Updates every 30s")}</span></div>
-              <div className="grid md:grid-cols-4 gap-4">{[{ l: tx("Aktive Nutzer", "Active users"), v: "247", t: "+12" }, { l: tx("Klicks/Std", "Clicks/hr"), v: "1,842", t: "+89" }, { l: tx("Conv. heute", "Conv. today"), v: "23", t: "+5" }, { l: tx("Ausgaben heute", "Spend today"), v: `€${formatCurrency(Math.round(metrics.totalSpend * 0.15))}`, t: "" }].map((s, i) => (<div key={i} className="bg-white dark:bg-gray-900 rounded-2xl p-6 border border-gray-100 dark:border-gray-800"><p className="text-sm text-gray-500 mb-1">{s.l}</p><div className="flex items-end gap-2"><p className="text-3xl font-bold">{s.v}</p>{s.t && <span className="text-sm text-emerald-500 mb-1">{s.t}</span>}</div></div>))}</div>
+              <div className="grid md:grid-cols-4 gap-4">{[{ l: tx("Aktive Nutzer", "Active users"), v: "247", t: "+12" }, { l: tx("Klicks/Std", "Clicks/hr"), v: "1,842", t: "+89" }, { l: tx("Conv. heute", "Conv. today"), v: "23", t: "+5" }, { l: tx("Ausgaben heute", "Spend today"), v: `€${formatCurrency(spendToday)}`, t: "" }].map((s, i) => (<div key={i} className="bg-white dark:bg-gray-900 rounded-2xl p-6 border border-gray-100 dark:border-gray-800"><p className="text-sm text-gray-500 mb-1">{s.l}</p><div className="flex items-end gap-2"><p className="text-3xl font-bold">{s.v}</p>{s.t && <span className="text-sm text-emerald-500 mb-1">{s.t}</span>}</div></div>))}</div>
               <div className="bg-white dark:bg-gray-900 rounded-2xl p-6 border border-gray-100 dark:border-gray-800"><h3 className="font-semibold mb-6">{tx("Live Activity", "Live Activity")}</h3><div className="space-y-2">{[{ t: tx("Gerade", "Just now"), e: tx("Neuer Lead", "New lead"), d: "Google Search", c: "bg-emerald-500", nav: "leads" as ActiveSection }, { t: tx("Vor 2 Min", "2 min ago"), e: tx("Conversion", "Conversion"), d: tx("Meta Retargeting – €2.500", "Meta Retargeting – €2,500"), c: "bg-purple-500", nav: "revenue" as ActiveSection }, { t: tx("Vor 5 Min", "5 min ago"), e: tx("Neuer Lead", "New lead"), d: "Meta Awareness", c: "bg-emerald-500", nav: "leads" as ActiveSection }, { t: tx("Vor 8 Min", "8 min ago"), e: tx("Klick-Spike", "Click spike"), d: "+45% in 10 Min", c: "bg-blue-500", nav: "campaigns" as ActiveSection }, { t: tx("Vor 12 Min", "12 min ago"), e: tx("Neuer Lead", "New lead"), d: "LinkedIn B2B", c: "bg-emerald-500", nav: "leads" as ActiveSection }].map((a, i) => (<div key={i} onClick={() => { setHighlightedMonitorItem(i); setTimeout(() => { setSection(a.nav); setHighlightedMonitorItem(null); }, 600); }} className={`flex items-center gap-4 p-3 rounded-xl cursor-pointer transition-all ${highlightedMonitorItem === i ? "bg-purple-50 dark:bg-purple-500/10 ring-1 ring-purple-300 dark:ring-purple-500/30 scale-[1.01]" : "hover:bg-gray-50 dark:hover:bg-gray-800"}`}><div className={`w-2 h-2 rounded-full ${a.c} ${i === 0 ? "animate-pulse" : ""}`} /><span className="text-sm text-gray-400 w-24">{a.t}</span><span className="font-medium">{a.e}</span><span className="text-sm text-gray-500 flex-1">{a.d}</span><ChevronRight className="w-4 h-4 text-gray-300" /></div>))}</div></div>
             </div>
           )}
@@ -3,7 +3,7 @@
  * Outreach, Posts, Message Templates mit A/B Testing
  */
 
-import { useState, useEffect, useMemo, useRef, useCallback, ReactNode } from "react";
+import { useState, useEffect, useMemo, useRef, useCallback, useSyncExternalStore, ReactNode } from "react";
 import {
   TrendingUp,
   Users,
@@ -56,6 +56,10 @@ import {
   Layers,
 } from "lucide-react";
 import { LanguageProvider, useLanguage } from '../i18n/LanguageContext';
+import { createColumnTable, createRowIndex, toDay } from '@/lib/analytics';
+import type { ColumnTableView, MetricTotals } from '@/lib/analytics';
+import { downloadCsv } from '@/lib/csv';
+import { createDemoAnalytics } from '@/data/analyticsFeed';
 
 // ============================================
 // TYPES
@@ -468,15 +472,47 @@ const initialEventTriggers: EventTrigger[] = [
 
 const formatNumber = (v: number) => v >= 1000000 ? (v / 1000000).toFixed(1) + "M" : v >= 1000 ? (v / 1000).toFixed(1) + "K" : v.toString();
 
-const exportCSV = (data: object[], filename: string) => {
-  const headers = Object.keys(data[0] || {});
-  const csv = [headers.join(","), ...data.map(row => headers.map(h => (row as Record<string, unknown>)[h]).join(","))].join("\n");
-  const blob = new Blob([csv], { type: "text/csv" });
-  const url = URL.createObjectURL(blob);
-  const a = document.createElement("a");
-  a.href = url; a.download = filename; a.click();
-  URL.revokeObjectURL(url);
-};
+// ============================================
+// ANALYTICS
+// ============================================
+const LINKEDIN_METRICS = ["connectionsSent", "connectionsAccepted", "messagesSent", "messagesReplied", "leads", "impressions", "engagements", "likes", "comments"] as const;
+type LinkedInMetric = typeof LINKEDIN_METRICS[number];
+
+const FEED_DAYS = 400;
+const RANGE_DAYS: Record<Exclude<DateRange, "custom">, number> = { today: 1, "7d": 7, "30d": 30, "90d": 90, "6m": 182, "12m": 365 };
+const NO_METRICS: MetricTotals<LinkedInMetric> = { connectionsSent: 0, connectionsAccepted: 0, messagesSent: 0, messagesReplied: 0, leads: 0, impressions: 0, engagements: 0, likes: 0, comments: 0 };
+
+// Campaign and post figures are monthly. Segments are the source kind; campaign and post cards read
+// their window totals from the engine's per-source index
+const SEGMENT_CAMPAIGNS = 0;
+const SEGMENT_POSTS = 1;
+const createLinkedInAnalytics = () => createDemoAnalytics(LINKEDIN_METRICS, { segments: 2, days: FEED_DAYS, lastDay: toDay(Date.now()) });
+const linkedInSources = (campaigns: OutreachCampaign[], publishedPosts: LinkedInPost[]) => [
+  ...campaigns.map(c => ({
+    seed: c.id,
+    segment: SEGMENT_CAMPAIGNS,
+    daily: { ...NO_METRICS, connectionsSent: c.connectionsSent / 30, connectionsAccepted: c.connectionsAccepted / 30, messagesSent: c.messagesSent / 30, messagesReplied: c.messagesReplied / 30, leads: c.leadsGenerated / 30 },
+  })),
+  ...publishedPosts.map(p => ({
+    seed: `post-${p.id}`,
+    segment: SEGMENT_POSTS,
+    daily: { ...NO_METRICS, impressions: p.impressions / 30, engagements: p.engagements / 30, likes: p.likes / 30, comments: p.comments / 30 },
+  })),
+];
+
+// Leads are stored column by column; rows are materialized only for rendering
+const createLeadTable = () => createColumnTable(initialLeads, { groups: ["status"], text: l => `${l.name}\n${l.company}` });
+
+function* leadCsvRows(leads: ColumnTableView<OutreachLead, "status">) {
+  for (let i = 0; i < leads.length; i++) {
+    const l = leads.row(i);
+    yield [l.name, l.company, l.status, l.campaign];
+  }
+}
+
+const CAMPAIGN_CSV_HEADERS = ["name", "status", "sent", "accepted", "replies", "leads"];
+const LEAD_CSV_HEADERS = ["name", "company", "status", "campaign"];
+const POST_CSV_HEADERS = ["content", "impressions", "engagement"];
 
 // ============================================
 // COMPONENTS
@@ -1278,7 +1314,8 @@ const LinkedInDashboardContent = () => {
   const [campaigns, setCampaigns] = useState(initialCampaigns);
   const [templates, setTemplates] = useState(initialTemplates);
   const [posts, setPosts] = useState(initialPosts);
-  const [leads, setLeads] = useState(initialLeads);
+  const [leadTable] = useState(createLeadTable);
+  const leads = useSyncExternalStore(leadTable.subscribe, leadTable.getSnapshot);
   const [settingsData, setSettingsData] = useState({
     dailyConnections: 25,
     dailyMessages: 50,
@@ -1347,40 +1384,48 @@ const LinkedInDashboardContent = () => {
   });
   const [settingsTab, setSettingsTab] = useState<'account' | 'safety' | 'integrations' | 'triggers'>('account');
 
-  // Date range multiplier
-  const dateMultiplier = useMemo(() => {
+  // Analytics: prefix sums over the daily feed, window results memoized per range.
+  // Syncing only regenerates edited campaigns/posts and patches their rows in place; it is idempotent,
+  // and unchanged lists return the same engine, so running it during render is safe.
+  const publishedPosts = useMemo(() => posts.filter(p => p.status === "published"), [posts]);
+  const [linkedInAnalytics] = useState(createLinkedInAnalytics);
+  const engine = useMemo(() => linkedInAnalytics.sync(linkedInSources(campaigns, publishedPosts)), [linkedInAnalytics, campaigns, publishedPosts]);
+  const dateWindow = useMemo(() => {
     if (dateRange === "custom") {
-      const from = new Date(customDateFrom);
-      const to = new Date(customDateTo);
-      const days = Math.max(1, Math.round((to.getTime() - from.getTime()) / (1000 * 60 * 60 * 24)));
-      return days / 30;
+      const from = toDay(new Date(customDateFrom));
+      const to = toDay(new Date(customDateTo));
+      // Leeres Datumsfeld ergibt NaN – dann wie früher 30 Tage
+      if (Number.isFinite(from) && Number.isFinite(to)) return { from, to: from + Math.max(1, to - from) };
     }
-    const multipliers: Record<string, number> = { today: 0.04, "7d": 0.25, "30d": 1.0, "90d": 2.8, "6m": 5.5, "12m": 11 };
-    return multipliers[dateRange] ?? 1;
-  }, [dateRange, customDateFrom, customDateTo]);
+    const days = dateRange === "custom" ? RANGE_DAYS["30d"] : RANGE_DAYS[dateRange];
+    return { from: engine.endDay - days, to: engine.endDay };
+  }, [engine, dateRange, customDateFrom, customDateTo]);
+  const windowTotal = (seed: string, metric: LinkedInMetric) => {
+    const source = linkedInAnalytics.sourceOf(seed);
+    return source === undefined ? 0 : Math.round(engine.sourceTotals(dateWindow.from, dateWindow.to, source)[metric]);
+  };
 
   // Metrics
   const metrics = useMemo(() => {
-    const m = dateMultiplier;
-    const totalConnSent = Math.round(campaigns.reduce((s, c) => s + c.connectionsSent, 0) * m);
-    const totalConnAccepted = Math.round(campaigns.reduce((s, c) => s + c.connectionsAccepted, 0) * m);
-    const totalMsgSent = Math.round(campaigns.reduce((s, c) => s + c.messagesSent, 0) * m);
-    const totalMsgReplied = Math.round(campaigns.reduce((s, c) => s + c.messagesReplied, 0) * m);
-    const totalLeads = Math.round(campaigns.reduce((s, c) => s + c.leadsGenerated, 0) * m);
-    const publishedPosts = posts.filter(p => p.status === "published");
-    const totalImpressions = Math.round(publishedPosts.reduce((s, p) => s + p.impressions, 0) * m);
-    const totalEngagements = Math.round(publishedPosts.reduce((s, p) => s + p.engagements, 0) * m);
-    const avgEngRate = publishedPosts.length > 0 ? publishedPosts.reduce((s, p) => s + p.engagementRate, 0) / publishedPosts.length : 0;
-    return { totalConnSent, totalConnAccepted, acceptRate: totalConnSent > 0 ? (totalConnAccepted / totalConnSent) * 100 : 0, totalMsgSent, totalMsgReplied, replyRate: totalMsgSent > 0 ? (totalMsgReplied / totalMsgSent) * 100 : 0, totalLeads, totalImpressions, totalEngagements, avgEngRate, totalPosts: publishedPosts.length };
-  }, [campaigns, posts, dateMultiplier]);
-
-  // Filtered Data
-  const filteredCampaigns = campaigns.filter(c => !search || c.name.toLowerCase().includes(search.toLowerCase()));
-  const filteredPosts = posts.filter(p => (!search || p.content.toLowerCase().includes(search.toLowerCase())) && (postFilter === "all" || p.status === postFilter));
-  const filteredLeads = leads.filter(l =>
-    (!search || l.name.toLowerCase().includes(search.toLowerCase()) || l.company.toLowerCase().includes(search.toLowerCase())) &&
-    (leadStatusFilter === "all" || l.status === leadStatusFilter)
-  );
+    const t = engine.totals(dateWindow.from, dateWindow.to);
+    const totalConnSent = Math.round(t.connectionsSent);
+    const totalConnAccepted = Math.round(t.connectionsAccepted);
+    const totalMsgSent = Math.round(t.messagesSent);
+    const totalMsgReplied = Math.round(t.messagesReplied);
+    let engRateSum = 0;
+    for (const p of publishedPosts) engRateSum += p.engagementRate;
+    const avgEngRate = publishedPosts.length > 0 ? engRateSum / publishedPosts.length : 0;
+    return { totalConnSent, totalConnAccepted, acceptRate: totalConnSent > 0 ? (totalConnAccepted / totalConnSent) * 100 : 0, totalMsgSent, totalMsgReplied, replyRate: totalMsgSent > 0 ? (totalMsgReplied / totalMsgSent) * 100 : 0, totalLeads: Math.round(t.leads), totalImpressions: Math.round(t.impressions), totalEngagements: Math.round(t.engagements), avgEngRate, totalPosts: publishedPosts.length };
+  }, [engine, dateWindow, publishedPosts]);
+
+  // Filtered Data (indexes rebuild only when the lists change, filters are one pass)
+  const campaignIndex = useMemo(() => createRowIndex(campaigns, { text: c => c.name }), [campaigns]);
+  const postIndex = useMemo(() => createRowIndex(posts, { text: p => p.content, groups: { status: p => p.status } }), [posts]);
+  const filteredCampaigns = useMemo(() => campaignIndex.query({ search }), [campaignIndex, search]);
+  const filteredPosts = useMemo(() => postIndex.query({ search, where: { status: postFilter } }), [postIndex, search, postFilter]);
+  // Row positions only; the table materializes rows when the leads section renders them
+  const filteredLeads = useMemo(() => leads.query({ search, where: { status: leadStatusFilter } }), [leads, search, leadStatusFilter]);
+  const leadStatusCounts = useMemo(() => leads.countBy("status"), [leads]);
 
   // Handlers
   const handleRefresh = () => { setIsLoading(true); setTimeout(() => setIsLoading(false), 1500); };
@@ -1398,11 +1443,11 @@ const LinkedInDashboardContent = () => {
     else if (action === "updateLimit" && typeof data === "number") setCampaigns(c => c.map(x => x.id === id ? { ...x, dailyLimit: data } : x));
   };
 
-  const handleLeadStatusChange = (id: string, status: string) => setLeads(l => l.map(x => x.id === id ? { ...x, status: status as OutreachLead["status"] } : x));
+  const handleLeadStatusChange = (id: string, status: string) => leadTable.update(id, { status: status as OutreachLead["status"] });
 
   const handleTemplateUpdate = (template: MessageTemplate) => setTemplates(t => t.map(x => x.id === template.id ? template : x));
   const handleDeleteTemplate = (id: string) => setTemplates(t => t.filter(x => x.id !== id));
-  const handleDeleteLead = (id: string) => setLeads(l => l.filter(x => x.id !== id));
+  const handleDeleteLead = (id: string) => leadTable.remove(id);
 
   const handlePostAction = (action: string, id: string) => {
     if (action === "delete") setPosts(p => p.filter(x => x.id !== id));
@@ -1471,17 +1516,16 @@ const LinkedInDashboardContent = () => {
 
   // Update lead notes
   const handleUpdateLeadNotes = (id: string, notes: string) => {
-    setLeads(l => l.map(x => x.id === id ? { ...x, notes } : x));
+    leadTable.update(id, { notes });
   };
 
   // Send message to lead
   const handleSendMessage = (leadId: string, message: string) => {
-    setLeads(l => l.map(x => x.id === leadId ? {
-      ...x,
+    leadTable.update(leadId, x => ({
       status: x.status === "connected" ? "messaged" : x.status,
       lastActivity: tx("Gerade eben", "Just now"),
       messageHistory: [...x.messageHistory, { date: new Date().toLocaleDateString("de-DE"), type: "message", content: message }]
-    } : x));
+    }));
     setShowMessageModal(null);
   };
 
@@ -1492,9 +1536,9 @@ const LinkedInDashboardContent = () => {
   };
 
   const handleExport = () => {
-    if (section === "outreach") exportCSV(campaigns.map(c => ({ name: c.name, status: c.status, sent: c.connectionsSent, accepted: c.connectionsAccepted, replies: c.messagesReplied, leads: c.leadsGenerated })), "linkedin-campaigns.csv");
-    else if (section === "leads") exportCSV(leads.map(l => ({ name: l.name, company: l.company, status: l.status, campaign: l.campaign })), "linkedin-leads.csv");
-    else if (section === "posts") exportCSV(posts.filter(p => p.status === "published").map(p => ({ content: p.content.slice(0, 50), impressions: p.impressions, engagement: p.engagementRate })), "linkedin-posts.csv");
+    if (section === "outreach") downloadCsv("linkedin-campaigns.csv", CAMPAIGN_CSV_HEADERS, campaigns.map(c => [c.name, c.status, c.connectionsSent, c.connectionsAccepted, c.messagesReplied, c.leadsGenerated]));
+    else if (section === "leads") downloadCsv("linkedin-leads.csv", LEAD_CSV_HEADERS, leadCsvRows(leads));
+    else if (section === "posts") downloadCsv("linkedin-posts.csv", POST_CSV_HEADERS, publishedPosts.map(p => [p.content.slice(0, 50), p.impressions, p.engagementRate]));
   };
 
   // Reset Data
@@ -1504,7 +1548,7 @@ const LinkedInDashboardContent = () => {
     setCampaigns(initialCampaigns);
     setTemplates(initialTemplates);
     setPosts(initialPosts);
-    setLeads(initialLeads);
+    leadTable.reset(initialLeads);
     setNotifications(initialNotifications);
     setSettingsData({ dailyConnections: 25, dailyMessages: 50, dailyViews: 80, notifyConnections: true, notifyReplies: true, notifyEngagement: true, dailyReport: false });
     setSequences(initialSequences);
@@ -1747,7 +1791,7 @@ const LinkedInDashboardContent = () => {
                   <table className="w-full">
                     <thead><tr className="text-left text-sm text-gray-500 border-b border-gray-100 dark:border-gray-800"><th className="pb-3 font-medium">{tx("Name", "Name")}</th><th className="pb-3 font-medium">{tx("Unternehmen", "Company")}</th><th className="pb-3 font-medium">{tx("Status", "Status")}</th><th className="pb-3 font-medium">{tx("Letzte Aktivität", "Last activity")}</th></tr></thead>
                     <tbody>
-                      {leads.slice(0, 5).map(l => {
+                      {leads.rows(Array.from({ length: Math.min(5, leads.length) }, (_, i) => i)).map(l => {
                         const sc = statusColors[l.status];
                         return (
                           <tr key={l.id} onClick={() => setSelectedLead(l)} className="border-b border-gray-50 dark:border-gray-800 hover:bg-gray-50 dark:hover:bg-gray-800 cursor-pointer">
@@ -1785,11 +1829,11 @@ const LinkedInDashboardContent = () => {
                       </div>
                     </div>
                     <div className="grid grid-cols-2 gap-4 mb-4">
-                      <div><p className="text-xs text-gray-500 mb-1">{tx("Verbindungen", "Connections")}</p><p className="text-lg font-bold">{Math.round(campaign.connectionsAccepted * dateMultiplier)}<span className="text-gray-400 font-normal">/{Math.round(campaign.connectionsSent * dateMultiplier)}</span></p><p className="text-xs text-emerald-500">{campaign.acceptRate}%</p></div>
-                      <div><p className="text-xs text-gray-500 mb-1">{tx("Antworten", "Replies")}</p><p className="text-lg font-bold">{Math.round(campaign.messagesReplied * dateMultiplier)}<span className="text-gray-400 font-normal">/{Math.round(campaign.messagesSent * dateMultiplier)}</span></p><p className="text-xs text-emerald-500">{campaign.replyRate}%</p></div>
+                      <div><p className="text-xs text-gray-500 mb-1">{tx("Verbindungen", "Connections")}</p><p className="text-lg font-bold">{windowTotal(campaign.id, "connectionsAccepted")}<span className="text-gray-400 font-normal">/{windowTotal(campaign.id, "connectionsSent")}</span></p><p className="text-xs text-emerald-500">{campaign.acceptRate}%</p></div>
+                      <div><p className="text-xs text-gray-500 mb-1">{tx("Antworten", "Replies")}</p><p className="text-lg font-bold">{windowTotal(campaign.id, "messagesReplied")}<span className="text-gray-400 font-normal">/{windowTotal(campaign.id, "messagesSent")}</span></p><p className="text-xs text-emerald-500">{campaign.replyRate}%</p></div>
                     </div>
                     <div className="flex items-center justify-between pt-4 border-t border-gray-100 dark:border-gray-800">
-                      <div className="flex items-center gap-2"><Target className="w-4 h-4 text-sky-500" /><span className="text-sm font-medium text-sky-500">{Math.round(campaign.leadsGenerated * dateMultiplier)} Leads</span></div>
+                      <div className="flex items-center gap-2"><Target className="w-4 h-4 text-sky-500" /><span className="text-sm font-medium text-sky-500">{windowTotal(campaign.id, "leads")} Leads</span></div>
                       <span className="text-xs text-gray-400">{tx("Limit", "Limit")}: {campaign.dailyLimit}/{tx("Tag", "day")}</span>
                     </div>
                   </div>
@@ -1864,9 +1908,9 @@ const LinkedInDashboardContent = () => {
                     <p className="text-xs text-gray-400 mb-4">{post.publishedAt}</p>
                     {post.status === "published" && (
                       <div className="grid grid-cols-4 gap-2 pt-4 border-t border-gray-100 dark:border-gray-800">
-                        <div className="text-center"><p className="text-lg font-bold">{formatNumber(Math.round(post.impressions * dateMultiplier))}</p><p className="text-xs text-gray-500">Views</p></div>
-                        <div className="text-center"><p className="text-lg font-bold">{formatNumber(Math.round(post.likes * dateMultiplier))}</p><p className="text-xs text-gray-500">Likes</p></div>
-                        <div className="text-center"><p className="text-lg font-bold">{Math.round(post.comments * dateMultiplier)}</p><p className="text-xs text-gray-500">Comments</p></div>
+                        <div className="text-center"><p className="text-lg font-bold">{formatNumber(windowTotal(`post-${post.id}`, "impressions"))}</p><p className="text-xs text-gray-500">Views</p></div>
+                        <div className="text-center"><p className="text-lg font-bold">{formatNumber(windowTotal(`post-${post.id}`, "likes"))}</p><p className="text-xs text-gray-500">Likes</p></div>
+                        <div className="text-center"><p className="text-lg font-bold">{windowTotal(`post-${post.id}`, "comments")}</p><p className="text-xs text-gray-500">Comments</p></div>
                         <div className="text-center"><p className="text-lg font-bold text-sky-500">{post.engagementRate}%</p><p className="text-xs text-gray-500">Eng.</p></div>
                       </div>
                     )}
@@ -1881,7 +1925,7 @@ const LinkedInDashboardContent = () => {
             <div className="space-y-6">
               <div className="grid grid-cols-6 gap-4">
                 {(Object.entries(statusLabels) as [string, string][]).map(([key, label]) => {
-                  const count = leads.filter(l => l.status === key).length;
+                  const count = leadStatusCounts[key] ?? 0;
                   const sc = statusColors[key];
                   return (
                     <div key={key} className="bg-white dark:bg-gray-900 rounded-xl p-4 border border-gray-100 dark:border-gray-800">
@@ -1912,7 +1956,7 @@ const LinkedInDashboardContent = () => {
                 <table className="w-full">
                   <thead><tr className="border-b border-gray-100 dark:border-gray-800 text-left text-sm text-gray-500"><th className="py-3 px-4 font-medium">{tx("Name", "Name")}</th><th className="py-3 px-4 font-medium">{tx("Position", "Position")}</th><th className="py-3 px-4 font-medium">{tx("Unternehmen", "Company")}</th><th className="py-3 px-4 font-medium">{tx("Kampagne", "Campaign")}</th><th className="py-3 px-4 font-medium">{tx("Status", "Status")}</th><th className="py-3 px-4 font-medium">{tx("Aktivität", "Activity")}</th><th className="py-3 px-4"></th></tr></thead>
                   <tbody>
-                    {filteredLeads.map(lead => {
+                    {leads.rows(filteredLeads).map(lead => {
                       const sc = statusColors[lead.status];
                       return (
                         <tr key={lead.id} onClick={() => setSelectedLead(lead)} className="border-b border-gray-100 dark:border-gray-800 hover:bg-gray-50 dark:hover:bg-gray-800/50 cursor-pointer">
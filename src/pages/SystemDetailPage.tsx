@@ -1,4 +1,4 @@
-import { useState, useMemo } from 'react';
+import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import {
   Zap, ArrowLeft, Play, Loader2, Check, ExternalLink,
@@ -304,7 +304,22 @@ export default function SystemDetailPage() {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
 
-  const system = useMemo(() => (id ? findSystem(id) : undefined), [id]);
+  // null = wird noch geladen (User-Systeme liegen in IndexedDB)
+  const [system, setSystem] = useState<AutomationSystem | undefined | null>(null);
+  useEffect(() => {
+    let cancelled = false;
+    setSystem(null);
+    (id ? findSystem(id) : Promise.resolve(undefined))
+      .then(found => { if (!cancelled) setSystem(found); })
+      .catch(e => {
+        // IndexedDB-Fehler: lieber "nicht gefunden" als eine leere Seite
+        console.warn('System konnte nicht geladen werden:', e);
+        if (!cancelled) setSystem(undefined);
+      });
+    return () => { cancelled = true; };
+  }, [id]);
+
+  if (system === null) return <div className="min-h-screen bg-[#0a0a0e]" />;
 
   // System not found
   if (!system) {
@@ -0,0 +1,195 @@
+/**
+ * Execution Store
+ *
+ * Puffert eingehende Workflow-Events und übernimmt sie gesammelt – einmal pro
+ * Animation-Frame oder in einem festen Intervall. Pro Flush entsteht genau
+ * eine neue nodeStates-Map und ein neues Artifacts-Array, egal wie viele
+ * Events in der Zwischenzeit eingetroffen sind.
+ *
+ * Lesen über `getSnapshot()` + `subscribe()` (useSyncExternalStore) oder
+ * pro Node über `getNodeStatus()` + `subscribeNode()`, damit nur betroffene
+ * Komponenten neu rendern.
+ */
+
+import type { NodeStatusEvent, NodeExecutionStatus, Artifact } from '@/types/workflowEvents';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+/** Gesamtzustand eines Laufs: noch nichts empfangen, Nodes aktiv, alle Nodes fertig */
+export type ExecutionPhase = 'idle' | 'running' | 'done';
+
+export interface ExecutionSnapshot {
+  /** Wird bei jedem Flush mit Änderungen erhöht */
+  version: number;
+  nodeStates: ReadonlyMap<string, NodeExecutionStatus>;
+  /** Letztes Status-Event pro Node (message/progress) */
+  nodeEvents: ReadonlyMap<string, NodeStatusEvent>;
+  artifacts: readonly Artifact[];
+}
+
+export interface ExecutionStoreOptions {
+  /** Flush-Intervall in ms. Ohne Angabe: einmal pro Animation-Frame */
+  flushInterval?: number;
+  /** Maximal gehaltene Artifacts (älteste werden verworfen) */
+  maxArtifacts?: number;
+}
+
+export interface ExecutionStore {
+  pushStatus(event: NodeStatusEvent): void;
+  pushArtifact(artifact: Artifact): void;
+  /** Übernimmt gepufferte Events sofort (z.B. vor onComplete) */
+  flush(): void;
+  /** Leert Puffer und Zustand */
+  reset(): void;
+  getSnapshot(): ExecutionSnapshot;
+  subscribe(listener: () => void): () => void;
+  /** O(1) – ohne die nodeStates-Map zu durchlaufen */
+  getPhase(): ExecutionPhase;
+  getNodeStatus(nodeId: string): NodeExecutionStatus;
+  subscribeNode(nodeId: string, listener: () => void): () => void;
+  dispose(): void;
+}
+
+const DEFAULT_MAX_ARTIFACTS = 500;
+const EMPTY_MAP: ReadonlyMap<string, never> = new Map();
+
+// ─── Store ──────────────────────────────────────────────────────────────────
+
+export function createExecutionStore(options: ExecutionStoreOptions = {}): ExecutionStore {
+  const maxArtifacts = options.maxArtifacts ?? DEFAULT_MAX_ARTIFACTS;
+
+  let snapshot: ExecutionSnapshot = {
+    version: 0, nodeStates: EMPTY_MAP, nodeEvents: EMPTY_MAP, artifacts: [],
+  };
+  // Laufende Zähler für getPhase(): pending/running vs. completed/failed
+  let active = 0;
+  let finished = 0;
+
+  // Puffer bis zum nächsten Flush
+  const pendingStatus = new Map<string, NodeStatusEvent>();
+  let pendingArtifacts: Artifact[] = [];
+  let scheduled: number | null = null;
+  let scheduledWithRaf = false;
+
+  const listeners = new Set<() => void>();
+  const nodeListeners = new Map<string, Set<() => void>>();
+
+  const countStatus = (status: NodeExecutionStatus | undefined, delta: number) => {
+    if (status === 'pending' || status === 'running') active += delta;
+    else if (status === 'completed' || status === 'failed') finished += delta;
+  };
+
+  const cancelScheduled = () => {
+    if (scheduled === null) return;
+    if (scheduledWithRaf) cancelAnimationFrame(scheduled);
+    else clearTimeout(scheduled);
+    scheduled = null;
+  };
+
+  const schedule = () => {
+    if (scheduled !== null) return;
+    if (options.flushInterval === undefined && typeof requestAnimationFrame === 'function') {
+      scheduledWithRaf = true;
+      scheduled = requestAnimationFrame(() => { scheduled = null; flush(); });
+    } else {
+      scheduledWithRaf = false;
+      scheduled = window.setTimeout(() => { scheduled = null; flush(); }, options.flushInterval ?? 16);
+    }
+  };
+
+  const flush = () => {
+    cancelScheduled();
+    if (pendingStatus.size === 0 && pendingArtifacts.length === 0) return;
+
+    const changed: string[] = [];
+    let nodeStates = snapshot.nodeStates;
+    let nodeEvents = snapshot.nodeEvents;
+    if (pendingStatus.size > 0) {
+      const states = new Map(snapshot.nodeStates);
+      const events = new Map(snapshot.nodeEvents);
+      for (const [nodeId, event] of pendingStatus) {
+        const previous = states.get(nodeId);
+        if (previous !== event.status) {
+          changed.push(nodeId);
+          countStatus(previous, -1);
+          countStatus(event.status, 1);
+        }
+        states.set(nodeId, event.status);
+        events.set(nodeId, event);
+      }
+      pendingStatus.clear();
+      nodeStates = states;
+      nodeEvents = events;
+    }
+
+    let artifacts = snapshot.artifacts;
+    if (pendingArtifacts.length > 0) {
+      const merged = artifacts.concat(pendingArtifacts);
+      const overflow = merged.length - maxArtifacts;
+      artifacts = overflow > 0 ? merged.slice(overflow) : merged;
+      pendingArtifacts = [];
+    }
+
+    snapshot = { version: snapshot.version + 1, nodeStates, nodeEvents, artifacts };
+
+    for (const nodeId of changed) nodeListeners.get(nodeId)?.forEach(l => l());
+    listeners.forEach(l => l());
+  };
+
+  return {
+    pushStatus(event) {
+      const applied = pendingStatus.get(event.nodeId) ?? snapshot.nodeEvents.get(event.nodeId);
+      // Veraltete Events (älter als der zuletzt bekannte Stand) verwerfen
+      if (applied && event.timestamp < applied.timestamp) return;
+      pendingStatus.set(event.nodeId, event);
+      schedule();
+    },
+
+    pushArtifact(artifact) {
+      pendingArtifacts.push(artifact);
+      if (pendingArtifacts.length > maxArtifacts) pendingArtifacts = pendingArtifacts.slice(-maxArtifacts);
+      schedule();
+    },
+
+    flush,
+
+    reset() {
+      cancelScheduled();
+      pendingStatus.clear();
+      pendingArtifacts = [];
+      const changed = [...snapshot.nodeStates.keys()];
+      active = 0;
+      finished = 0;
+      snapshot = { version: snapshot.version + 1, nodeStates: EMPTY_MAP, nodeEvents: EMPTY_MAP, artifacts: [] };
+      for (const nodeId of changed) nodeListeners.get(nodeId)?.forEach(l => l());
+      listeners.forEach(l => l());
+    },
+
+    getSnapshot: () => snapshot,
+
+    subscribe(listener) {
+      listeners.add(listener);
+      return () => { listeners.delete(listener); };
+    },
+
+    getPhase: () => (active > 0 ? 'running' : finished > 0 ? 'done' : 'idle'),
+
+    getNodeStatus: (nodeId) => snapshot.nodeStates.get(nodeId) ?? 'idle',
+
+    subscribeNode(nodeId, listener) {
+      let set = nodeListeners.get(nodeId);
+      if (!set) { set = new Set(); nodeListeners.set(nodeId, set); }
+      set.add(listener);
+      return () => {
+        set!.delete(listener);
+        if (set!.size === 0) nodeListeners.delete(nodeId);
+      };
+    },
+
+    dispose() {
+      cancelScheduled();
+      listeners.clear();
+      nodeListeners.clear();
+    },
+  };
+}
@@ -0,0 +1,41 @@
+/**
+ * Export Worker
+ *
+ * Führt `renderSvg`/`renderPng` mit OffscreenCanvas außerhalb des
+ * Main-Threads aus. Protokoll: `ExportWorkerRequest`/`ExportWorkerMessage`
+ * in exportService.ts.
+ */
+
+import { renderSvg, renderPng } from '@/lib/exportScene';
+import type { ExportWorkerRequest, ExportWorkerMessage } from './exportService';
+
+const active = new Set<number>();
+const cancelled = new Set<number>();
+
+const post = (msg: ExportWorkerMessage) => self.postMessage(msg);
+
+self.onmessage = async (e: MessageEvent<ExportWorkerRequest>) => {
+  const msg = e.data;
+  if (msg.type === 'cancel') {
+    if (active.has(msg.jobId)) cancelled.add(msg.jobId);
+    return;
+  }
+
+  const { jobId, scene, format, scale } = msg;
+  active.add(jobId);
+  const control = {
+    onProgress: (done: number, total: number) => post({ type: 'progress', jobId, done, total }),
+    isCancelled: () => cancelled.has(jobId),
+  };
+  try {
+    const blob = format === 'svg' ? await renderSvg(scene, scale, control) : await renderPng(scene, scale, control);
+    if (cancelled.has(jobId)) post({ type: 'cancelled', jobId });
+    else post({ type: 'done', jobId, blob });
+  } catch (err) {
+    if (cancelled.has(jobId) || (err instanceof DOMException && err.name === 'AbortError')) post({ type: 'cancelled', jobId });
+    else post({ type: 'error', jobId, message: err instanceof Error ? err.message : String(err) });
+  } finally {
+    active.delete(jobId);
+    cancelled.delete(jobId);
+  }
+};
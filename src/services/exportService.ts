@@ -0,0 +1,112 @@
+/**
+ * Export Service
+ *
+ * Rendert Canvas-Exporte (SVG/PNG) in einem Web Worker mit OffscreenCanvas,
+ * damit große Boards den Tab nicht einfrieren. Ohne Worker-/OffscreenCanvas-
+ * Unterstützung läuft dieselbe Pipeline im Main-Thread (mit Pausen zwischen
+ * den Kacheln).
+ *
+ *   const blob = await exportScene(scene, { format: 'png', scale: 2, onProgress, signal });
+ *   downloadBlob(blob, 'board.png');
+ */
+
+import { renderSvg, renderPng } from '@/lib/exportScene';
+import type { ExportScene } from '@/lib/exportScene';
+
+export { downloadBlob } from '@/lib/download';
+
+// ─── Protokoll (Main-Thread ↔ Worker) ───────────────────────────────────────
+
+export type ExportFormat = 'svg' | 'png';
+
+export type ExportWorkerRequest =
+  | { type: 'render'; jobId: number; scene: ExportScene; format: ExportFormat; scale: number }
+  | { type: 'cancel'; jobId: number };
+
+export type ExportWorkerMessage =
+  | { type: 'progress'; jobId: number; done: number; total: number }
+  | { type: 'done'; jobId: number; blob: Blob }
+  | { type: 'cancelled'; jobId: number }
+  | { type: 'error'; jobId: number; message: string };
+
+export interface ExportOptions {
+  format: ExportFormat;
+  /** Pixel pro Board-Einheit (Standard: 2) */
+  scale?: number;
+  /** Fortschritt 0–1 */
+  onProgress?: (fraction: number) => void;
+  signal?: AbortSignal;
+}
+
+// ─── Worker ─────────────────────────────────────────────────────────────────
+
+interface Job {
+  resolve: (blob: Blob) => void;
+  reject: (error: unknown) => void;
+  onProgress?: (fraction: number) => void;
+}
+
+let worker: Worker | null = null;
+let nextJobId = 1;
+const jobs = new Map<number, Job>();
+
+const abortError = () => new DOMException('Export cancelled', 'AbortError');
+
+function getWorker(): Worker | null {
+  if (worker) return worker;
+  if (typeof Worker === 'undefined' || typeof OffscreenCanvas === 'undefined') return null;
+  try {
+    worker = new Worker(new URL('./export.worker.ts', import.meta.url), { type: 'module' });
+  } catch {
+    return null;
+  }
+  worker.onmessage = (e: MessageEvent<ExportWorkerMessage>) => {
+    const msg = e.data;
+    const job = jobs.get(msg.jobId);
+    if (!job) return;
+    switch (msg.type) {
+      case 'progress': job.onProgress?.(msg.total > 0 ? msg.done / msg.total : 1); return;
+      case 'done': job.resolve(msg.blob); break;
+      case 'cancelled': job.reject(abortError()); break;
+      case 'error': job.reject(new Error(msg.message)); break;
+    }
+    jobs.delete(msg.jobId);
+  };
+  worker.onerror = (e) => {
+    // Worker abgestürzt: offene Jobs abbrechen, beim nächsten Export neu starten
+    jobs.forEach(job => job.reject(new Error(e.message || 'Export-Worker fehlgeschlagen')));
+    jobs.clear();
+    worker?.terminate();
+    worker = null;
+  };
+  return worker;
+}
+
+// ─── API ────────────────────────────────────────────────────────────────────
+
+export function exportScene(scene: ExportScene, options: ExportOptions): Promise<Blob> {
+  const { format, scale = 2, onProgress, signal } = options;
+  if (signal?.aborted) return Promise.reject(abortError());
+
+  const w = getWorker();
+  if (!w) {
+    const control = {
+      onProgress: (done: number, total: number) => onProgress?.(total > 0 ? done / total : 1),
+      isCancelled: () => signal?.aborted ?? false,
+    };
+    return format === 'svg' ? renderSvg(scene, scale, control) : renderPng(scene, scale, control);
+  }
+
+  const jobId = nextJobId++;
+  return new Promise<Blob>((resolve, reject) => {
+    const onAbort = () => w.postMessage({ type: 'cancel', jobId } satisfies ExportWorkerRequest);
+    signal?.addEventListener('abort', onAbort, { once: true });
+    const cleanup = () => signal?.removeEventListener('abort', onAbort);
+    jobs.set(jobId, {
+      resolve: (blob) => { cleanup(); resolve(blob); },
+      reject: (error) => { cleanup(); reject(error); },
+      onProgress,
+    });
+    w.postMessage({ type: 'render', jobId, scene, format, scale } satisfies ExportWorkerRequest);
+  });
+}
@@ -0,0 +1,323 @@
+/**
+ * ══════════════════════════════════════════════════════════════════════════════
+ * LIVE EVENT SOURCE — Echte Workflow-Events über WebSocket oder SSE
+ *
+ * Implementiert das `WorkflowEventSource` Interface gegen ein Backend, das das
+ * Live-Protokoll aus `@/types/workflowEvents` spricht (lokal:
+ * `node scripts/replay-server.mjs`).
+ *
+ * - Transport: WebSocket (`ws://…/ws`) oder Server-Sent Events (`http://…`)
+ * - Batches: Newline-delimited JSON, viele Events pro Nachricht
+ * - Reconnect mit Backoff; danach `resume` ab der letzten Event-id
+ * - Flow-Control: der Client bestätigt verarbeitete Events (`ack`), der
+ *   Server sendet höchstens ein Fenster unbestätigter Events voraus
+ * - Multiplexing: alle Event-Quellen mit derselben URL teilen sich eine
+ *   Verbindung; Frames werden per executionId zugeordnet
+ * ══════════════════════════════════════════════════════════════════════════════
+ */
+
+import type {
+  WorkflowEventSource,
+  NodeStatusEvent,
+  Artifact,
+  WorkflowExecutionResult,
+  LiveEventFrame,
+  LiveClientMessage,
+} from '@/types/workflowEvents';
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+export type LiveTransport = 'websocket' | 'sse';
+
+export interface LiveConnectionOptions {
+  /** `ws(s)://host/ws` für WebSocket, `http(s)://host` für SSE */
+  url: string;
+  /** Standard: aus dem URL-Schema abgeleitet */
+  transport?: LiveTransport;
+  /** Start-Wartezeit für Reconnects (verdoppelt sich bis `reconnectMaxMs`) */
+  reconnectBaseMs?: number;
+  reconnectMaxMs?: number;
+  /** Spätestens nach dieser Zeit werden verarbeitete Events bestätigt */
+  ackIntervalMs?: number;
+}
+
+export interface LiveConnectionStats {
+  /** Empfangene Nachrichten (Batches) */
+  batches: number;
+  /** Zugestellte Events */
+  events: number;
+  /** Nach Resume doppelt gelieferte und übersprungene Events */
+  duplicates: number;
+  /** Nicht parsebare Zeilen */
+  malformed: number;
+  reconnects: number;
+  lastEventId: number;
+}
+
+export interface LiveConnection {
+  /** Sendet sofort oder reiht ein, bis die Verbindung steht */
+  send(message: LiveClientMessage): void;
+  /** Registriert den Empfänger für eine Ausführung */
+  register(executionId: string, handler: (frame: LiveEventFrame) => void): () => void;
+  readonly stats: LiveConnectionStats;
+  close(): void;
+}
+
+const DEFAULT_RECONNECT_BASE_MS = 500;
+const DEFAULT_RECONNECT_MAX_MS = 10_000;
+const DEFAULT_ACK_INTERVAL_MS = 50;
+
+// ─── Connection ─────────────────────────────────────────────────────────────
+
+export function createLiveConnection(options: LiveConnectionOptions): LiveConnection {
+  const transport: LiveTransport = options.transport ?? (/^wss?:/.test(options.url) ? 'websocket' : 'sse');
+  const baseMs = options.reconnectBaseMs ?? DEFAULT_RECONNECT_BASE_MS;
+  const maxMs = options.reconnectMaxMs ?? DEFAULT_RECONNECT_MAX_MS;
+  const ackIntervalMs = options.ackIntervalMs ?? DEFAULT_ACK_INTERVAL_MS;
+  const clientId = `client-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+
+  const stats: LiveConnectionStats = { batches: 0, events: 0, duplicates: 0, malformed: 0, reconnects: 0, lastEventId: 0 };
+  const handlers = new Map<string, (frame: LiveEventFrame) => void>();
+  const outbox: LiveClientMessage[] = [];
+
+  let ws: WebSocket | null = null;
+  let sse: EventSource | null = null;
+  let open = false;
+  let closed = false;
+  let attempt = 0;
+  let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  let ackTimer: ReturnType<typeof setTimeout> | null = null;
+  let lastAcked = 0;
+
+  const baseUrl = options.url.replace(/\/+$/, '');
+
+  function transmit(message: LiveClientMessage) {
+    if (transport === 'websocket') {
+      ws?.send(JSON.stringify(message));
+      return;
+    }
+    fetch(`${baseUrl}/messages?client=${encodeURIComponent(clientId)}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(message),
+      keepalive: true,
+    }).catch(() => {
+      // Ausführungs-Nachrichten beim nächsten Verbindungsaufbau erneut senden
+      if (message.type === 'execute' || message.type === 'cancel') outbox.push(message);
+    });
+  }
+
+  function scheduleAck() {
+    if (ackTimer !== null) return;
+    ackTimer = setTimeout(() => {
+      ackTimer = null;
+      if (!open || stats.lastEventId <= lastAcked) return;
+      lastAcked = stats.lastEventId;
+      transmit({ type: 'ack', lastEventId: lastAcked });
+    }, ackIntervalMs);
+  }
+
+  /** Verarbeitet einen NDJSON-Batch */
+  function handleBatch(text: string) {
+    stats.batches++;
+    let start = 0;
+    while (start < text.length) {
+      let end = text.indexOf('\n', start);
+      if (end === -1) end = text.length;
+      const line = text.slice(start, end).trim();
+      start = end + 1;
+      if (!line) continue;
+      let frame: LiveEventFrame;
+      try {
+        frame = JSON.parse(line) as LiveEventFrame;
+      } catch {
+        stats.malformed++;
+        continue;
+      }
+      if (frame.id <= stats.lastEventId) { stats.duplicates++; continue; }
+      stats.lastEventId = frame.id;
+      stats.events++;
+      handlers.get(frame.executionId)?.(frame);
+    }
+    // Bestätigung erst nach der Zustellung – langsame Clients bremsen so den Server
+    scheduleAck();
+  }
+
+  function handleOpen() {
+    open = true;
+    attempt = 0;
+    lastAcked = stats.lastEventId;
+    if (handlers.size > 0) {
+      transmit({ type: 'resume', lastEventId: stats.lastEventId, executionIds: [...handlers.keys()] });
+    }
+    const pending = outbox.splice(0);
+    pending.forEach(transmit);
+  }
+
+  function scheduleReconnect() {
+    open = false;
+    if (closed || reconnectTimer !== null) return;
+    const delay = Math.min(maxMs, baseMs * 2 ** attempt) * (0.75 + Math.random() * 0.5);
+    attempt++;
+    reconnectTimer = setTimeout(() => {
+      reconnectTimer = null;
+      stats.reconnects++;
+      connect();
+    }, delay);
+  }
+
+  function connect() {
+    if (closed) return;
+    if (transport === 'websocket') {
+      const socket = new WebSocket(options.url);
+      ws = socket;
+      socket.onopen = handleOpen;
+      socket.onmessage = (e) => { if (typeof e.data === 'string') handleBatch(e.data); };
+      socket.onclose = () => { if (ws === socket) { ws = null; scheduleReconnect(); } };
+      socket.onerror = () => socket.close();
+      return;
+    }
+    const source = new EventSource(`${baseUrl}/events?client=${encodeURIComponent(clientId)}`);
+    sse = source;
+    source.onopen = handleOpen;
+    source.onmessage = (e) => handleBatch(e.data);
+    source.onerror = () => {
+      open = false;
+      // EventSource verbindet sich selbst neu, solange es nicht CLOSED ist
+      if (source.readyState === EventSource.CLOSED && sse === source) {
+        sse = null;
+        scheduleReconnect();
+      }
+    };
+  }
+
+  connect();
+
+  return {
+    send(message) {
+      if (open) transmit(message);
+      else outbox.push(message);
+    },
+
+    register(executionId, handler) {
+      handlers.set(executionId, handler);
+      return () => {
+        if (handlers.get(executionId) === handler) handlers.delete(executionId);
+      };
+    },
+
+    stats,
+
+    close() {
+      closed = true;
+      open = false;
+      if (reconnectTimer !== null) clearTimeout(reconnectTimer);
+      if (ackTimer !== null) clearTimeout(ackTimer);
+      ws?.close();
+      sse?.close();
+      ws = null;
+      sse = null;
+      handlers.clear();
+      outbox.length = 0;
+    },
+  };
+}
+
+// ─── Shared Connections (Multiplexing) ──────────────────────────────────────
+
+const sharedConnections = new Map<string, { connection: LiveConnection; refs: number }>();
+
+function acquireConnection(options: LiveConnectionOptions): LiveConnection {
+  const key = `${options.transport ?? ''}|${options.url}`;
+  let entry = sharedConnections.get(key);
+  if (!entry) {
+    entry = { connection: createLiveConnection(options), refs: 0 };
+    sharedConnections.set(key, entry);
+  }
+  entry.refs++;
+  return entry.connection;
+}
+
+function releaseConnection(connection: LiveConnection) {
+  for (const [key, entry] of sharedConnections) {
+    if (entry.connection !== connection) continue;
+    if (--entry.refs === 0) {
+      entry.connection.close();
+      sharedConnections.delete(key);
+    }
+    return;
+  }
+}
+
+// ─── Live Event Source ──────────────────────────────────────────────────────
+
+export interface LiveEventSourceOptions extends LiveConnectionOptions {
+  /** Eigene Verbindung statt der geteilten Verbindung pro URL */
+  connection?: LiveConnection;
+}
+
+export function createLiveEventSource(options: LiveEventSourceOptions): WorkflowEventSource {
+  // Geteilte Verbindung erst beim ersten execute() holen und bei dispose()
+  // wieder abgeben – so übersteht die Quelle auch ein Unmount/Remount
+  let connection: LiveConnection | null = options.connection ?? null;
+
+  const nodeStatusCallbacks: ((event: NodeStatusEvent) => void)[] = [];
+  const artifactCallbacks: ((artifact: Artifact) => void)[] = [];
+  const completeCallbacks: ((result: WorkflowExecutionResult) => void)[] = [];
+  let current: { executionId: string; unregister: () => void } | null = null;
+
+  function emit<T>(callbacks: ((data: T) => void)[], data: T) {
+    callbacks.forEach(cb => cb(data));
+  }
+
+  function cancelCurrent() {
+    if (!current) return;
+    connection?.send({ type: 'cancel', executionId: current.executionId });
+    current.unregister();
+    current = null;
+  }
+
+  function subscribe<T>(callbacks: ((data: T) => void)[], cb: (data: T) => void) {
+    callbacks.push(cb);
+    return () => {
+      const idx = callbacks.indexOf(cb);
+      if (idx >= 0) callbacks.splice(idx, 1);
+    };
+  }
+
+  return {
+    execute(systemId, nodeIds, connections) {
+      cancelCurrent();
+      if (!connection) connection = acquireConnection(options);
+      const conn = connection;
+
+      const executionId = `exec-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+      const unregister = conn.register(executionId, (frame) => {
+        switch (frame.kind) {
+          case 'status': emit(nodeStatusCallbacks, frame.data); break;
+          case 'artifact': emit(artifactCallbacks, frame.data); break;
+          case 'complete':
+            emit(completeCallbacks, frame.data);
+            unregister();
+            if (current?.executionId === executionId) current = null;
+            break;
+        }
+      });
+      current = { executionId, unregister };
+      conn.send({ type: 'execute', executionId, systemId, nodeIds, connections });
+    },
+
+    onNodeStatus: (cb) => subscribe(nodeStatusCallbacks, cb),
+    onArtifact: (cb) => subscribe(artifactCallbacks, cb),
+    onComplete: (cb) => subscribe(completeCallbacks, cb),
+
+    dispose() {
+      cancelCurrent();
+      // Callbacks bleiben registriert; sie werden über die unsubscribe-Funktionen abgemeldet
+      if (connection && !options.connection) {
+        releaseConnection(connection);
+        connection = null;
+      }
+    },
+  };
+}
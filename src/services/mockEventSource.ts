@@ -6,6 +6,10 @@
  * Sie ist der EINZIGE Ort, der später ausgetauscht werden muss,
  * wenn echte Backend-Events (n8n, WebSocket, API) angebunden werden.
  *
+ * Live-Anbindung: `src/services/liveEventSource.ts` (WebSocket/SSE). Ist
+ * `VITE_WORKFLOW_EVENTS_URL` gesetzt, nutzt das Dashboard automatisch diese
+ * Quelle; lokal liefert `npm run replay-server` passende Events.
+ *
  * AUSTAUSCH-ANLEITUNG für den Entwickler:
  * 1. Erstelle eine neue Datei z.B. `src/services/liveEventSource.ts`
  * 2. Implementiere das `WorkflowEventSource` Interface
@@ -24,6 +28,7 @@ import type {
   WorkflowExecutionResult,
   NodeExecutionStatus,
 } from '@/types/workflowEvents';
+import { buildDag, planSchedule, analyzeRun } from '@/lib/scheduler';
 
 // ─── Mock Artifact Generator ────────────────────────────────────────────────
 
@@ -46,53 +51,20 @@ const MOCK_ARTIFACTS: Record<string, { type: Artifact['type']; label: string; ur
   ],
 };
 
-// ─── BFS Schedule ───────────────────────────────────────────────────────────
-
-interface ScheduleItem {
-  nodeId: string;
-  depth: number;
-  nodeType?: string;
-}
-
-function computeBFSSchedule(
-  nodeIds: string[],
-  connections: { from: string; to: string }[],
-  nodeTypes?: Record<string, string>,
-): ScheduleItem[] {
-  const incoming = new Set(connections.map(c => c.to));
-  const triggerIds = nodeIds.filter(id => {
-    const type = nodeTypes?.[id];
-    return type === 'trigger' || !incoming.has(id);
-  });
-  if (triggerIds.length === 0 && nodeIds.length > 0) triggerIds.push(nodeIds[0]);
-
-  const visited = new Set<string>();
-  const queue: { id: string; depth: number }[] = triggerIds.map(id => ({ id, depth: 0 }));
-  const schedule: ScheduleItem[] = [];
-
-  while (queue.length > 0) {
-    const { id, depth } = queue.shift()!;
-    if (visited.has(id)) continue;
-    visited.add(id);
-    schedule.push({ nodeId: id, depth, nodeType: nodeTypes?.[id] });
-    for (const conn of connections.filter(c => c.from === id)) {
-      if (!visited.has(conn.to)) queue.push({ id: conn.to, depth: depth + 1 });
-    }
-  }
+// ─── Timing ─────────────────────────────────────────────────────────────────
 
-  // Unconnected nodes
-  for (const id of nodeIds) {
-    if (!visited.has(id)) {
-      schedule.push({ nodeId: id, depth: schedule.length, nodeType: nodeTypes?.[id] });
-    }
-  }
+/** Dauer pro Node: 600ms pending, 1400ms running */
+const PENDING_MS = 600;
+const NODE_DURATION_MS = 2000;
 
-  return schedule;
+export interface MockEventSourceOptions {
+  /** Max. gleichzeitig laufende Nodes (Standard: unbegrenzt) */
+  parallelism?: number;
 }
 
 // ─── Mock Event Source ──────────────────────────────────────────────────────
 
-export function createMockEventSource(): WorkflowEventSource {
+export function createMockEventSource(options: MockEventSourceOptions = {}): WorkflowEventSource {
   const nodeStatusCallbacks: ((event: NodeStatusEvent) => void)[] = [];
   const artifactCallbacks: ((artifact: Artifact) => void)[] = [];
   const completeCallbacks: ((result: WorkflowExecutionResult) => void)[] = [];
@@ -113,26 +85,27 @@ export function createMockEventSource(): WorkflowEventSource {
 
       const executionId = `exec-${Date.now()}`;
       const startedAt = new Date().toISOString();
+      const t0 = Date.now();
 
-      // Schedule: jeder Node bekommt pending → running → completed
-      // Timing: deliberate pace — 600ms pending, 1200ms running per layer
-      const schedule = computeBFSSchedule(systemId ? nodeIds : [], connections);
+      // Schedule: jeder Node startet erst, wenn alle Vorgänger abgeschlossen sind;
+      // unabhängige Zweige laufen parallel (bis zum Parallelitäts-Limit)
+      const dag = buildDag(systemId ? nodeIds : [], connections);
+      const schedule = planSchedule(dag, { duration: () => NODE_DURATION_MS, parallelism: options.parallelism });
       const nodeStates: Record<string, NodeExecutionStatus> = {};
-      let totalDelay = 0;
-
-      for (const item of schedule) {
-        const baseDelay = item.depth * 2000; // 2s pro Layer
+      const measured = new Map<string, { start: number; end: number }>();
 
+      for (const item of schedule.nodes) {
         // → pending
         const t1 = setTimeout(() => {
           nodeStates[item.nodeId] = 'pending';
+          measured.set(item.nodeId, { start: Date.now() - t0, end: Date.now() - t0 });
           emit(nodeStatusCallbacks, {
             nodeId: item.nodeId,
             status: 'pending',
             timestamp: Date.now(),
             message: 'Warte auf Vorgänger…',
           });
-        }, baseDelay);
+        }, item.start);
         timeouts.push(t1);
 
         // → running (600ms nach pending)
@@ -144,12 +117,14 @@ export function createMockEventSource(): WorkflowEventSource {
             timestamp: Date.now(),
             message: 'Wird ausgeführt…',
           });
-        }, baseDelay + 600);
+        }, item.start + PENDING_MS);
         timeouts.push(t2);
 
-        // → completed (1400ms nach running)
+        // → completed
         const t3 = setTimeout(() => {
           nodeStates[item.nodeId] = 'completed';
+          const timing = measured.get(item.nodeId);
+          if (timing) timing.end = Date.now() - t0;
           emit(nodeStatusCallbacks, {
             nodeId: item.nodeId,
             status: 'completed',
@@ -157,9 +132,8 @@ export function createMockEventSource(): WorkflowEventSource {
             message: 'Abgeschlossen',
           });
 
-          // Generate mock artifact for output/ai nodes
-          const nodeType = item.nodeType || 'process';
-          const templates = MOCK_ARTIFACTS[nodeType] || MOCK_ARTIFACTS.process;
+          // Mock-Artifact (Node-Typen kennt die Event-Quelle nicht → 'process')
+          const templates = MOCK_ARTIFACTS.process;
           if (templates && templates.length > 0) {
             const template = templates[Math.floor(Math.random() * templates.length)];
             emit(artifactCallbacks, {
@@ -172,14 +146,13 @@ export function createMockEventSource(): WorkflowEventSource {
               createdAt: new Date().toISOString(),
             });
           }
-        }, baseDelay + 2000);
+        }, item.end);
         timeouts.push(t3);
-
-        totalDelay = Math.max(totalDelay, baseDelay + 2000);
       }
 
-      // → Complete (500ms nach letztem Node)
+      // → Complete (500ms nach letztem Node) inkl. gemessenem Critical Path / Speedup
       const tComplete = setTimeout(() => {
+        const summary = analyzeRun(dag, id => measured.get(id));
         emit(completeCallbacks, {
           executionId,
           systemId,
@@ -188,8 +161,16 @@ export function createMockEventSource(): WorkflowEventSource {
           status: 'completed',
           nodeStates,
           artifacts: [],
+          timing: {
+            nodes: Object.fromEntries(measured),
+            makespanMs: summary.makespan,
+            totalWorkMs: summary.totalWork,
+            criticalPath: summary.criticalPath,
+            criticalPathMs: summary.criticalPathLength,
+            speedup: summary.speedup,
+          },
         });
-      }, totalDelay + 500);
+      }, schedule.makespan + 500);
       timeouts.push(tComplete);
     },
 
@@ -0,0 +1,344 @@
+/**
+ * Record Store
+ *
+ * Persistenz für Automation-Systeme und Funnel-Boards auf Basis von IndexedDB:
+ *
+ * - ein Datensatz pro System/Board (Object Store `<name>`), dazu ein leichter
+ *   Metadaten-Index (`<name>:meta`) für Listenansichten
+ * - Dirty-Tracking: `put`/`delete` markieren nur geänderte Records, der Flush
+ *   schreibt genau diese in einer Transaktion
+ * - Bodies werden erst beim Öffnen geladen (`get`) und danach gecacht
+ * - Debounced Autosave; beim Verlassen der Seite wird sofort geschrieben
+ * - Migration: vorhandene localStorage-Daten werden beim ersten Öffnen
+ *   übernommen und der alte Key danach entfernt
+ *
+ * Ohne IndexedDB (z.B. manche Private-Modi) fällt der Store auf das alte
+ * Verhalten zurück und schreibt die ganze Sammlung in den localStorage-Key.
+ */
+
+// ─── Types ──────────────────────────────────────────────────────────────────
+
+export interface RecordStoreOptions<T, M> {
+  /** Name des Object Stores, muss in COLLECTIONS stehen */
+  name: Collection;
+  /** Bisheriger localStorage-Key (Migration + Fallback) */
+  legacyKey: string;
+  /** Leichte Listen-Ansicht eines Records */
+  toMeta: (record: T) => M;
+  /** Verzögerung für den Autosave in ms */
+  debounceMs?: number;
+  /** Gleiche Metadaten wecken keine Listener; Standard: flacher Vergleich */
+  isSameMeta?: (previous: M, next: M) => boolean;
+}
+
+export interface RecordStore<T extends { id: string }, M extends { id: string }> {
+  /** Öffnet die Datenbank, migriert Altdaten und lädt den Metadaten-Index */
+  ready(): Promise<void>;
+  /** Metadaten aller Records; stabile Referenz bis zur nächsten Änderung */
+  listMeta(): readonly M[];
+  /** Vollständiger Record – aus dem Cache oder lazy aus IndexedDB */
+  get(id: string): Promise<T | undefined>;
+  /** Alle Records vollständig laden */
+  getAll(): Promise<T[]>;
+  /** Markiert den Record als geändert; geschrieben wird beim nächsten Flush */
+  put(record: T): void;
+  delete(id: string): void;
+  /** Schreibt alle ausstehenden Änderungen sofort */
+  flush(): Promise<void>;
+  /** Listener für Änderungen am Metadaten-Index; öffnet den Store bei Bedarf */
+  subscribe(listener: () => void): () => void;
+}
+
+const DB_NAME = 'flowstack';
+const DB_VERSION = 1;
+const COLLECTIONS = ['automation-systems', 'funnel-boards'] as const;
+export type Collection = typeof COLLECTIONS[number];
+
+const DEFAULT_DEBOUNCE_MS = 500;
+
+/** Flacher Vergleich zweier Metadaten-Objekte */
+export function shallowEqualMeta<M extends object>(a: M, b: M): boolean {
+  const keys = Object.keys(b) as (keyof M)[];
+  return keys.length === Object.keys(a).length && keys.every(k => a[k] === b[k]);
+}
+
+/** Eintrag im Metadaten-Store; `seq` erhält die Listenreihenfolge (IndexedDB sortiert nach id) */
+interface MetaEntry<M> { id: string; seq: number; meta: M }
+
+// ─── IndexedDB Helpers ──────────────────────────────────────────────────────
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+/** Eine gemeinsame Verbindung für alle Collections; null ohne IndexedDB */
+function openDatabase(): Promise<IDBDatabase | null> {
+  if (dbPromise) return dbPromise;
+  dbPromise = new Promise(resolve => {
+    if (typeof indexedDB === 'undefined') { resolve(null); return; }
+    let request: IDBOpenDBRequest;
+    try {
+      request = indexedDB.open(DB_NAME, DB_VERSION);
+    } catch {
+      resolve(null);
+      return;
+    }
+    request.onupgradeneeded = () => {
+      const db = request.result;
+      for (const name of COLLECTIONS) {
+        if (!db.objectStoreNames.contains(name)) db.createObjectStore(name, { keyPath: 'id' });
+        if (!db.objectStoreNames.contains(`${name}:meta`)) db.createObjectStore(`${name}:meta`, { keyPath: 'id' });
+      }
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => {
+      console.warn('IndexedDB nicht verfügbar, nutze localStorage:', request.error);
+      resolve(null);
+    };
+    request.onblocked = () => resolve(null);
+  });
+  return dbPromise;
+}
+
+function requestToPromise<R>(request: IDBRequest<R>): Promise<R> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function transactionDone(tx: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+}
+
+function readLegacy<T>(key: string): T[] {
+  try {
+    const stored = localStorage.getItem(key);
+    return stored ? JSON.parse(stored) : [];
+  } catch {
+    return [];
+  }
+}
+
+// ─── Store ──────────────────────────────────────────────────────────────────
+
+export function createRecordStore<T extends { id: string }, M extends { id: string }>(
+  options: RecordStoreOptions<T, M>,
+): RecordStore<T, M> {
+  const { name, legacyKey, toMeta } = options;
+  const metaName = `${name}:meta`;
+  const debounceMs = options.debounceMs ?? DEFAULT_DEBOUNCE_MS;
+  const isSameMeta = options.isSameMeta ?? shallowEqualMeta;
+
+  // Reihenfolge der Metadaten = Einfügereihenfolge (wie bisher im Array)
+  const meta = new Map<string, M>();
+  const seqs = new Map<string, number>();
+  const bodies = new Map<string, T>();
+  const dirty = new Set<string>();
+  const deleted = new Set<string>();
+  const listeners = new Set<() => void>();
+
+  let metaList: readonly M[] = [];
+  let db: IDBDatabase | null = null;
+  let readyPromise: Promise<void> | null = null;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let writing: Promise<void> = Promise.resolve();
+  let lastSeq = 0;
+
+  const seqOf = (id: string) => {
+    let seq = seqs.get(id);
+    if (seq === undefined) {
+      seq = lastSeq = Math.max(Date.now(), lastSeq + 1);
+      seqs.set(id, seq);
+    }
+    return seq;
+  };
+  const metaEntry = (record: T): MetaEntry<M> => ({ id: record.id, seq: seqOf(record.id), meta: toMeta(record) });
+
+  const notify = () => {
+    metaList = [...meta.values()];
+    listeners.forEach(l => l());
+  };
+
+  const scheduleFlush = () => {
+    if (timer !== null) clearTimeout(timer);
+    timer = setTimeout(() => { timer = null; void flush(); }, debounceMs);
+  };
+
+  async function migrate(database: IDBDatabase) {
+    const legacy = readLegacy<T>(legacyKey);
+    if (legacy.length === 0) return;
+    const tx = database.transaction([name, metaName], 'readwrite');
+    const bodyStore = tx.objectStore(name), metaStore = tx.objectStore(metaName);
+    legacy.forEach((record, i) => {
+      bodyStore.put(record);
+      metaStore.put({ id: record.id, seq: i, meta: toMeta(record) } satisfies MetaEntry<M>);
+    });
+    await transactionDone(tx);
+    // Erst nach erfolgreichem Commit entfernen – sonst beim nächsten Start erneut versuchen
+    localStorage.removeItem(legacyKey);
+  }
+
+  async function open() {
+    db = await openDatabase();
+    if (!db) {
+      // Fallback: alles aus dem localStorage-Key, Bodies direkt im Cache
+      for (const record of readLegacy<T>(legacyKey)) {
+        if (bodies.has(record.id) || deleted.has(record.id)) continue;
+        bodies.set(record.id, record);
+        meta.set(record.id, toMeta(record));
+      }
+    } else {
+      try {
+        await migrate(db);
+      } catch (e) {
+        console.warn('Migration aus localStorage fehlgeschlagen:', e);
+      }
+      let stored: MetaEntry<M>[] = [];
+      try {
+        const tx = db.transaction(metaName, 'readonly');
+        stored = await requestToPromise(tx.objectStore(metaName).getAll() as IDBRequest<MetaEntry<M>[]>);
+      } catch (e) {
+        console.warn('IndexedDB Fehler beim Laden:', e);
+      }
+      stored.sort((a, b) => a.seq - b.seq);
+      // Änderungen, die vor dem Öffnen gemacht wurden, haben Vorrang
+      const pending = new Map(meta);
+      meta.clear();
+      for (const entry of stored) {
+        if (deleted.has(entry.id)) continue;
+        meta.set(entry.id, pending.get(entry.id) ?? entry.meta);
+        pending.delete(entry.id);
+        seqs.set(entry.id, entry.seq);
+        lastSeq = Math.max(lastSeq, entry.seq);
+      }
+      for (const [id, m] of pending) meta.set(id, m);
+    }
+    notify();
+  }
+
+  const ready = () => {
+    if (!readyPromise) readyPromise = open();
+    return readyPromise;
+  };
+
+  async function writeDirty() {
+    if (dirty.size === 0 && deleted.size === 0) return;
+    if (!db) {
+      // Fallback: ganze Sammlung (wie bisher) – alle Bodies liegen im Cache
+      dirty.clear();
+      deleted.clear();
+      try {
+        localStorage.setItem(legacyKey, JSON.stringify([...meta.keys()].map(id => bodies.get(id)).filter(Boolean)));
+      } catch (e) {
+        console.warn('localStorage Fehler beim Speichern:', e);
+      }
+      return;
+    }
+
+    const puts = [...dirty].map(id => bodies.get(id)).filter((r): r is T => r !== undefined);
+    const removes = [...deleted];
+    dirty.clear();
+    deleted.clear();
+
+    const tx = db.transaction([name, metaName], 'readwrite');
+    const bodyStore = tx.objectStore(name), metaStore = tx.objectStore(metaName);
+    for (const record of puts) {
+      bodyStore.put(record);
+      metaStore.put(metaEntry(record));
+    }
+    for (const id of removes) {
+      bodyStore.delete(id);
+      metaStore.delete(id);
+    }
+    try {
+      await transactionDone(tx);
+    } catch (e) {
+      console.warn('IndexedDB Fehler beim Speichern:', e);
+      // Beim nächsten Flush erneut versuchen, sofern nicht inzwischen überholt
+      for (const record of puts) if (!deleted.has(record.id)) dirty.add(record.id);
+      for (const id of removes) if (!dirty.has(id)) deleted.add(id);
+    }
+  }
+
+  // Ausstehende Änderungen nicht verlieren, wenn der Tab geschlossen/versteckt wird
+  if (typeof window !== 'undefined') {
+    const flushNow = () => { if (dirty.size > 0 || deleted.size > 0) void flush(); };
+    window.addEventListener('pagehide', flushNow);
+    document.addEventListener('visibilitychange', () => { if (document.visibilityState === 'hidden') flushNow(); });
+  }
+
+  function flush(): Promise<void> {
+    if (timer !== null) { clearTimeout(timer); timer = null; }
+    // Flushes nacheinander, damit sich Transaktionen nicht überholen
+    writing = writing
+      .then(() => ready())
+      .then(writeDirty)
+      .catch(e => console.warn('Speichern fehlgeschlagen:', e));
+    return writing;
+  }
+
+  return {
+    ready,
+
+    listMeta: () => metaList,
+
+    async get(id) {
+      const cached = bodies.get(id);
+      if (cached || deleted.has(id)) return cached;
+      await ready();
+      if (!db) return bodies.get(id);
+      const tx = db.transaction(name, 'readonly');
+      const record = await requestToPromise(tx.objectStore(name).get(id) as IDBRequest<T | undefined>);
+      // Während des Ladens geändert? Dann gilt die neuere Version
+      if (record && !bodies.has(id) && !deleted.has(id)) bodies.set(id, record);
+      return bodies.get(id);
+    },
+
+    async getAll() {
+      await ready();
+      if (db && [...meta.keys()].some(id => !bodies.has(id))) {
+        // Eine Transaktion statt eines get() pro Record
+        const tx = db.transaction(name, 'readonly');
+        const records = await requestToPromise(tx.objectStore(name).getAll() as IDBRequest<T[]>);
+        for (const record of records) if (meta.has(record.id) && !bodies.has(record.id)) bodies.set(record.id, record);
+      }
+      return [...meta.keys()].map(id => bodies.get(id)).filter((r): r is T => r !== undefined);
+    },
+
+    put(record) {
+      if (bodies.get(record.id) === record && !deleted.has(record.id)) return;
+      const nextMeta = toMeta(record);
+      // Listener (Listenansichten) nur wecken, wenn sich die Metadaten wirklich ändern
+      const previous = meta.get(record.id);
+      const metaChanged = !previous || !isSameMeta(previous, nextMeta);
+      bodies.set(record.id, record);
+      meta.set(record.id, nextMeta);
+      deleted.delete(record.id);
+      dirty.add(record.id);
+      if (metaChanged) notify();
+      scheduleFlush();
+      void ready();
+    },
+
+    delete(id) {
+      const known = meta.delete(id);
+      bodies.delete(id);
+      dirty.delete(id);
+      deleted.add(id);
+      if (known) notify();
+      scheduleFlush();
+      void ready();
+    },
+
+    flush,
+
+    subscribe(listener) {
+      listeners.add(listener);
+      void ready();
+      return () => { listeners.delete(listener); };
+    },
+  };
+}
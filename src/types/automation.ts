@@ -76,3 +76,6 @@ export interface AutomationSystem {
   lastExecuted?: string;
   executionCount: number;
 }
+
+/** Listen-Ansicht eines Systems (Metadaten-Index im Speicher) */
+export type AutomationSystemMeta = Pick<AutomationSystem, 'id' | 'name' | 'description' | 'category' | 'icon' | 'status' | 'lastExecuted' | 'executionCount'>;
@@ -103,6 +103,17 @@ export interface FunnelBoard {
   updatedAt: string;
 }
 
+/** Leichte Listen-Ansicht eines Boards (ohne Elemente/Verbindungen) */
+export interface FunnelBoardMeta {
+  id: string;
+  name: string;
+  description: string;
+  linkedSystemId?: string;
+  elementCount: number;
+  createdAt: string;
+  updatedAt: string;
+}
+
 export interface FunnelSnapshot {
   elements: FunnelElement[];
   connections: FunnelConnection[];
@@ -44,6 +44,22 @@ export interface WorkflowExecutionResult {
   status: 'running' | 'completed' | 'failed';
   nodeStates: Record<string, NodeExecutionStatus>;
   artifacts: Artifact[];
+  /** Laufzeit-Auswertung, sofern die Quelle Start/Ende pro Node kennt */
+  timing?: ExecutionTiming;
+}
+
+export interface ExecutionTiming {
+  /** Start/Ende pro Node (ms seit Ausführungsbeginn) */
+  nodes: Record<string, { start: number; end: number }>;
+  /** Gesamtdauer vom ersten Start bis zum letzten Ende */
+  makespanMs: number;
+  /** Summe aller Node-Laufzeiten (= sequentielle Ausführung) */
+  totalWorkMs: number;
+  /** Längste Abhängigkeitskette, Start-Node zuerst */
+  criticalPath: string[];
+  criticalPathMs: number;
+  /** totalWorkMs / makespanMs */
+  speedup: number;
 }
 
 // ─── Event Source Interface ─────────────────────────────────────────────────
@@ -80,3 +96,35 @@ export interface WorkflowEventSource {
   /** Räumt laufende Timeouts/Connections auf */
   dispose(): void;
 }
+
+// ─── Live-Protokoll (WebSocket / SSE) ───────────────────────────────────────
+//
+// Wire-Format zwischen liveEventSource.ts und dem Backend bzw. dem lokalen
+// Stand-in-Server (scripts/replay-server.mjs).
+//
+// Server → Client: Batches als Newline-delimited JSON – eine Zeile pro
+// LiveEventFrame, mehrere Zeilen pro WebSocket-Nachricht bzw. SSE-Event.
+// Die `id` ist serverweit monoton steigend; der Client merkt sich die
+// höchste gesehene id und setzt nach einem Reconnect genau dort wieder an.
+// ─────────────────────────────────────────────────────────────────────────────
+
+export type LiveEventFrame =
+  | { id: number; executionId: string; kind: 'status'; data: NodeStatusEvent }
+  | { id: number; executionId: string; kind: 'artifact'; data: Artifact }
+  | { id: number; executionId: string; kind: 'complete'; data: WorkflowExecutionResult };
+
+export interface LiveExecutionRequest {
+  executionId: string;
+  systemId: string;
+  nodeIds: string[];
+  connections: { from: string; to: string }[];
+}
+
+/** Client → Server (WebSocket-Nachricht bzw. POST-Body bei SSE) */
+export type LiveClientMessage =
+  | ({ type: 'execute' } & LiveExecutionRequest)
+  | { type: 'cancel'; executionId: string }
+  /** Bestätigt alle Events bis einschließlich `lastEventId` (Flow-Control) */
+  | { type: 'ack'; lastEventId: number }
+  /** Nach Reconnect: fehlende Events dieser Ausführungen nachsenden */
+  | { type: 'resume'; lastEventId: number; executionIds: string[] };
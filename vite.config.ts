@@ -2,6 +2,14 @@ import path from "path";
 import react from "@vitejs/plugin-react";
 import { defineConfig } from "vite";
 
+// Named chunks for heavy modules that are only needed behind lazy routes;
+// pages themselves are split by the lazy imports in App.tsx
+const CHUNK_GROUPS: [RegExp, string][] = [
+  [/\/node_modules\/(react|react-dom|scheduler|react-router|react-router-dom)\//, "vendor-react"],
+  [/\/src\/components\/automation\/(WorkflowCanvas|FunnelCanvas)\.tsx$/, "canvas"],
+  [/\/src\/components\/automation\/(ToolLogos|FunnelLogos)\.tsx$/, "tool-logos"],
+];
+
 export default defineConfig({
   plugins: [react()],
   resolve: {
@@ -9,4 +17,16 @@ export default defineConfig({
       "@": path.resolve(__dirname, "./src"),
     },
   },
+  build: {
+    // Read by scripts/bundle-report.mjs
+    manifest: true,
+    rollupOptions: {
+      output: {
+        manualChunks(id) {
+          const normalized = id.replace(/\\/g, "/");
+          return CHUNK_GROUPS.find(([pattern]) => pattern.test(normalized))?.[1];
+        },
+      },
+    },
+  },
 });